@@ -0,0 +1,32 @@
+"""add file ingest progress
+
+Revision ID: 1b6798357c42
+Revises: 37a383ddd61a
+Create Date: 2026-10-18 12:40:11.208314
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1b6798357c42'
+down_revision: Union[str, None] = '37a383ddd61a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('file_metadata', sa.Column('rows_parsed', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('file_metadata', sa.Column('rows_inserted', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('file_metadata', sa.Column('current_sheet', sa.String(256), nullable=True))
+    op.add_column('file_metadata', sa.Column('error', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('file_metadata', 'error')
+    op.drop_column('file_metadata', 'current_sheet')
+    op.drop_column('file_metadata', 'rows_inserted')
+    op.drop_column('file_metadata', 'rows_parsed')
@@ -0,0 +1,33 @@
+"""add operator classifications
+
+Revision ID: 5c0e7d2a9b13
+Revises: d4a6c8e0f253
+Create Date: 2026-10-18 14:02:37.614095
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c0e7d2a9b13'
+down_revision: Union[str, None] = 'd4a6c8e0f253'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'operator_classifications',
+        sa.Column('operator_raw', sa.Text(), nullable=False),
+        sa.Column('category', sa.String(64), nullable=False),
+        sa.Column('confidence', sa.Float(), nullable=False),
+        sa.Column('normalized', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('operator_raw'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('operator_classifications')
@@ -0,0 +1,27 @@
+"""add uav_flights (date, id) index
+
+Revision ID: 6d2f4b8e1a7c
+Revises: 5c0e7d2a9b13
+Create Date: 2026-10-18 14:31:09.120448
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d2f4b8e1a7c'
+down_revision: Union[str, None] = '5c0e7d2a9b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination of the journal walks this index backwards
+    op.create_index('idx_uav_flights_date_id', 'uav_flights', ['date', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_uav_flights_date_id', table_name='uav_flights')
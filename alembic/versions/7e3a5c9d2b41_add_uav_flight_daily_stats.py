@@ -0,0 +1,63 @@
+"""add uav_flight_daily_stats
+
+Revision ID: 7e3a5c9d2b41
+Revises: 6d2f4b8e1a7c
+Create Date: 2026-10-18 16:02:47.513208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.core.settings import application_settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e3a5c9d2b41'
+down_revision: Union[str, None] = '6d2f4b8e1a7c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('uav_flight_daily_stats',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('major_region_id', sa.Integer(), nullable=True),
+    sa.Column('uav_type', sa.String(length=64), nullable=True),
+    sa.Column('operator_type', sa.String(length=64), nullable=True),
+    sa.Column('flights', sa.Integer(), nullable=False),
+    sa.Column('duration_sum', sa.BigInteger(), nullable=False),
+    sa.Column('duration_count', sa.Integer(), nullable=False),
+    sa.Column('distance_sum', sa.Float(), nullable=False),
+    sa.Column('distance_count', sa.Integer(), nullable=False),
+    sa.Column('speed_sum', sa.Float(), nullable=False),
+    sa.Column('speed_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX uq_uav_flight_daily_stats_group ON uav_flight_daily_stats "
+        "(day, (COALESCE(major_region_id, 0)), (COALESCE(uav_type, '')), (COALESCE(operator_type, '')))"
+    )
+    # Backfill from the flights loaded so far; days are cut in APP_TIMEZONE,
+    # like the rollup the application maintains
+    op.execute(sa.text("""
+        INSERT INTO uav_flight_daily_stats (
+            day, major_region_id, uav_type, operator_type, flights,
+            duration_sum, duration_count, distance_sum, distance_count, speed_sum, speed_count
+        )
+        SELECT
+            (date AT TIME ZONE :tz)::date, major_region_id, uav_type, operator_type, count(*),
+            COALESCE(sum(duration_minutes), 0), count(duration_minutes),
+            COALESCE(sum(distance_km), 0), count(distance_km),
+            COALESCE(sum(average_speed_kmh), 0), count(average_speed_kmh)
+        FROM uav_flights
+        WHERE date IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+    """).bindparams(tz=application_settings.APP_TIMEZONE.key))
+
+
+def downgrade() -> None:
+    op.drop_index('uq_uav_flight_daily_stats_group', table_name='uav_flight_daily_stats')
+    op.drop_table('uav_flight_daily_stats')
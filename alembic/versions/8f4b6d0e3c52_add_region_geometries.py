@@ -0,0 +1,45 @@
+"""add region_geometries
+
+Revision ID: 8f4b6d0e3c52
+Revises: 7e3a5c9d2b41
+Create Date: 2026-10-18 17:12:05.280913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4b6d0e3c52'
+down_revision: Union[str, None] = '7e3a5c9d2b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'region_geometries',
+        sa.Column('region_id', sa.Integer(), nullable=False),
+        sa.Column('lod_m', sa.Integer(), nullable=False),
+        sa.Column('geojson', sa.Text(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['region_id'], ['regions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('region_id', 'lod_m'),
+    )
+    # Levels of the APP_REGION_LODS_M default for the regions loaded so far
+    op.execute("""
+        INSERT INTO region_geometries (region_id, lod_m, geojson)
+        SELECT
+            r.id, lod.m,
+            ST_AsGeoJSON(
+                ST_Transform(ST_SimplifyPreserveTopology(ST_Transform(r.geopolygon, 6933), lod.m), 4326),
+                5
+            )
+        FROM regions AS r CROSS JOIN unnest(ARRAY[1000, 10000, 50000]) AS lod(m)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('region_geometries')
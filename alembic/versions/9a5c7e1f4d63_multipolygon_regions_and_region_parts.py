@@ -0,0 +1,164 @@
+"""regions as MULTIPOLYGON, subdivided region_parts for lookups
+
+Revision ID: 9a5c7e1f4d63
+Revises: 8f4b6d0e3c52
+Create Date: 2026-10-18 18:20:31.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a5c7e1f4d63'
+down_revision: Union[str, None] = '8f4b6d0e3c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Region lookups of the insert trigger go through region_parts; a point on a
+# cut line between parts is covered by both, the smallest region id wins
+UPGRADE_FUNCTION = """
+        CREATE OR REPLACE FUNCTION uav_flights_before_insert_update()
+        RETURNS trigger AS $$
+        BEGIN
+            IF NEW.takeoff_lat IS NOT NULL AND NEW.takeoff_lon IS NOT NULL THEN
+                NEW.takeoff_point := ST_SetSRID(ST_MakePoint(NEW.takeoff_lon, NEW.takeoff_lat), 4326);
+            ELSE
+                NEW.takeoff_point := NULL;
+            END IF;
+
+            IF NEW.landing_lat IS NOT NULL AND NEW.landing_lon IS NOT NULL THEN
+                NEW.landing_point := ST_SetSRID(ST_MakePoint(NEW.landing_lon, NEW.landing_lat), 4326);
+            ELSE
+                NEW.landing_point := NULL;
+            END IF;
+
+            IF NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL THEN
+                NEW.coordinates := ST_SetSRID(ST_MakePoint(NEW.longitude, NEW.latitude), 4326);
+            ELSE
+                NEW.coordinates := NULL;
+            END IF;
+
+            IF COALESCE(current_setting('fly_potato.assign_regions', true), '') = 'off' THEN
+                RETURN NEW;
+            END IF;
+
+            IF NEW.takeoff_point IS NOT NULL THEN
+                SELECT region_id INTO NEW.takeoff_region_id
+                FROM region_parts
+                WHERE ST_Covers(region_parts.geom, NEW.takeoff_point)
+                ORDER BY region_id
+                LIMIT 1;
+            ELSE
+                NEW.takeoff_region_id := NULL;
+            END IF;
+
+            IF NEW.landing_point IS NOT NULL THEN
+                SELECT region_id INTO NEW.landing_region_id
+                FROM region_parts
+                WHERE ST_Covers(region_parts.geom, NEW.landing_point)
+                ORDER BY region_id
+                LIMIT 1;
+            ELSE
+                NEW.landing_region_id := NULL;
+            END IF;
+
+            IF NEW.takeoff_region_id IS NOT NULL THEN
+                NEW.major_region_id := NEW.takeoff_region_id;
+            ELSIF NEW.landing_region_id IS NOT NULL THEN
+                NEW.major_region_id := NEW.landing_region_id;
+            ELSE
+                NEW.major_region_id := NULL;
+            END IF;
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+"""
+
+DOWNGRADE_FUNCTION = """
+        CREATE OR REPLACE FUNCTION uav_flights_before_insert_update()
+        RETURNS trigger AS $$
+        BEGIN
+            IF NEW.takeoff_lat IS NOT NULL AND NEW.takeoff_lon IS NOT NULL THEN
+                NEW.takeoff_point := ST_SetSRID(ST_MakePoint(NEW.takeoff_lon, NEW.takeoff_lat), 4326);
+            ELSE
+                NEW.takeoff_point := NULL;
+            END IF;
+
+            IF NEW.landing_lat IS NOT NULL AND NEW.landing_lon IS NOT NULL THEN
+                NEW.landing_point := ST_SetSRID(ST_MakePoint(NEW.landing_lon, NEW.landing_lat), 4326);
+            ELSE
+                NEW.landing_point := NULL;
+            END IF;
+
+            IF NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL THEN
+                NEW.coordinates := ST_SetSRID(ST_MakePoint(NEW.longitude, NEW.latitude), 4326);
+            ELSE
+                NEW.coordinates := NULL;
+            END IF;
+
+            IF COALESCE(current_setting('fly_potato.assign_regions', true), '') = 'off' THEN
+                RETURN NEW;
+            END IF;
+
+            IF NEW.takeoff_point IS NOT NULL THEN
+                SELECT id INTO NEW.takeoff_region_id
+                FROM regions
+                WHERE ST_Contains(regions.geopolygon, NEW.takeoff_point)
+                LIMIT 1;
+            ELSE
+                NEW.takeoff_region_id := NULL;
+            END IF;
+
+            IF NEW.landing_point IS NOT NULL THEN
+                SELECT id INTO NEW.landing_region_id
+                FROM regions
+                WHERE ST_Contains(regions.geopolygon, NEW.landing_point)
+                LIMIT 1;
+            ELSE
+                NEW.landing_region_id := NULL;
+            END IF;
+
+            IF NEW.takeoff_region_id IS NOT NULL THEN
+                NEW.major_region_id := NEW.takeoff_region_id;
+            ELSIF NEW.landing_region_id IS NOT NULL THEN
+                NEW.major_region_id := NEW.landing_region_id;
+            ELSE
+                NEW.major_region_id := NULL;
+            END IF;
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    # Stored regions keep their single polygon until the shapefile is uploaded again
+    op.execute('ALTER TABLE regions ALTER COLUMN geopolygon TYPE geometry(MultiPolygon, 4326) USING ST_Multi(geopolygon)')
+
+    op.create_table(
+        'region_parts',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('region_id', sa.Integer(), nullable=False),
+        sa.Column('geom', geoalchemy2.types.Geometry(geometry_type='POLYGON', srid=4326, spatial_index=False), nullable=False),
+        sa.ForeignKeyConstraint(['region_id'], ['regions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('idx_region_parts_geom', 'region_parts', ['geom'], postgresql_using='gist')
+    # APP_REGION_SUBDIVIDE_VERTICES default
+    op.execute('INSERT INTO region_parts (region_id, geom) SELECT r.id, (ST_Dump(ST_Subdivide(r.geopolygon, 256))).geom FROM regions AS r')
+
+    op.execute(UPGRADE_FUNCTION)
+
+
+def downgrade() -> None:
+    op.execute(DOWNGRADE_FUNCTION)
+    op.drop_index('idx_region_parts_geom', table_name='region_parts')
+    op.drop_table('region_parts')
+    # Only the first polygon of each region survives
+    op.execute('ALTER TABLE regions ALTER COLUMN geopolygon TYPE geometry(Polygon, 4326) USING ST_GeometryN(geopolygon, 1)')
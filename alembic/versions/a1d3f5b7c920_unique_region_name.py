@@ -0,0 +1,43 @@
+"""unique region name
+
+Revision ID: a1d3f5b7c920
+Revises: 9a5c7e1f4d63
+Create Date: 2026-10-18 19:02:44.138560
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1d3f5b7c920'
+down_revision: Union[str, None] = '9a5c7e1f4d63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Duplicates by name are merged into the oldest row; flights follow it
+    op.execute("""
+        CREATE TEMPORARY TABLE region_duplicates ON COMMIT DROP AS
+        SELECT id, min(id) OVER (PARTITION BY name) AS keep_id FROM regions
+    """)
+    for column in ('takeoff_region_id', 'landing_region_id', 'major_region_id'):
+        op.execute(f"""
+            UPDATE uav_flights AS f SET {column} = d.keep_id
+            FROM region_duplicates AS d
+            WHERE f.{column} = d.id AND d.id <> d.keep_id
+        """)
+    op.execute(
+        'DELETE FROM regions AS r USING region_duplicates AS d WHERE r.id = d.id AND d.id <> d.keep_id'
+    )
+
+    op.drop_index('idx_regions_name', table_name='regions')
+    op.create_unique_constraint('uq_regions_name', 'regions', ['name'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_regions_name', 'regions', type_='unique')
+    op.create_index('idx_regions_name', 'regions', ['name'], unique=False)
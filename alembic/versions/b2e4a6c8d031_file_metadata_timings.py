@@ -0,0 +1,30 @@
+"""file_metadata timings
+
+Revision ID: b2e4a6c8d031
+Revises: a1d3f5b7c920
+Create Date: 2026-10-18 20:41:17.502846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e4a6c8d031'
+down_revision: Union[str, None] = 'a1d3f5b7c920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'file_metadata',
+        sa.Column('timings', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('file_metadata', 'timings')
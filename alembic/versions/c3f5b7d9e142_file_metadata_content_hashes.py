@@ -0,0 +1,36 @@
+"""file_metadata content hashes
+
+Revision ID: c3f5b7d9e142
+Revises: b2e4a6c8d031
+Create Date: 2026-10-18 22:07:43.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f5b7d9e142'
+down_revision: Union[str, None] = 'b2e4a6c8d031'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('file_metadata', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+    op.add_column(
+        'file_metadata',
+        sa.Column('sheet_hashes', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+    op.create_index(
+        'idx_file_metadata_content_sha256', 'file_metadata', ['content_sha256'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_file_metadata_content_sha256', table_name='file_metadata')
+    op.drop_column('file_metadata', 'sheet_hashes')
+    op.drop_column('file_metadata', 'content_sha256')
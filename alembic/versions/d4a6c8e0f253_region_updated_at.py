@@ -0,0 +1,31 @@
+"""region updated_at
+
+Revision ID: d4a6c8e0f253
+Revises: 4bf1e614ef48
+Create Date: 2026-10-18 13:21:54.208371
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a6c8e0f253'
+down_revision: Union[str, None] = '4bf1e614ef48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'regions',
+        sa.Column(
+            'updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('regions', 'updated_at')
@@ -1,4 +1,5 @@
 import pathlib
+from typing import Literal
 from zoneinfo import ZoneInfo
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -25,8 +26,23 @@ class ApplicationSettings(BaseConfigSettings):
     APP_BOT_ID: str = 'flcd_test_bot'
     APP_DEFAULT_USER_ID: int = 0
     APP_PROMETHEUS_HOST: str = '0.0.0.0'
-    APP_PROMETHEUS_PORT: int = 8000
+    APP_PROMETHEUS_PORT: int = 8001
     APP_BATCH_PROCESSING: int = 1500
+    APP_INGEST_QUEUE_SIZE: int = 16
+    APP_INGEST_WORKERS: int = 2
+    APP_MAX_UPLOAD_MB: int = 200
+    APP_INGEST_COPY: bool = True
+    APP_INGEST_PROFILE: bool = False
+    APP_REGION_ASSIGNMENT: Literal['index', 'sql', 'trigger'] = 'index'
+    APP_PARSE_WORKERS: int = 2
+    APP_PARSE_QUEUE_SIZE: int = 4
+    APP_OPERATOR_CACHE_SIZE: int = 4096
+    APP_OPERATOR_CACHE_PERSIST: bool = True
+    APP_DATE_BOUNDS_TTL: int = 300
+    APP_TILE_CACHE_SIZE: int = 2048
+    APP_TILE_CACHE_TTL: int = 300
+    APP_REGION_LODS_M: list[int] = [1000, 10000, 50000]
+    APP_REGION_SUBDIVIDE_VERTICES: int = 256
     APP_ALLOWED_ORIGINS: list[str] = []
     APP_TIMEZONE: ZoneInfo = ZoneInfo('Europe/Moscow')
 
@@ -50,6 +66,10 @@ class KeycloakSettings(BaseConfigSettings):
     KEYCLOAK_URL: str
     KEYCLOAK_REALM: str
     KEYCLOAK_CLIENT_ID: str
+    KEYCLOAK_JWKS_TTL: int = 300
+    KEYCLOAK_JWKS_MIN_REFRESH: float = 10.0
+    KEYCLOAK_HTTP_TIMEOUT: float = 10.0
+    KEYCLOAK_TOKEN_CACHE_SIZE: int = 10000
 
 
 LOGGING_CONFIG = {
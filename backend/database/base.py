@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.ext.declarative import declarative_base
 
 from backend.core.settings import postgres_settings
+from backend.metrics import TimedQueuePool, instrument_engine
 
 __all__ = ['Base', 'db_manager', 'get_database']
 
@@ -22,7 +23,9 @@ class DatabaseManager:
             pool_size=10,
             pool_recycle=1800,
             max_overflow=0,
+            poolclass=TimedQueuePool,
         )
+        instrument_engine(self.engine)
         self.async_session = async_sessionmaker(
             self.engine, expire_on_commit=False, class_=AsyncSession
         )
@@ -1,11 +1,13 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 from uuid import uuid4
 
 from geoalchemy2 import Geometry
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     CheckConstraint,
+    Date,
     DateTime,
     Float,
     ForeignKey,
@@ -13,6 +15,8 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    UniqueConstraint,
+    func,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -27,9 +31,12 @@ class RegionModel(Base):
     name: Mapped[str] = mapped_column(String(128), nullable=False)
     area: Mapped[int] = mapped_column(Integer, nullable=False)
     geopolygon: Mapped[Geometry] = mapped_column(
-        Geometry(geometry_type='POLYGON', srid=4326), nullable=False
+        Geometry(geometry_type='MULTIPOLYGON', srid=4326), nullable=False
     )
     geopolygon_str: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
 
     takeoff_flights: Mapped[list['UavFlightModel']] = relationship(
         'UavFlightModel',
@@ -44,11 +51,42 @@ class RegionModel(Base):
 
     __table_args__ = (
         Index('idx_regions_geopolygon', 'geopolygon', postgresql_using='gist'),
-        Index('idx_regions_name', 'name'),
+        UniqueConstraint('name', name='uq_regions_name'),
         Index('idx_regions_area', 'area'),
     )
 
 
+class RegionPartModel(Base):
+    """Piece of a region polygon with a bounded vertex count, for point lookups."""
+
+    __tablename__ = 'region_parts'
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    region_id: Mapped[int] = mapped_column(
+        ForeignKey('regions.id', ondelete='CASCADE'), nullable=False
+    )
+    geom: Mapped[Geometry] = mapped_column(
+        Geometry(geometry_type='POLYGON', srid=4326), nullable=False
+    )
+
+    __table_args__ = (Index('idx_region_parts_geom', 'geom', postgresql_using='gist'),)
+
+
+class RegionGeometryModel(Base):
+    """Region boundary simplified to one level of detail, as a GeoJSON geometry."""
+
+    __tablename__ = 'region_geometries'
+
+    region_id: Mapped[int] = mapped_column(
+        ForeignKey('regions.id', ondelete='CASCADE'), primary_key=True
+    )
+    lod_m: Mapped[int] = mapped_column(Integer, primary_key=True)
+    geojson: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
 class UavFlightModel(Base):
     __tablename__ = 'uav_flights'
 
@@ -111,6 +149,7 @@ class UavFlightModel(Base):
         Index('idx_uav_flights_landing_region_id', 'landing_region_id'),
         Index('idx_uav_flights_distance_km', 'distance_km'),
         Index('idx_uav_flights_average_speed_kmh', 'average_speed_kmh'),
+        Index('idx_uav_flights_date_id', 'date', 'id'),
     )
 
 
@@ -123,6 +162,13 @@ class FileMetadataModel(Base):
     status: Mapped[str] = mapped_column(String(64), nullable=False)
     message: Mapped[str] = mapped_column(String(128), nullable=False)
     sheet_names: Mapped[list[str]] = mapped_column(JSONB, nullable=False)
+    rows_parsed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rows_inserted: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    current_sheet: Mapped[str | None] = mapped_column(String(256), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    timings: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    content_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    sheet_hashes: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     is_active: Mapped[bool] = mapped_column(
         Boolean,
         nullable=True,
@@ -133,4 +179,48 @@ class FileMetadataModel(Base):
         Index('idx_file_metadata_filename', 'filename'),
         Index('idx_file_metadata_status', 'status'),
         Index('idx_file_metadata_is_active', 'is_active'),
+        Index('idx_file_metadata_content_sha256', 'content_sha256'),
+    )
+
+
+class OperatorClassificationModel(Base):
+    __tablename__ = 'operator_classifications'
+
+    operator_raw: Mapped[str] = mapped_column(Text, primary_key=True)
+    category: Mapped[str] = mapped_column(String(64), nullable=False)
+    confidence: Mapped[float] = mapped_column(Float, nullable=False)
+    normalized: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+class UavFlightDailyStatsModel(Base):
+    """Additive per-day rollup of `uav_flights`.
+
+    Sums and non-null counts are stored instead of means so that rows for a
+    newly ingested file can be merged into existing groups.
+    """
+
+    __tablename__ = 'uav_flight_daily_stats'
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    major_region_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    uav_type: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    operator_type: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    flights: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    duration_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    duration_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    distance_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    distance_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    speed_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    speed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index(
+            'uq_uav_flight_daily_stats_group',
+            'day',
+            func.coalesce(major_region_id, 0),
+            func.coalesce(uav_type, ''),
+            func.coalesce(operator_type, ''),
+            unique=True,
+        ),
     )
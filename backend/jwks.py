@@ -0,0 +1,139 @@
+"""Cache of the Keycloak signing keys (JWKS).
+
+Keys are fetched through one pooled HTTP client, parsed once into public key
+objects and kept by `kid` for `ttl` seconds. Concurrent callers that miss
+share a single fetch. A token signed with an unknown `kid` (key rotation)
+forces a refresh, but at most once per `min_refresh_interval`, so forged
+`kid`s cannot flood Keycloak. If Keycloak is unreachable, keys already known
+keep being served past their TTL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from typing import Any
+
+import httpx
+import jwt
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSError(Exception):
+    """Base class for signing key lookup errors."""
+
+    pass
+
+
+class JWKSUnavailableError(JWKSError):
+    """Raised when no signing keys are known and Keycloak cannot be reached."""
+
+    pass
+
+
+class UnknownKeyError(JWKSError):
+    """Raised when the token is signed with a key Keycloak does not publish."""
+
+    pass
+
+
+class JWKSCache:
+    """Signing keys of one realm by `kid`, refreshed from `jwks_url`."""
+
+    def __init__(
+        self,
+        jwks_url: str,
+        *,
+        ttl: float,
+        min_refresh_interval: float,
+        timeout: float,
+        client: httpx.AsyncClient | None = None,
+    ) -> None:
+        self.jwks_url = jwks_url
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._client = client
+        self._keys: dict[str, Any] = {}
+        self._expires_at = -math.inf
+        self._last_attempt = -math.inf
+        self._fetches = 0
+        self._done = 0
+        self._lock: asyncio.Lock | None = None
+
+    @property
+    def fetches(self) -> int:
+        """Number of JWKS requests made so far."""
+        return self._fetches
+
+    async def get_key(self, kid: str) -> Any:
+        """Return the public key for `kid`.
+
+        Raises:
+            UnknownKeyError: If `kid` is not published, even after a refresh.
+            JWKSUnavailableError: If no keys are known and the fetch failed.
+        """
+        if time.monotonic() >= self._expires_at and self._may_refresh():
+            await self.refresh()
+        key = self._keys.get(kid)
+        if key is None and self._may_refresh():
+            await self.refresh()
+            key = self._keys.get(kid)
+        if key is not None:
+            return key
+        if not self._keys:
+            raise JWKSUnavailableError('Signing keys are unavailable')
+        raise UnknownKeyError(f'Unknown signing key {kid}')
+
+    async def refresh(self) -> None:
+        """Fetch the key set; callers waiting on a running fetch reuse its result.
+
+        A failed fetch keeps the previous keys.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        done = self._done
+        async with self._lock:
+            if self._done != done:
+                return
+            self._fetches += 1
+            self._last_attempt = time.monotonic()
+            try:
+                keys = await self._fetch()
+            except (httpx.HTTPError, ValueError) as exc:
+                logger.error('Failed to fetch JWKS: %s', exc)
+                return
+            finally:
+                self._done += 1
+            self._keys = keys
+            self._expires_at = time.monotonic() + self.ttl
+            logger.info('JWKS keys fetched from Keycloak: %s', ', '.join(keys))
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _may_refresh(self) -> bool:
+        # Joining a running fetch is always allowed
+        if self._lock is not None and self._lock.locked():
+            return True
+        return time.monotonic() - self._last_attempt >= self.min_refresh_interval
+
+    async def _fetch(self) -> dict[str, Any]:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        response = await self._client.get(self.jwks_url)
+        response.raise_for_status()
+        keys = {}
+        for data in response.json().get('keys', []):
+            if data.get('use', 'sig') != 'sig' or 'kid' not in data:
+                continue
+            try:
+                keys[data['kid']] = jwt.PyJWK(data).key
+            except jwt.PyJWKError as exc:
+                logger.warning('Skipping JWKS key %s: %s', data['kid'], exc)
+        return keys
@@ -1,6 +1,7 @@
 import logging
 import logging.config
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,11 +9,14 @@ from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
 from backend.core.settings import LOGGING_CONFIG, application_settings
-from backend.middleware import JWTMiddleware
+from backend.metrics import MetricsMiddleware
+from backend.middleware import JWTMiddleware, validator
+from backend.monitoring_agent import start_prometheus
 from backend.routers.dashboard_router import router as dashboard_router
 from backend.routers.region_router import router as region_router
 from backend.routers.uav_router import router as uav_router
 from backend.routers.user_router import router as user_router
+from backend.services.ingest_service import fail_interrupted_files, ingest_queue, parse_pool
 
 
 def _include_routers(app: FastAPI):
@@ -62,8 +66,36 @@ def _configure_middlewares(app: FastAPI):
             '/health',
             '/api/v1/regions/upload-shapefile',
             '/auth/login',
+            # SPA shell and built assets served by SPAStaticFiles
+            '/',
+            '/index.html',
+            '/assets/**',
+            '/*.ico',
+            '/*.svg',
+            '/*.png',
+            '/*.js',
+            '/*.css',
+            '/*.webmanifest',
         ],
     )
+    # Outermost, so latency includes the authentication
+    app.add_middleware(MetricsMiddleware)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    await fail_interrupted_files()
+    await ingest_queue.start()
+    # Metrics are served on the internal APP_PROMETHEUS_PORT, not by the API
+    prometheus = await start_prometheus()
+    try:
+        yield
+    finally:
+        if prometheus is not None:
+            await prometheus.cleanup()
+        await ingest_queue.stop()
+        parse_pool.stop()
+        await validator.jwks.aclose()
 
 
 def create_app() -> FastAPI:
@@ -75,6 +107,7 @@ def create_app() -> FastAPI:
         version=application_settings.APP_VERSION,
         description='Tools for working with the Float Mode ID via the HTTP REST protocol',
         swagger_ui_parameters={'displayRequestDuration': True},
+        lifespan=_lifespan,
     )
     _configure_middlewares(app)
     _include_routers(app)
@@ -0,0 +1,146 @@
+"""Prometheus metrics of the API, the database engine and the ingest pipeline.
+
+Everything is registered in the default registry and served by the `/metrics`
+handler of `backend.monitoring_agent`. Pool sizes are read when metrics are
+scraped; the per-request and per-statement paths only observe a histogram.
+"""
+
+from __future__ import annotations
+
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency by route template',
+    ['method', 'route', 'status'],
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    'http_requests_in_progress', 'HTTP requests being served', ['method']
+)
+HTTP_RESPONSE_BYTES = Histogram(
+    'http_response_size_bytes',
+    'HTTP response body size by route template',
+    ['method', 'route'],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+)
+
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    'db_pool_checkout_seconds',
+    'Time spent waiting for a free pooled connection, not counting opening new ones',
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_CONNECTIONS = Gauge('db_pool_connections', 'Connections of the pool', ['state'])
+DB_STATEMENT_SECONDS = Histogram(
+    'db_statement_duration_seconds', 'SQL statement execution time', ['operation']
+)
+
+INGEST_ROWS = Counter('ingest_rows_total', 'Rows of uploaded journals', ['outcome'])
+INGEST_STAGE_SECONDS = Counter(
+    'ingest_stage_seconds_total', 'Time spent in each ingest stage', ['stage']
+)
+
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get('route')
+    if route is None:
+        return 'unmatched'
+    # Mounts (the SPA static files) have an empty path and are labelled by name
+    return getattr(route, 'path', '') or getattr(route, 'name', None) or 'unmatched'
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, in-flight count and response size per route."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        method = scope['method']
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body':
+                size += len(message.get('body', b''))
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_progress.dec()
+            route = _route_label(scope)
+            HTTP_REQUEST_SECONDS.labels(method, route, str(status)).observe(elapsed)
+            HTTP_RESPONSE_BYTES.labels(method, route).observe(size)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Async engine pool that records how long each checkout waited."""
+
+    def _do_get(self):
+        # Wall clock, to compare with the `starttime` of a connection record
+        started = time.time()
+        record = None
+        try:
+            record = super()._do_get()
+            return record
+        finally:
+            ended = time.time()
+            # A connection opened for this checkout stops the wait when connecting starts
+            if record is not None and record.starttime >= started:
+                ended = record.starttime
+            DB_POOL_CHECKOUT_SECONDS.observe(ended - started)
+
+
+def _statement_operation(statement: str) -> str:
+    words = statement.split(None, 1)
+    return words[0].upper() if words else 'EMPTY'
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Export pool sizes and time every statement executed through `engine`."""
+    pool = engine.pool
+    if hasattr(pool, 'size'):
+        DB_POOL_CONNECTIONS.labels('size').set_function(pool.size)
+        DB_POOL_CONNECTIONS.labels('checked_out').set_function(pool.checkedout)
+        DB_POOL_CONNECTIONS.labels('checked_in').set_function(pool.checkedin)
+        DB_POOL_CONNECTIONS.labels('overflow').set_function(pool.overflow)
+
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info['query_started'] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('query_started', None)
+        if started is None:
+            return
+        DB_STATEMENT_SECONDS.labels(_statement_operation(statement)).observe(
+            time.perf_counter() - started
+        )
+
+
+def record_ingest_batch(*, parsed: int, inserted: int, **stage_seconds: float) -> None:
+    """Count one inserted batch and add its per-stage seconds (`load=`, `map=`, `insert=`)."""
+    INGEST_ROWS.labels('parsed').inc(parsed)
+    INGEST_ROWS.labels('inserted').inc(inserted)
+    # Rows dropped by ON CONFLICT DO NOTHING (already stored)
+    INGEST_ROWS.labels('skipped').inc(parsed - inserted)
+    for stage, seconds in stage_seconds.items():
+        INGEST_STAGE_SECONDS.labels(stage).inc(seconds)
@@ -1,49 +1,59 @@
 import logging
+import re
 from typing import Dict, Optional
 
-import httpx
 import jwt
-from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from backend.core.settings import keycloak_settings
+from backend.jwks import JWKSCache, JWKSUnavailableError, UnknownKeyError
+from backend.token_cache import VerifiedTokenCache
 
 logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
+_GLOB_CHARS = re.compile(r'[*?]')
+
 
 class JWTKeycloakValidator:
     def __init__(self, keycloak_url: str, realm: str):
         self.keycloak_url = keycloak_url
         self.realm = realm
         self.jwks_url = f'{keycloak_url}/sso/realms/{realm}/protocol/openid-connect/certs'
+        self.jwks = JWKSCache(
+            self.jwks_url,
+            ttl=keycloak_settings.KEYCLOAK_JWKS_TTL,
+            min_refresh_interval=keycloak_settings.KEYCLOAK_JWKS_MIN_REFRESH,
+            timeout=keycloak_settings.KEYCLOAK_HTTP_TIMEOUT,
+        )
+        self.tokens = VerifiedTokenCache(keycloak_settings.KEYCLOAK_TOKEN_CACHE_SIZE)
 
-    # @lru_cache(maxsize=1)
-    async def get_jwks(self) -> Dict:
+    async def get_public_key(self, kid: str):
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(self.jwks_url, timeout=10.0)
-                response.raise_for_status()
-
-                logger.info('JWKS keys fetched from Keycloak')
-                return response.json()
-
-        except Exception as e:
-            logger.error(f'Failed to fetch JWKS: {e}')
+            return await self.jwks.get_key(kid)
+        except JWKSUnavailableError:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail='Unable to validate tokens - Keycloak unavailable',
             )
-
-    def get_key_by_kid(self, jwks: Dict, kid: str) -> Optional[Dict]:
-        for key in jwks.get('keys', []):
-            if key.get('kid') == kid:
-                return key
-        return None
+        except UnknownKeyError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=f'Unable to find matching key {kid}',
+            )
 
     async def validate_token(self, token: str) -> Dict:
+        # Tokens already verified are accepted until they expire
+        cache_key = self.tokens.key(token)
+        payload = self.tokens.get(cache_key)
+        if payload is not None:
+            return payload
+
         try:
             # Decode header to get kid
             unverified_header = jwt.get_unverified_header(token)
@@ -54,19 +64,8 @@ class JWTKeycloakValidator:
                     status_code=status.HTTP_401_UNAUTHORIZED, detail='Token missing kid'
                 )
 
-            # Get JWKS keys
-            jwks = await self.get_jwks()
-
-            # Find matching key
-            key_data = self.get_key_by_kid(jwks, kid)
-            if not key_data:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail=f'Unable to find matching key {kid} for {jwks}',
-                )
-
-            # Create public key from JWK
-            public_key = jwt.algorithms.RSAAlgorithm.from_jwk(key_data)
+            # Public key parsed from the cached JWKS
+            public_key = await self.get_public_key(kid)
 
             # Validate token
             payload = jwt.decode(
@@ -75,6 +74,7 @@ class JWTKeycloakValidator:
                 algorithms=['RS256'],
                 audience=keycloak_settings.KEYCLOAK_CLIENT_ID,
             )
+            self.tokens.put(cache_key, payload)
 
             return payload
 
@@ -94,6 +94,8 @@ class JWTKeycloakValidator:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail=f'Invalid token: {str(e)}'
             )
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f'Token validation error: {e}')
             raise HTTPException(
@@ -185,35 +187,72 @@ def require_groups(required_groups: list[str]):
     return group_checker
 
 
-class JWTMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, exclude_paths: list[str] | None = None):
-        super().__init__(app)
+def compile_path_patterns(patterns: list[str]) -> re.Pattern | None:
+    """Compile glob path patterns into one regex.
+
+    `*` and `?` match within one path segment, `**` matches any number of
+    segments, so `/assets/**` is a prefix and `/*.js` only matches top-level
+    files.
+    """
+    if not patterns:
+        return None
+    parts = []
+    for pattern in patterns:
+        regex = ''
+        for token in re.split(r'(\*\*|\*|\?)', pattern):
+            if token == '**':
+                regex += '.*'
+            elif token == '*':
+                regex += '[^/]*'
+            elif token == '?':
+                regex += '[^/]'
+            else:
+                regex += re.escape(token)
+        parts.append(regex)
+    return re.compile('|'.join(f'(?:{part})' for part in parts))
+
+
+class JWTMiddleware:
+    """ASGI middleware that requires a valid Keycloak bearer token.
+
+    Paths in `exclude_paths` are passed through without a token: plain entries
+    match exactly, entries with `*`, `?` or `**` are globs (see
+    `compile_path_patterns`). The token claims are stored as `request.state.user`.
+    """
+
+    def __init__(self, app: ASGIApp, exclude_paths: list[str] | None = None):
+        self.app = app
         self.exclude_paths = exclude_paths or ['/docs', '/openapi.json', '/health']
+        self._exact = {path for path in self.exclude_paths if not _GLOB_CHARS.search(path)}
+        self._patterns = compile_path_patterns(
+            [path for path in self.exclude_paths if _GLOB_CHARS.search(path)]
+        )
+
+    def is_excluded(self, path: str) -> bool:
+        if path in self._exact:
+            return True
+        return self._patterns is not None and self._patterns.fullmatch(path) is not None
 
-    async def dispatch(self, request: Request, call_next):
-        # Skip certain paths
-        if request.url.path in self.exclude_paths:
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or self.is_excluded(scope['path']):
+            await self.app(scope, receive, send)
+            return
 
         # Check token
-        auth_header = request.headers.get('Authorization')
+        auth_header = Headers(scope=scope).get('Authorization')
         if not auth_header or not auth_header.startswith('Bearer '):
-            return Response(
-                content='{"detail": "Authorization header required"}',
-                status_code=401,
-                media_type='application/json',
-            )
+            response = JSONResponse({'detail': 'Authorization header required'}, status_code=401)
+            await response(scope, receive, send)
+            return
 
         token = auth_header.split(' ')[1]
 
         try:
             payload = await validator.validate_token(token)
-            request.state.user = payload
         except HTTPException as e:
-            return Response(
-                content=f'{{"detail": "{e.detail}"}}',
-                status_code=e.status_code,
-                media_type='application/json',
-            )
+            response = JSONResponse({'detail': e.detail}, status_code=e.status_code)
+            await response(scope, receive, send)
+            return
 
-        return await call_next(request)
+        scope.setdefault('state', {})['user'] = payload
+        await self.app(scope, receive, send)
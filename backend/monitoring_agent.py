@@ -24,14 +24,24 @@ def create_app():
     return app
 
 
-async def start_prometheus():
+async def start_prometheus() -> web.AppRunner | None:
+    """Serve `/metrics` on APP_PROMETHEUS_PORT; the caller cleans the runner up.
+
+    Returns None if the port cannot be bound, so the API still starts.
+    """
     app = create_app()
     runner = web.AppRunner(app)
     await runner.setup()
     site = web.TCPSite(
         runner, application_settings.APP_PROMETHEUS_HOST, application_settings.APP_PROMETHEUS_PORT
     )
-    await site.start()
+    try:
+        await site.start()
+    except OSError as exc:
+        logger.error(f'Prometheus server not started: {exc!s}')
+        await runner.cleanup()
+        return None
     logger.info(
         f'Prometheus server started on {application_settings.APP_PROMETHEUS_HOST}:{application_settings.APP_PROMETHEUS_PORT}'
     )
+    return runner
@@ -1,7 +1,9 @@
+import hashlib
 import logging
-from typing import Any, Generic, List, Optional, TypeVar
+from dataclasses import dataclass
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import delete, select, text, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,6 +15,14 @@ logger = logging.getLogger(__name__)
 T = TypeVar('T')
 
 
+@dataclass
+class BulkInsertResult:
+    """Outcome of a bulk load: rows written and rows dropped by ON CONFLICT."""
+
+    inserted: int
+    skipped: int
+
+
 class BaseRepository(Generic[T]):
     """
     Base repository class for database operations.
@@ -51,6 +61,77 @@ class BaseRepository(Generic[T]):
         result = await db_session.execute(stmt)
         return [tuple(m[c.key] for c in pk_cols) for m in result.mappings()]
 
+    async def copy_many(
+        self,
+        db_session: AsyncSession,
+        rows: list[dict[str, Any]],
+        conflict_columns: Sequence[str] | None = None,
+    ) -> BulkInsertResult:
+        """
+        Bulk-load rows through COPY into a temporary staging table and merge them
+        into the model table with `INSERT ... SELECT ... ON CONFLICT DO NOTHING`.
+
+        Avoids compiling one large parameterized INSERT per batch. Table
+        triggers still fire on the merge step. Only columns present in the first
+        row are loaded.
+        """
+        if not rows:
+            return BulkInsertResult(inserted=0, skipped=0)
+        columns = [c.name for c in self.__model__.__table__.columns if c.name in rows[0]]
+        return await self.copy_records(
+            db_session,
+            columns,
+            [tuple(row.get(c) for c in columns) for row in rows],
+            conflict_columns=conflict_columns,
+        )
+
+    async def copy_records(
+        self,
+        db_session: AsyncSession,
+        columns: Sequence[str],
+        records: list[tuple],
+        conflict_columns: Sequence[str] | None = None,
+    ) -> BulkInsertResult:
+        """
+        `copy_many` for rows that are already tuples of `columns` values.
+        """
+        if not records:
+            return BulkInsertResult(inserted=0, skipped=0)
+
+        table = self.__model__.__table__
+        column_list = ', '.join(f'"{c}"' for c in columns)
+        columns_key = hashlib.sha1(column_list.encode()).hexdigest()[:12]
+        staging = f'_copy_{table.name}_{columns_key}'
+        conflict = f'({", ".join(conflict_columns)}) ' if conflict_columns else ''
+
+        # TEMP tables are unlogged and private to this connection. One staging
+        # table per column set is shared by all batches of a transaction and
+        # dropped at its end, so it never outlives a change of the target
+        # table. TRUNCATE of a table created in the same transaction is done
+        # in place.
+        await db_session.execute(
+            text(
+                f'CREATE TEMP TABLE IF NOT EXISTS "{staging}" ON COMMIT DROP AS '
+                f'SELECT {column_list} FROM "{table.name}" WITH NO DATA'
+            )
+        )
+        await db_session.execute(text(f'TRUNCATE "{staging}"'))
+        connection = await db_session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            staging, records=records, columns=list(columns)
+        )
+        result = await db_session.execute(
+            text(
+                f'INSERT INTO "{table.name}" ({column_list}) '
+                f'SELECT {column_list} FROM "{staging}" '
+                f'ON CONFLICT {conflict}DO NOTHING'
+            )
+        )
+
+        inserted = result.rowcount
+        return BulkInsertResult(inserted=inserted, skipped=len(records) - inserted)
+
     async def delete(self, db_session: AsyncSession, **filters: Any) -> None:
         """
         Delete a record from the database matching the given filters.
@@ -1,3 +1,8 @@
+from typing import Any, Sequence
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from backend.database.models import FileMetadataModel
 
 from .base_repository import BaseRepository
@@ -6,7 +11,17 @@ from .base_repository import BaseRepository
 class FileMetadataRepository(BaseRepository[FileMetadataModel]):
     """Repository for FileMetadata model."""
 
-    ...
+    async def update_by_status(
+        self, db_session: AsyncSession, statuses: Sequence[str], **values: Any
+    ) -> list[str]:
+        """Update every record in one of `statuses` and return their ids."""
+        result = await db_session.execute(
+            update(FileMetadataModel)
+            .where(FileMetadataModel.status.in_(statuses))
+            .values(values)
+            .returning(FileMetadataModel.file_id)
+        )
+        return [str(file_id) for file_id in result.scalars()]
 
 
 file_metadata_repo = FileMetadataRepository()
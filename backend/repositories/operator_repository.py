@@ -0,0 +1,30 @@
+from typing import Sequence
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.models import OperatorClassificationModel
+
+from .base_repository import BaseRepository
+
+
+class OperatorClassificationRepository(BaseRepository[OperatorClassificationModel]):
+    """Repository for OperatorClassificationModel model."""
+
+    async def get_many(
+        self, db_session: AsyncSession, *, limit: int | None = None
+    ) -> Sequence[OperatorClassificationModel]:
+        result = await db_session.scalars(select(OperatorClassificationModel).limit(limit))
+        return result.all()
+
+    async def insert_missing(self, db_session: AsyncSession, rows: list[dict]) -> int:
+        """Insert classifications whose `operator_raw` is not stored yet."""
+        if not rows:
+            return 0
+        stmt = insert(OperatorClassificationModel).values(rows).on_conflict_do_nothing()
+        result = await db_session.execute(stmt)
+        return result.rowcount
+
+
+operator_classification_repo = OperatorClassificationRepository()
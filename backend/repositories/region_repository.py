@@ -0,0 +1,87 @@
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy import Row, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.models import RegionGeometryModel, RegionModel, RegionPartModel
+
+from .base_repository import BaseRepository
+
+# Simplified in an equal-area metric CRS (tolerance in metres) and written with
+# 5 decimal places (~1 m), the same projection the region area is computed in
+_REFRESH_GEOMETRIES = """
+INSERT INTO region_geometries AS g (region_id, lod_m, geojson, updated_at)
+SELECT
+    r.id, lod.m,
+    ST_AsGeoJSON(
+        ST_Transform(ST_SimplifyPreserveTopology(ST_Transform(r.geopolygon, 6933), lod.m), 4326),
+        5
+    ),
+    now()
+FROM regions AS r CROSS JOIN unnest(CAST(:lods AS integer[])) AS lod(m)
+ON CONFLICT (region_id, lod_m) DO UPDATE SET geojson = EXCLUDED.geojson, updated_at = EXCLUDED.updated_at
+"""
+
+
+class RegionPartRepository(BaseRepository[RegionPartModel]):
+    """Repository for RegionPartModel model."""
+
+    async def refresh(self, db_session: AsyncSession, *, max_vertices: int) -> int:
+        """
+        Replace all parts with the regions split by `ST_Subdivide` into polygons
+        of at most `max_vertices` vertices. Returns the number of parts.
+        """
+        await db_session.execute(text('DELETE FROM region_parts'))
+        result = await db_session.execute(
+            text(
+                'INSERT INTO region_parts (region_id, geom) '
+                'SELECT r.id, (ST_Dump(ST_Subdivide(r.geopolygon, :max_vertices))).geom '
+                'FROM regions AS r'
+            ),
+            {'max_vertices': max_vertices},
+        )
+        return result.rowcount
+
+
+class RegionGeometryRepository(BaseRepository[RegionGeometryModel]):
+    """Repository for RegionGeometryModel model."""
+
+    async def refresh(self, db_session: AsyncSession, *, lods: Sequence[int]) -> int:
+        """
+        Re-simplify every region to each of `lods` (tolerances in metres) and
+        drop other levels. Returns the number of geometries written.
+        """
+        await db_session.execute(
+            text('DELETE FROM region_geometries WHERE lod_m <> ALL(CAST(:lods AS integer[]))'),
+            {'lods': list(lods)},
+        )
+        result = await db_session.execute(text(_REFRESH_GEOMETRIES), {'lods': list(lods)})
+        return result.rowcount
+
+    async def get_version(
+        self, db_session: AsyncSession, *, lod_m: int
+    ) -> tuple[int, datetime | None]:
+        """Number of geometries of a level and their last update, a cheap change marker."""
+        result = await db_session.execute(
+            select(func.count(), func.max(RegionGeometryModel.updated_at)).where(
+                RegionGeometryModel.lod_m == lod_m
+            )
+        )
+        count, updated_at = result.one()
+        return count, updated_at
+
+    async def get_features(self, db_session: AsyncSession, *, lod_m: int) -> Sequence[Row]:
+        """`(id, name, area, geojson)` of every region at one level, by id."""
+        result = await db_session.execute(
+            select(RegionModel.id, RegionModel.name, RegionModel.area, RegionGeometryModel.geojson)
+            .join(RegionGeometryModel, RegionGeometryModel.region_id == RegionModel.id)
+            .where(RegionGeometryModel.lod_m == lod_m)
+            .order_by(RegionModel.id)
+        )
+        return result.all()
+
+
+region_part_repo = RegionPartRepository()
+
+region_geometry_repo = RegionGeometryRepository()
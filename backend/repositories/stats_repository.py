@@ -0,0 +1,115 @@
+from datetime import date
+from typing import Sequence
+from uuid import UUID
+
+from sqlalchemy import RowMapping, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.models import UavFlightDailyStatsModel
+
+from .base_repository import BaseRepository
+
+STATS_DIMENSIONS = ('day', 'major_region_id', 'uav_type', 'operator_type')
+
+# Groups are upserted in key order so that concurrent merges lock rollup rows
+# in the same order and cannot deadlock
+_MERGE_FLIGHTS = """
+INSERT INTO uav_flight_daily_stats AS s (
+    day, major_region_id, uav_type, operator_type, flights,
+    duration_sum, duration_count, distance_sum, distance_count, speed_sum, speed_count
+)
+SELECT
+    (f.date AT TIME ZONE :tz)::date, f.major_region_id, f.uav_type, f.operator_type, count(*),
+    COALESCE(sum(f.duration_minutes), 0), count(f.duration_minutes),
+    COALESCE(sum(f.distance_km), 0), count(f.distance_km),
+    COALESCE(sum(f.average_speed_kmh), 0), count(f.average_speed_kmh)
+FROM uav_flights AS f
+WHERE f.date IS NOT NULL AND {scope}
+GROUP BY 1, 2, 3, 4
+ORDER BY 1, 2, 3, 4
+ON CONFLICT (day, (COALESCE(major_region_id, 0)), (COALESCE(uav_type, '')), (COALESCE(operator_type, '')))
+DO UPDATE SET
+    flights = s.flights + EXCLUDED.flights,
+    duration_sum = s.duration_sum + EXCLUDED.duration_sum,
+    duration_count = s.duration_count + EXCLUDED.duration_count,
+    distance_sum = s.distance_sum + EXCLUDED.distance_sum,
+    distance_count = s.distance_count + EXCLUDED.distance_count,
+    speed_sum = s.speed_sum + EXCLUDED.speed_sum,
+    speed_count = s.speed_count + EXCLUDED.speed_count
+"""
+
+
+class UavFlightStatsRepository(BaseRepository[UavFlightDailyStatsModel]):
+    """Repository for UavFlightDailyStatsModel model."""
+
+    async def merge_file(self, db_session: AsyncSession, *, file_id: UUID | str, tz: str) -> int:
+        """
+        Add the flights of one file to the rollup. Must run exactly once per
+        file, after its flights (and their regions) are written.
+        Returns the number of groups touched.
+        """
+        result = await db_session.execute(
+            text(_MERGE_FLIGHTS.format(scope='f.file_id = :file_id')),
+            {'file_id': str(file_id), 'tz': tz},
+        )
+        return result.rowcount
+
+    async def rebuild(self, db_session: AsyncSession, *, tz: str) -> int:
+        """
+        Recompute the whole rollup from `uav_flights`.
+        Returns the number of groups.
+        """
+        await db_session.execute(text('DELETE FROM uav_flight_daily_stats'))
+        result = await db_session.execute(text(_MERGE_FLIGHTS.format(scope='TRUE')), {'tz': tz})
+        return result.rowcount
+
+    async def get_stats(
+        self,
+        db_session: AsyncSession,
+        *,
+        group_by: Sequence[str],
+        date_from: date | None = None,
+        date_to: date | None = None,
+        major_region_id: int | None = None,
+        uav_type: str | None = None,
+        operator_type: str | None = None,
+    ) -> Sequence[RowMapping]:
+        """
+        Roll the stored groups up to `group_by` (a subset of `STATS_DIMENSIONS`).
+        """
+        model = UavFlightDailyStatsModel
+        dimensions = [getattr(model, name) for name in group_by]
+        duration_sum = func.sum(model.duration_sum)
+        distance_sum = func.sum(model.distance_sum)
+        query = select(
+            *dimensions,
+            func.sum(model.flights).label('flights'),
+            duration_sum.label('duration_total_minutes'),
+            (duration_sum / func.nullif(func.sum(model.duration_count), 0)).label(
+                'duration_mean_minutes'
+            ),
+            distance_sum.label('distance_total_km'),
+            (distance_sum / func.nullif(func.sum(model.distance_count), 0)).label(
+                'distance_mean_km'
+            ),
+            (func.sum(model.speed_sum) / func.nullif(func.sum(model.speed_count), 0)).label(
+                'speed_mean_kmh'
+            ),
+        )
+        if date_from is not None:
+            query = query.where(model.day >= date_from)
+        if date_to is not None:
+            query = query.where(model.day <= date_to)
+        if major_region_id is not None:
+            query = query.where(model.major_region_id == major_region_id)
+        if uav_type is not None:
+            query = query.where(model.uav_type == uav_type)
+        if operator_type is not None:
+            query = query.where(model.operator_type == operator_type)
+        if dimensions:
+            query = query.group_by(*dimensions).order_by(*dimensions)
+        result = await db_session.execute(query)
+        return result.mappings().all()
+
+
+uav_flight_stats_repo = UavFlightStatsRepository()
@@ -1,12 +1,91 @@
 from datetime import datetime
+from typing import AsyncIterator
+from uuid import UUID
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import Row, Select, and_, desc, func, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.database.models import RegionModel, UavFlightModel
 
 from .base_repository import BaseRepository
 
+# Journal projection: plain columns only, point geometries are derived from lat/lon
+JOURNAL_COLUMNS = (
+    UavFlightModel.id,
+    UavFlightModel.flight_id,
+    UavFlightModel.file_id,
+    UavFlightModel.uav_type,
+    UavFlightModel.operator_name,
+    UavFlightModel.operator_type,
+    UavFlightModel.takeoff_lat,
+    UavFlightModel.takeoff_lon,
+    UavFlightModel.landing_lat,
+    UavFlightModel.landing_lon,
+    UavFlightModel.latitude,
+    UavFlightModel.longitude,
+    UavFlightModel.takeoff_datetime,
+    UavFlightModel.landing_datetime,
+    UavFlightModel.date,
+    UavFlightModel.duration_minutes,
+    UavFlightModel.city,
+    UavFlightModel.major_region_id,
+    UavFlightModel.takeoff_region_id,
+    UavFlightModel.landing_region_id,
+    UavFlightModel.distance_km,
+    UavFlightModel.average_speed_kmh,
+)
+
+# Half the side of the EPSG:3857 world square, m
+WEB_MERCATOR_HALF_SIZE = 20037508.342789244
+
+# Point column and its precomputed region column for each `search_flights` point kind
+SEARCH_POINTS = {
+    'takeoff': ((UavFlightModel.takeoff_point, UavFlightModel.takeoff_region_id),),
+    'landing': ((UavFlightModel.landing_point, UavFlightModel.landing_region_id),),
+    'any': (
+        (UavFlightModel.takeoff_point, UavFlightModel.takeoff_region_id),
+        (UavFlightModel.landing_point, UavFlightModel.landing_region_id),
+    ),
+}
+
+
+def _bbox_overlaps(column, geometry):
+    return column.op('&&', is_comparison=True)(geometry)
+
+
+def _date_scope(start: datetime | None, end: datetime | None) -> tuple[str, dict]:
+    conditions, params = [], {}
+    if start is not None:
+        conditions.append('f.date >= :start')
+        params['start'] = start
+    if end is not None:
+        conditions.append('f.date <= :end')
+        params['end'] = end
+    return ''.join(f' AND {condition}' for condition in conditions), params
+
+
+# Takeoff points snapped to the centres of a `:cell`-sized grid anchored at
+# the origin (that is, aligned with tile edges), one MVT point per cell
+_DENSITY_TILE = """
+WITH tile AS (SELECT ST_TileEnvelope(:z, :x, :y) AS env)
+SELECT ST_AsMVT(cells, 'flights', :extent, 'geom')
+FROM (
+    SELECT
+        ST_AsMVTGeom(
+            ST_SnapToGrid(
+                ST_Transform(f.takeoff_point, 3857),
+                ST_MakePoint(:half, :half), :cell, :cell, 0, 0
+            ),
+            tile.env, :extent, 0
+        ) AS geom,
+        count(*) AS flights
+    FROM uav_flights AS f, tile
+    WHERE f.takeoff_point && ST_Transform(tile.env, 4326){scope}
+    GROUP BY 1
+) AS cells
+"""
+
 
 class UavFlightRepository(BaseRepository[UavFlightModel]):
     """Repository for UavFlightModel model."""
@@ -18,33 +97,252 @@ class UavFlightRepository(BaseRepository[UavFlightModel]):
         min_date, max_date = result.first()
         return min_date, max_date
 
-    async def get_flights_between_dates(
+    def _flights_between_dates_query(
         self,
-        db_session: AsyncSession,
         *,
         start: datetime,
         end: datetime,
-        limit: int | None = None,
-    ):
+        after: tuple[datetime, int] | None = None,
+    ) -> Select:
         query = (
-            select(UavFlightModel)
+            select(*JOURNAL_COLUMNS)
             .where(
                 UavFlightModel.date >= start,
                 UavFlightModel.date <= end,
             )
-            .order_by(desc(UavFlightModel.date))
+            .order_by(desc(UavFlightModel.date), desc(UavFlightModel.id))
         )
+        if after is not None:
+            query = query.where(tuple_(UavFlightModel.date, UavFlightModel.id) < tuple_(*after))
+        return query
+
+    async def get_flights_between_dates(
+        self,
+        db_session: AsyncSession,
+        *,
+        start: datetime,
+        end: datetime,
+        limit: int | None = None,
+        after: tuple[datetime, int] | None = None,
+    ):
+        """
+        Flights in `[start, end]`, newest first, as rows of `JOURNAL_COLUMNS`.
+        `after` is the `(date, id)` of the last flight of the previous page
+        (keyset pagination).
+        """
+        query = self._flights_between_dates_query(start=start, end=end, after=after)
         if limit is not None:
             query = query.limit(limit)
         result = await db_session.execute(query)
-        flights = result.scalars().all()
-        return flights
+        return result.all()
+
+    async def stream_flights_between_dates(
+        self,
+        db_session: AsyncSession,
+        *,
+        start: datetime,
+        end: datetime,
+        limit: int | None = None,
+        after: tuple[datetime, int] | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Row]:
+        """
+        Same rows as `get_flights_between_dates`, fetched from a server-side
+        cursor `batch_size` rows at a time.
+        """
+        query = self._flights_between_dates_query(start=start, end=end, after=after)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await db_session.stream(query.execution_options(yield_per=batch_size))
+        async for flight in result:
+            yield flight
+
+    def _search_flights_query(
+        self,
+        *,
+        point: str = 'takeoff',
+        bbox: tuple[float, float, float, float] | None = None,
+        area_wkt: str | None = None,
+        region_id: int | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        uav_type: str | None = None,
+        operator_type: str | None = None,
+        after: tuple[datetime, int] | None = None,
+    ) -> Select:
+        """
+        Journal rows matching all given filters, in journal order. Spatial
+        filters are written as `&&` (plus `ST_Intersects` for polygons) on the
+        point columns so the GiST indexes on them apply; with `point='any'` a
+        flight matches by its takeoff or its landing point.
+        """
+        points = SEARCH_POINTS[point]
+        query = select(*JOURNAL_COLUMNS).order_by(
+            desc(UavFlightModel.date), desc(UavFlightModel.id)
+        )
+        if bbox is not None:
+            # For points the bounding-box test is exact
+            envelope = func.ST_MakeEnvelope(*bbox, 4326)
+            query = query.where(or_(*(_bbox_overlaps(column, envelope) for column, _ in points)))
+        if area_wkt is not None:
+            area = func.ST_GeomFromText(area_wkt, 4326)
+            query = query.where(
+                or_(
+                    *(
+                        and_(_bbox_overlaps(column, area), func.ST_Intersects(column, area))
+                        for column, _ in points
+                    )
+                )
+            )
+        if region_id is not None:
+            query = query.where(or_(*(region == region_id for _, region in points)))
+        if start is not None:
+            query = query.where(UavFlightModel.date >= start)
+        if end is not None:
+            query = query.where(UavFlightModel.date <= end)
+        if uav_type is not None:
+            query = query.where(UavFlightModel.uav_type == uav_type)
+        if operator_type is not None:
+            query = query.where(UavFlightModel.operator_type == operator_type)
+        if after is not None:
+            query = query.where(tuple_(UavFlightModel.date, UavFlightModel.id) < tuple_(*after))
+        return query
+
+    async def search_flights(
+        self,
+        db_session: AsyncSession,
+        *,
+        limit: int,
+        **filters,
+    ):
+        """
+        Up to `limit` flights matching `filters` (see `_search_flights_query`),
+        newest first, as rows of `JOURNAL_COLUMNS`.
+        """
+        query = self._search_flights_query(**filters).limit(limit)
+        result = await db_session.execute(query)
+        return result.all()
+
+    async def get_density_grid(
+        self,
+        db_session: AsyncSession,
+        *,
+        cell_size: float,
+        bbox: tuple[float, float, float, float],
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ):
+        """
+        Takeoff counts per `cell_size`-degree grid cell inside `bbox`, as
+        `(lon, lat, flights)` rows where `lon`/`lat` is the cell centre.
+        """
+        half = cell_size / 2
+        cell = func.ST_SnapToGrid(
+            UavFlightModel.takeoff_point, func.ST_MakePoint(half, half), cell_size, cell_size, 0, 0
+        ).label('cell')
+        points = select(cell).where(
+            _bbox_overlaps(UavFlightModel.takeoff_point, func.ST_MakeEnvelope(*bbox, 4326))
+        )
+        if start is not None:
+            points = points.where(UavFlightModel.date >= start)
+        if end is not None:
+            points = points.where(UavFlightModel.date <= end)
+        points = points.subquery()
+        query = select(
+            func.ST_X(points.c.cell).label('lon'),
+            func.ST_Y(points.c.cell).label('lat'),
+            func.count().label('flights'),
+        ).group_by(points.c.cell)
+        result = await db_session.execute(query)
+        return result.all()
+
+    async def get_density_tile(
+        self,
+        db_session: AsyncSession,
+        *,
+        z: int,
+        x: int,
+        y: int,
+        cells: int,
+        extent: int = 4096,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> bytes:
+        """
+        Mapbox Vector Tile `z/x/y` with one `flights` layer: a point per
+        non-empty cell of a `cells` x `cells` grid, with the takeoff count.
+        """
+        cell = 2 * WEB_MERCATOR_HALF_SIZE / 2**z / cells
+        scope, params = _date_scope(start, end)
+        tile = await db_session.scalar(
+            text(_DENSITY_TILE.format(scope=scope)),
+            {'z': z, 'x': x, 'y': y, 'extent': extent, 'cell': cell, 'half': cell / 2, **params},
+        )
+        return bytes(tile) if tile is not None else b''
+
+    async def disable_region_trigger(self, db_session: AsyncSession) -> None:
+        """Skip per-row region lookups in the insert trigger for the current transaction."""
+        await db_session.execute(
+            text("SELECT set_config('fly_potato.assign_regions', 'off', true)")
+        )
+
+    async def assign_regions(
+        self,
+        db_session: AsyncSession,
+        *,
+        file_id: UUID | str | None = None,
+    ) -> int:
+        """
+        Resolve takeoff/landing/major regions against the subdivided
+        `region_parts` in one UPDATE, for one file or for all flights when
+        `file_id` is None. A point on a part boundary (an internal cut line
+        included) is covered by it; of several matching regions the smallest id
+        wins. Flights outside every region get NULL, so stale assignments drop
+        out. Returns the number of flights in scope.
+        """
+        scope = 'f.file_id = :file_id' if file_id is not None else 'TRUE'
+        params = {'file_id': str(file_id)} if file_id is not None else {}
+        takeoff, landing = (
+            f'(SELECT p.region_id FROM region_parts AS p WHERE ST_Covers(p.geom, f.{point}) '
+            'ORDER BY p.region_id LIMIT 1)'
+            for point in ('takeoff_point', 'landing_point')
+        )
+        result = await db_session.execute(
+            text(
+                f'WITH resolved AS (SELECT f.id, {takeoff} AS takeoff, {landing} AS landing '
+                f'FROM uav_flights AS f WHERE {scope}) '
+                'UPDATE uav_flights AS u SET takeoff_region_id = r.takeoff, '
+                'landing_region_id = r.landing, major_region_id = COALESCE(r.takeoff, r.landing) '
+                'FROM resolved AS r WHERE u.id = r.id'
+            ),
+            params,
+        )
+        return result.rowcount
 
 
 class RegionRepository(BaseRepository[RegionModel]):
     """Repository for Region model."""
 
-    ...
+    async def upsert_by_name(self, db_session: AsyncSession, rows: list[dict]) -> dict[str, int]:
+        """
+        Insert regions, replacing area and geometry of those whose name is
+        already stored, in one statement. Returns the id of each name;
+        `RETURNING` rows do not follow the order of `VALUES`.
+        """
+        if not rows:
+            return {}
+        stmt = insert(RegionModel).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RegionModel.name],
+            set_={
+                'area': stmt.excluded.area,
+                'geopolygon': stmt.excluded.geopolygon,
+                'geopolygon_str': stmt.excluded.geopolygon_str,
+                'updated_at': func.now(),
+            },
+        ).returning(RegionModel.name, RegionModel.id)
+        result = await db_session.execute(stmt)
+        return {name: region_id for name, region_id in result.tuples()}
 
 
 region_repo = RegionRepository()
@@ -1,28 +1,99 @@
+import time
+from dataclasses import asdict
 from io import BytesIO
 
 import shapefile
-from fastapi import APIRouter, Depends, File, UploadFile, status
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.database.base import get_database
 from backend.exc import IDException
-from backend.services.region_service import group_polygons_by_region, save_regions_to_db
+from backend.schemas.region_schema import RegionLoadResultSchema, ShapefileUploadResponseSchema
+from backend.services.exceptions import FlightStatsError, RegionAssignError, RegionGeometryError
+from backend.services.region_service import (
+    get_regions_geojson,
+    group_polygons_by_region,
+    refresh_region_geometries,
+    save_regions_to_db,
+)
+from backend.services.stats_service import rebuild_flight_stats
+from backend.services.uav_service import assign_flight_regions
 
 router = APIRouter(tags=['Regions'])
 
+# A versioned URL never changes its content
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+@router.get(
+    '',
+    status_code=status.HTTP_200_OK,
+    response_class=Response,
+    responses={200: {'content': {'application/geo+json': {}}}},
+)
+async def get_regions(
+    request: Request,
+    lod: int = Query(10000, description='Уровень детализации: допуск упрощения границ в метрах'),
+    v: str | None = Query(None, description='Версия данных регионов из `ETag`'),
+    db_session: AsyncSession = Depends(get_database),
+):
+    """Границы регионов в виде GeoJSON FeatureCollection заданной детализации.
+
+    Границы заранее упрощены при загрузке регионов на каждый уровень из
+    настройки `APP_REGION_LODS_M`, ответ собирается один раз на версию данных.
+    Версия отдаётся в `ETag`; при совпадении `If-None-Match` возвращается 304.
+    Запрос с актуальной версией в параметре `v` кэшируется клиентом бессрочно.
+    Ответ сжимается gzip, если клиент его поддерживает.
+
+    - 200: регионы получены
+    - 304: регионы не изменились
+    - 400: неизвестный уровень детализации
+    - 500: ошибка чтения регионов
+    """
+    try:
+        collection = await get_regions_geojson(db_session, lod_m=lod)
+    except ValueError as exc:
+        raise IDException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    except RegionGeometryError as exc:
+        raise IDException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc))
+
+    headers = {
+        'ETag': f'"{collection.version}"',
+        'Vary': 'Accept-Encoding',
+        'Cache-Control': (
+            f'private, max-age={IMMUTABLE_MAX_AGE}, immutable'
+            if v == collection.version
+            else 'private, no-cache'
+        ),
+    }
+    if request.headers.get('if-none-match') == headers['ETag']:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if 'gzip' in request.headers.get('accept-encoding', ''):
+        headers['Content-Encoding'] = 'gzip'
+        body = collection.gzipped
+    else:
+        body = collection.body
+    return Response(content=body, media_type='application/geo+json', headers=headers)
+
 
 @router.post('/upload-shapefile', status_code=status.HTTP_201_CREATED)
 async def upload_shapefile(
     shp: UploadFile = File(...),
     dbf: UploadFile = File(...),
     db_session: AsyncSession = Depends(get_database),
-):
+) -> ShapefileUploadResponseSchema:
     """Загрузка границ регионов из пары файлов Shapefile (.shp и .dbf).
 
     Ожидает два файла: основной геометрический файл `.shp` и файл атрибутов `.dbf`.
-    После чтения и парсинга полигоны группируются по региону и сохраняются в БД.
+    После чтения и парсинга полигоны группируются по региону и сохраняются в БД
+    вместе с упрощёнными границами для `GET /regions`. Регионы уже загруженных
+    полётов и статистика по регионам пересчитываются отдельно, запросом
+    `POST /api/v1/regions/reassign-flights`.
 
-    Возвращает список идентификаторов/названий регионов, которые были распознаны.
+    Все регионы записываются одним пакетным upsert по названию. Возвращает
+    названия сохранённых регионов, время каждого этапа (с) и отчёт по каждому
+    региону: число полигонов и вершин, площадь (км²), время сборки и ошибку,
+    если регион не удалось собрать (такие регионы не сохраняются).
 
     - 201: файлы успешно обработаны и регионы сохранены
     - 400: переданы файлы неверного формата
@@ -40,10 +111,40 @@ async def upload_shapefile(
             dbf=BytesIO(dbf_bytes),
         ) as sf:
             region_polygons = group_polygons_by_region(sf)
-        await save_regions_to_db(region_polygons, db_session)
-        return {'status': 'ok', 'regions': list(region_polygons.keys())}
+        report = await save_regions_to_db(region_polygons, db_session)
+        timings = dict(report.timings)
+        started = time.perf_counter()
+        await refresh_region_geometries(db_session)
+        timings['simplify'] = time.perf_counter() - started
     except Exception as exc:
         raise IDException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(exc),
         )
+    return ShapefileUploadResponseSchema(
+        status='ok',
+        regions=report.loaded,
+        timings=timings,
+        report=[RegionLoadResultSchema(**asdict(region)) for region in report.regions],
+    )
+
+
+@router.post('/reassign-flights', status_code=status.HTTP_200_OK)
+async def reassign_flight_regions(db_session: AsyncSession = Depends(get_database)):
+    """Пересчитать регионы взлёта/посадки для всех полётов.
+
+    Выполняется одним пространственным соединением с таблицей регионов,
+    после чего пересобирается статистика полётов.
+
+    - 200: регионы пересчитаны
+    - 500: ошибка пересчёта
+    """
+    try:
+        flights = await assign_flight_regions(db_session)
+        await rebuild_flight_stats(db_session)
+    except (RegionAssignError, FlightStatsError) as exc:
+        raise IDException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        )
+    return {'status': 'ok', 'flights': flights}
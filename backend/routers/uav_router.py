@@ -1,200 +1,263 @@
-import io
+import asyncio
+import json
 import logging
+from datetime import date, datetime
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import UUID
 
-import openpyxl
-import pandas as pd
 from fastapi import (
     APIRouter,
     Depends,
     File,
     Form,
+    Header,
     Query,
+    Request,
+    Response,
     UploadFile,
     status,
 )
-from sqlalchemy.exc import SQLAlchemyError
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.settings import application_settings
-from backend.database.base import get_database
-from backend.dto import UavFlightCreateDTO
+from backend.database.base import db_manager, get_database
 from backend.exc import IDException
-from backend.schemas.file_schema import FileUploadResponseSchema
-from backend.schemas.uav_schema import DateBoundsQuery, DateBoundsResponse, UavFlightsResponse
+from backend.schemas.file_schema import FileStatusResponseSchema, FileUploadResponseSchema
+from backend.schemas.uav_schema import (
+    DateBoundsQuery,
+    DateBoundsResponse,
+    FlightHeatmapResponse,
+    FlightSearchQuery,
+    FlightStatsQuery,
+    FlightStatsResponse,
+    UavFlightsResponse,
+)
 from backend.services.exceptions import (
     FileCreateError,
     FileDeactivateError,
+    FileTooLargeError,
+    FlightStatsError,
+    HeatmapError,
+    IngestQueueFullError,
     ServiceError,
-    UavFlightCreateError,
 )
 from backend.services.file_service import (
     create_file_metadata,
-    deactivate_old_files,
+    find_processed_file,
+    get_file_metadata,
     update_file_status,
 )
-from backend.services.parse_service.geocoder import DefaultGeocoder
-from backend.services.parse_service.loader import ExcelLoader
-from backend.services.parse_service.mapper import DefaultMapper
-from backend.services.parse_service.party_classifier import PartyClassifier
+from backend.services.heatmap_service import (
+    aggregate_etag,
+    get_flight_heatmap,
+    get_flight_tile,
+    heatmap_key,
+    tile_key,
+)
+from backend.services.ingest_service import IngestJob, ingest_queue
+from backend.services.parse_service.digest import sheet_hashes as workbook_sheet_hashes
+from backend.services.parse_service.loader import StreamingExcelLoader, spool_to_tempfile
+from backend.services.stats_service import get_flight_stats
+from backend.services.tile_cache import tile_cache
 from backend.services.uav_service import (
-    create_uav_flights,
     get_uav_date_bounds,
     get_uav_flights_between_dates,
+    resolve_journal_range,
+    search_uav_flights,
+    stream_uav_flights_between_dates,
 )
 
 router = APIRouter(tags=['Files'])
 
-MAX_FILE_SIZE = 50 * 1024 * 1024
+MAX_FILE_SIZE = application_settings.APP_MAX_UPLOAD_MB * 1024 * 1024
+MVT_MEDIA_TYPE = 'application/vnd.mapbox-vector-tile'
 
 logger = logging.getLogger(__name__)
 
 
 @router.post(
     '/upload/xlsx',
-    status_code=status.HTTP_201_CREATED,
+    status_code=status.HTTP_202_ACCEPTED,
     # dependencies=[Depends(require_groups(['administrators']))]
 )
 async def upload_xlsx_file(
-    # background_tasks: BackgroundTasks,
+    response: Response,
     file: UploadFile = File(...),
     description: str | None = Form(None),
-    db_session: AsyncSession = Depends(get_database),
+    profile: bool = Header(False, alias='X-Ingest-Profile'),
 ) -> FileUploadResponseSchema:
-    """Загрузка и обработка Excel-файла с данными полётов БВС.
+    """Приём Excel-файла с данными полётов БВС в очередь на обработку.
+
+    Файл потоково сохраняется во временный файл с проверкой размера,
+    читаются имена листов (без загрузки книги в память), создаётся
+    запись о файле со статусом `queued`, и файл ставится в очередь фоновой
+    обработки. Ход обработки можно отслеживать через `GET /files/{file_id}`.
+    После успешной обработки предыдущие активные версии файла деактивируются.
+    Время этапов обработки по листам сохраняется и возвращается в `timings`
+    статуса файла; с заголовком `X-Ingest-Profile: true` к нему добавляется
+    отчёт cProfile.
 
-    Проверяется расширение и размер файла, читаются имена листов, создаётся
-    запись о файле. Далее данные с каждого листа построчно парсятся и
-    сохраняются как полёты, после чего статус файла обновляется. При
-    необходимости предыдущие активные версии деактивируются.
+    При сохранении считается SHA-256 файла и хеши содержимого листов. Если
+    активная обработанная версия файла с тем же именем имеет тот же SHA-256,
+    файл повторно не обрабатывается и возвращается существующая запись (200).
+    Листы, не изменившиеся с предыдущей версии, при обработке пропускаются.
 
-    - 201: файл успешно загружен и обработан
+    - 200: файл не изменился, возвращена существующая запись
+    - 202: файл принят и поставлен в очередь
     - 400: неверный формат файла
     - 413: превышен допустимый размер файла
-    - 500: ошибка обработки или записи данных
+    - 503: очередь обработки переполнена
+    - 500: ошибка записи метаданных файла
     """
     logger.info('File creation')
     if not file.filename.lower().endswith(('.xlsx', '.xls')):
         raise IDException(
             status_code=status.HTTP_400_BAD_REQUEST, detail='Only XLSX/XLS files are allowed!'
         )
-    file_content = await file.read()
-
-    if len(file_content) > MAX_FILE_SIZE:
+    if ingest_queue.full():
         raise IDException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f'File size exceeds maximum allowed size of {MAX_FILE_SIZE // (1024 * 1024)}MB!',
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail='Too many files are waiting for processing, try again later',
         )
-
-    file_io = io.BytesIO(file_content)
     try:
-        workbook = openpyxl.load_workbook(file_io, read_only=True)
-        sheet_names = workbook.sheetnames
-        workbook.close()
-    except Exception as e:
+        path, file_size, content_sha256 = await spool_to_tempfile(file, max_size=MAX_FILE_SIZE)
+    except FileTooLargeError:
         raise IDException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail=f'Invalid XLSX file format: {str(e)}'
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f'File size exceeds maximum allowed size of {MAX_FILE_SIZE // (1024 * 1024)}MB!',
         )
-    finally:
-        file_io.seek(0)
 
     try:
-        file_rec = await create_file_metadata(
-            db_session,
-            filename=file.filename,
-            file_size=len(file_content),
-            status='uploaded',
-            message=description or 'Uploaded',
-            sheet_names=sheet_names,
-            is_active=True,
-            deactivate_previous=True,
-        )
-    except (FileCreateError, FileDeactivateError) as exc:
+        async with db_manager.async_session() as db_session:
+            existing = await find_processed_file(
+                db_session, filename=file.filename, content_sha256=content_sha256
+            )
+    except ServiceError as exc:
+        path.unlink(missing_ok=True)
         raise IDException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(exc),
         )
+    if existing is not None:
+        path.unlink(missing_ok=True)
+        response.status_code = status.HTTP_200_OK
+        return FileUploadResponseSchema(
+            file_id=str(existing.file_id),
+            filename=existing.filename,
+            file_size=existing.file_size,
+            status=existing.status,
+            message='File is unchanged, already processed',
+            sheet_names=existing.sheet_names,
+            timings=existing.timings,
+        )
 
     try:
-        file_id = str(file_rec.file_id)
-        await process_xlsx_file(db_session=db_session, file_io=file_io, file_id=file_id)
-        await update_file_status(
-            db_session,
-            file_id=file_id,
-            status='processed',
-            message='File processed successfully',
+        sheet_names, sheet_hashes = await asyncio.to_thread(_inspect_workbook, path)
+    except Exception as e:
+        path.unlink(missing_ok=True)
+        raise IDException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f'Invalid XLSX file format: {str(e)}'
         )
-    except (UavFlightCreateError, SQLAlchemyError, ServiceError) as exc:
+
+    # The record must be committed before a worker can pick the job up.
+    try:
+        async with db_manager.async_session() as db_session:
+            async with db_session.begin():
+                file_rec = await create_file_metadata(
+                    db_session,
+                    filename=file.filename,
+                    file_size=file_size,
+                    status='queued',
+                    message=description or 'Queued',
+                    sheet_names=sheet_names,
+                    is_active=True,
+                    deactivate_previous=False,
+                    content_sha256=content_sha256,
+                    sheet_hashes=sheet_hashes,
+                )
+    except (FileCreateError, FileDeactivateError) as exc:
+        path.unlink(missing_ok=True)
         raise IDException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f'Failed to process file: {str(exc)}',
+            detail=str(exc),
         )
-    finally:
-        file_io.close()
 
+    file_id = str(file_rec.file_id)
     try:
-        await deactivate_old_files(
-            db_session,
-            filename=file.filename,
-            extra_filters=None,
+        ingest_queue.submit(
+            IngestJob(
+                file_id=file_id,
+                filename=file.filename,
+                path=path,
+                profile=profile,
+                sheet_hashes=sheet_hashes,
+            )
         )
-    except FileDeactivateError as exc:
+    except IngestQueueFullError as exc:
+        path.unlink(missing_ok=True)
+        async with db_manager.async_session() as db_session:
+            async with db_session.begin():
+                await update_file_status(
+                    db_session, file_id=file_id, status='failed', message='Queue is full'
+                )
         raise IDException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=str(exc),
         )
 
     return FileUploadResponseSchema(
-        file_id=str(file_rec.file_id),
+        file_id=file_id,
         filename=file_rec.filename,
         file_size=file_rec.file_size,
-        status='processed',
-        message='File uploaded and processed successfully',
+        status='queued',
+        message='File uploaded and queued for processing',
         sheet_names=sheet_names,
     )
 
 
-async def process_xlsx_file(
-    db_session: AsyncSession,
-    file_io: io.BytesIO,
-    file_id: str,
-) -> None:
-    """Парсинг Excel-файла и сохранение полётов в БД.
-
-    Итерируется по листам и строкам, выполняется маппинг полёта и создание
-    записи, связанной с `file_id`. Исключения пробрасываются наверх для
-    корректной обработки в вызывающем хэндлере.
-    """
-    try:
-        with pd.ExcelFile(file_io) as excel_file:
-            for sheet_name in excel_file.sheet_names:
-                loader = ExcelLoader(source=excel_file, sheet_name=sheet_name)
-                mapper = DefaultMapper(DefaultGeocoder(), PartyClassifier())
-
-                df = loader.load()
-                if df.empty:
-                    continue
-
-                uav_flights_batch: list[dict] = []
-                for _, row in df.iterrows():
-                    uav_flight: UavFlightCreateDTO = mapper.map_row(row)
-                    uav_flight.file_id = file_id
-                    uav_flights_batch.append(uav_flight.model_dump())
+def _inspect_workbook(path: Path) -> tuple[list[str], dict[str, str | None]]:
+    with StreamingExcelLoader(path) as loader:
+        sheet_names = loader.sheet_names
+    return sheet_names, workbook_sheet_hashes(path)
 
-                    if len(uav_flights_batch) >= application_settings.APP_BATCH_PROCESSING:
-                        logger.info('Created uav model %s / %s', _, df.shape)
-                        await create_uav_flights(db_session, data=uav_flights_batch)
-                        uav_flights_batch = []
 
-                if uav_flights_batch:
-                    await create_uav_flights(db_session, data=uav_flights_batch)
+@router.get('/files/{file_id}', status_code=status.HTTP_200_OK)
+async def get_file_status(
+    file_id: UUID,
+    db_session: AsyncSession = Depends(get_database),
+) -> FileStatusResponseSchema:
+    """Вернуть статус и прогресс обработки загруженного файла.
 
+    - 200: статус получен
+    - 404: файл не найден
+    - 500: ошибка чтения статуса
+    """
+    try:
+        file_rec = await get_file_metadata(db_session, file_id=str(file_id))
     except ServiceError as exc:
-        raise exc
-    except Exception as exc:
         raise IDException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f'Unexpected parsing error: {str(exc)}',
+            detail=str(exc),
         )
+    if file_rec is None:
+        raise IDException(status_code=status.HTTP_404_NOT_FOUND, detail='File not found')
+
+    return FileStatusResponseSchema(
+        file_id=str(file_rec.file_id),
+        filename=file_rec.filename,
+        file_size=file_rec.file_size,
+        status=file_rec.status,
+        message=file_rec.message,
+        sheet_names=file_rec.sheet_names,
+        rows_parsed=file_rec.rows_parsed,
+        rows_inserted=file_rec.rows_inserted,
+        current_sheet=file_rec.current_sheet,
+        error=file_rec.error,
+        is_active=file_rec.is_active,
+        timings=file_rec.timings,
+    )
 
 
 @router.post('/date-bounds', status_code=status.HTTP_200_OK)
@@ -219,18 +282,36 @@ async def get_date_bounds(db_session: AsyncSession = Depends(get_database)) -> D
         )
 
 
-@router.get('/journal-json', status_code=status.HTTP_200_OK)
+@router.get(
+    '/journal-json',
+    status_code=status.HTTP_200_OK,
+    response_model=UavFlightsResponse,
+    responses={200: {'content': {'application/x-ndjson': {}}}},
+)
 async def get_flights_between_dates(
     min_date: str = Query(..., description='Начальная дата диапазона в ISO 8601'),
     max_date: str = Query(..., description='Конечная дата диапазона в ISO 8601'),
     limit: int | None = Query(None, ge=1, le=1000, description='Максимальное количество записей'),
+    cursor: str | None = Query(None, description='Курсор из `next_cursor` предыдущей страницы'),
+    stream: bool = Query(False, description='Отдать полёты потоком NDJSON (по строке на полёт)'),
     db_session: AsyncSession = Depends(get_database),
-) -> UavFlightsResponse:
-    """Получить полёты БВС в заданном диапазоне дат."""
+):
+    """Получить полёты БВС в заданном диапазоне дат.
+
+    Полёты отсортированы по `(date, id)` от новых к старым. При заданном
+    `limit` ответ содержит `next_cursor`, пока есть следующая страница.
+    С `stream=true` полёты отдаются в формате NDJSON по мере чтения из БД.
+    """
     try:
-        query = DateBoundsQuery(min_date=min_date, max_date=max_date, limit=limit)
-        flights = await get_uav_flights_between_dates(db_session, query=query)
-        return UavFlightsResponse(flights=flights)
+        query = DateBoundsQuery(min_date=min_date, max_date=max_date, limit=limit, cursor=cursor)
+        if stream:
+            journal = await resolve_journal_range(db_session, query=query)
+            return StreamingResponse(
+                _ndjson_lines(stream_uav_flights_between_dates(journal)),
+                media_type='application/x-ndjson',
+            )
+        flights, next_cursor = await get_uav_flights_between_dates(db_session, query=query)
+        return UavFlightsResponse(flights=flights, next_cursor=next_cursor)
     except ValueError as exc:
         raise IDException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -241,3 +322,206 @@ async def get_flights_between_dates(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(exc),
         )
+
+
+@router.post('/flights/search', status_code=status.HTTP_200_OK)
+async def search_flights(
+    query: FlightSearchQuery,
+    db_session: AsyncSession = Depends(get_database),
+) -> UavFlightsResponse:
+    """Поиск полётов БВС по месту, времени, типу БВС и типу оператора.
+
+    Место задаётся прямоугольником `bbox`, GeoJSON-полигоном `polygon` и/или
+    регионом `region_id`; `point` выбирает, по какой точке полёта (взлёта,
+    посадки или любой из них) применяются эти фильтры. Все заданные фильтры
+    объединяются через «и». Полёты отсортированы по `(date, id)` от новых
+    к старым, `next_cursor` указывает на следующую страницу.
+
+    - 200: полёты найдены
+    - 400: неверные параметры поиска
+    - 500: ошибка поиска
+    """
+    try:
+        flights, next_cursor = await search_uav_flights(db_session, query=query)
+    except ValueError as exc:
+        raise IDException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+    except ServiceError as exc:
+        raise IDException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        )
+    return UavFlightsResponse(flights=flights, next_cursor=next_cursor)
+
+
+@router.get('/stats', status_code=status.HTTP_200_OK)
+async def get_flights_stats(
+    date_from: date | None = Query(None, description='Первый день периода (включительно)'),
+    date_to: date | None = Query(None, description='Последний день периода (включительно)'),
+    major_region_id: int | None = Query(
+        None, description='Регион полёта: регион взлёта, а если его нет, регион посадки'
+    ),
+    uav_type: str | None = Query(None, description='Тип БВС'),
+    operator_type: str | None = Query(None, description='Тип оператора'),
+    group_by: str = Query(
+        'day',
+        description=(
+            'Измерения группировки через запятую: day, major_region_id, uav_type, operator_type'
+        ),
+    ),
+    db_session: AsyncSession = Depends(get_database),
+) -> FlightStatsResponse:
+    """Статистика полётов БВС по дням, регионам, типам БВС и операторов.
+
+    Считается по заранее агрегированной таблице `uav_flight_daily_stats`,
+    которая пополняется при загрузке каждого файла. Возвращает число полётов,
+    суммарную и среднюю длительность (мин), дальность (км) и среднюю скорость
+    (км/ч) для каждой группы. С пустым `group_by` возвращается одна строка итогов.
+
+    - 200: статистика получена
+    - 400: неверные параметры запроса
+    - 500: ошибка чтения статистики
+    """
+    try:
+        query = FlightStatsQuery(
+            date_from=date_from,
+            date_to=date_to,
+            major_region_id=major_region_id,
+            uav_type=uav_type,
+            operator_type=operator_type,
+            group_by=[name.strip() for name in group_by.split(',') if name.strip()],
+        )
+        stats = await get_flight_stats(db_session, query=query)
+    except ValueError as exc:
+        raise IDException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+    except FlightStatsError as exc:
+        raise IDException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        )
+    return FlightStatsResponse(group_by=query.group_by, stats=stats)
+
+
+@router.get('/heatmap', status_code=status.HTTP_200_OK, response_model=FlightHeatmapResponse)
+async def get_flights_heatmap(
+    request: Request,
+    zoom: int = Query(..., ge=0, description='Масштаб карты, от него зависит размер ячейки'),
+    bbox: str | None = Query(
+        None, description='Область min_lon,min_lat,max_lon,max_lat; по умолчанию весь мир'
+    ),
+    date_from: datetime | None = Query(None, description='Начало периода в ISO 8601'),
+    date_to: datetime | None = Query(None, description='Конец периода в ISO 8601'),
+    db_session: AsyncSession = Depends(get_database),
+):
+    """Плотность полётов БВС: число взлётов по ячейкам сетки.
+
+    Точки взлёта привязываются к сетке (`ST_SnapToGrid`) с шагом, зависящим
+    от `zoom`, и считаются по ячейкам, так что карте не нужны сами полёты.
+    Ответ кэшируется до загрузки новых данных; версия данных и параметры
+    запроса отдаются в заголовке `ETag`, при совпадении `If-None-Match`
+    возвращается 304.
+
+    - 200: сетка построена
+    - 304: данные не изменились
+    - 400: неверные параметры запроса
+    - 500: ошибка построения сетки
+    """
+    try:
+        area = tuple(bbox.split(',')) if bbox else None
+        if area is not None and len(area) != 4:
+            raise ValueError('bbox must be min_lon,min_lat,max_lon,max_lat')
+        etag = aggregate_etag(
+            heatmap_key(zoom=zoom, bbox=area, start=date_from, end=date_to), tile_cache.version
+        )
+        if _not_modified(request, etag):
+            return _not_modified_response(etag)
+        grid = await get_flight_heatmap(
+            db_session, zoom=zoom, bbox=area, start=date_from, end=date_to
+        )
+    except ValueError as exc:
+        raise IDException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+    except HeatmapError as exc:
+        raise IDException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        )
+    body = FlightHeatmapResponse(zoom=zoom, **grid.content)
+    return Response(
+        content=body.model_dump_json(),
+        media_type='application/json',
+        headers=_cache_headers(grid.etag),
+    )
+
+
+@router.get(
+    '/tiles/{z}/{x}/{y}.mvt',
+    status_code=status.HTTP_200_OK,
+    response_class=Response,
+    responses={200: {'content': {MVT_MEDIA_TYPE: {}}}},
+)
+async def get_flights_tile(
+    request: Request,
+    z: int,
+    x: int,
+    y: int,
+    date_from: datetime | None = Query(None, description='Начало периода в ISO 8601'),
+    date_to: datetime | None = Query(None, description='Конец периода в ISO 8601'),
+    db_session: AsyncSession = Depends(get_database),
+):
+    """Векторный тайл (Mapbox Vector Tile) плотности полётов БВС.
+
+    Слой `flights` содержит по точке на каждую непустую ячейку сетки тайла
+    с атрибутом `flights` — числом взлётов. Тайлы кэшируются так же, как
+    `/heatmap`, с версией данных и координатами тайла в `ETag`.
+
+    - 200: тайл построен (пустой тайл, если полётов нет)
+    - 304: данные не изменились
+    - 400: тайла с такими координатами нет
+    - 500: ошибка построения тайла
+    """
+    try:
+        etag = aggregate_etag(
+            tile_key(z=z, x=x, y=y, start=date_from, end=date_to), tile_cache.version
+        )
+        if _not_modified(request, etag):
+            return _not_modified_response(etag)
+        tile = await get_flight_tile(db_session, z=z, x=x, y=y, start=date_from, end=date_to)
+    except ValueError as exc:
+        raise IDException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+    except HeatmapError as exc:
+        raise IDException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        )
+    return Response(
+        content=tile.content, media_type=MVT_MEDIA_TYPE, headers=_cache_headers(tile.etag)
+    )
+
+
+def _cache_headers(etag: str) -> dict[str, str]:
+    # Clients keep the response but revalidate it, new uploads change the ETag
+    return {'ETag': f'"{etag}"', 'Cache-Control': 'no-cache'}
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    return request.headers.get('if-none-match') == f'"{etag}"'
+
+
+def _not_modified_response(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag))
+
+
+async def _ndjson_lines(rows: AsyncIterator[dict]) -> AsyncIterator[str]:
+    async for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + '\n'
@@ -10,6 +10,22 @@ class FileUploadResponseSchema(BaseModel):
     status: str
     message: str
     sheet_names: list[str] | None
+    timings: Dict[str, Any] | None = None
+
+
+class FileStatusResponseSchema(BaseModel):
+    file_id: str
+    filename: str
+    file_size: int
+    status: str
+    message: str
+    sheet_names: list[str] | None
+    rows_parsed: int
+    rows_inserted: int
+    current_sheet: str | None
+    error: str | None
+    is_active: bool | None
+    timings: Dict[str, Any] | None = None
 
 
 class FileInfoSchema(BaseModel):
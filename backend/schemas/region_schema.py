@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+
+class RegionLoadResultSchema(BaseModel):
+    name: str
+    polygons: int
+    vertices: int
+    area: int | None
+    seconds: float
+    error: str | None
+
+
+class ShapefileUploadResponseSchema(BaseModel):
+    status: str
+    regions: list[str]
+    timings: dict[str, float]
+    report: list[RegionLoadResultSchema]
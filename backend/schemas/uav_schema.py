@@ -1,3 +1,6 @@
+from datetime import date, datetime
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -5,6 +8,7 @@ class DateBoundsQuery(BaseModel):
     min_date: str = Field(..., description='Начало диапазона дат в ISO-формате')
     max_date: str = Field(..., description='Конец диапазона дат в ISO-формате')
     limit: int | None = Field(None, ge=1, le=1000)
+    cursor: str | None = Field(None, description='Курсор следующей страницы')
 
 
 class DateBoundsResponse(BaseModel):
@@ -14,3 +18,59 @@ class DateBoundsResponse(BaseModel):
 
 class UavFlightsResponse(BaseModel):
     flights: list[dict] | None
+    next_cursor: str | None = None
+
+
+class FlightSearchQuery(BaseModel):
+    bbox: tuple[float, float, float, float] | None = Field(
+        None, description='Прямоугольник [min_lon, min_lat, max_lon, max_lat] в WGS 84'
+    )
+    polygon: dict | None = Field(None, description='GeoJSON-геометрия Polygon или MultiPolygon')
+    region_id: int | None = Field(None, description='Регион, определённый при загрузке')
+    point: Literal['takeoff', 'landing', 'any'] = Field(
+        'takeoff', description='Какая точка полёта проверяется фильтрами по месту'
+    )
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+    uav_type: str | None = None
+    operator_type: str | None = None
+    limit: int = Field(100, ge=1, le=1000)
+    cursor: str | None = Field(None, description='Курсор следующей страницы')
+
+
+class FlightHeatmapResponse(BaseModel):
+    zoom: int
+    cell_size: float = Field(..., description='Сторона ячейки сетки в градусах')
+    cells: list[tuple[float, float, int]] = Field(
+        ..., description='Ячейки [lon, lat, flights]: центр ячейки и число взлётов'
+    )
+
+
+StatsDimension = Literal['day', 'major_region_id', 'uav_type', 'operator_type']
+
+
+class FlightStatsQuery(BaseModel):
+    date_from: date | None = Field(None, description='Первый день периода (включительно)')
+    date_to: date | None = Field(None, description='Последний день периода (включительно)')
+    major_region_id: int | None = None
+    uav_type: str | None = None
+    operator_type: str | None = None
+    group_by: list[StatsDimension] = Field(default_factory=lambda: ['day'])
+
+
+class FlightStatsRow(BaseModel):
+    day: date | None = None
+    major_region_id: int | None = None
+    uav_type: str | None = None
+    operator_type: str | None = None
+    flights: int
+    duration_total_minutes: float
+    duration_mean_minutes: float | None
+    distance_total_km: float
+    distance_mean_km: float | None
+    speed_mean_kmh: float | None
+
+
+class FlightStatsResponse(BaseModel):
+    group_by: list[StatsDimension]
+    stats: list[FlightStatsRow]
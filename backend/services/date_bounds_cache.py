@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.settings import application_settings
+from backend.repositories.uav_repository import uav_flight_repo
+
+DateBounds = tuple[datetime | None, datetime | None]
+
+
+class DateBoundsCache:
+    """In-process TTL cache of the `min(date)` / `max(date)` of `uav_flights`.
+
+    Writers call `invalidate` when flights change; the TTL bounds staleness
+    for changes made by other processes. A load that races with `invalidate`
+    is returned to its caller but not cached. `ttl <= 0` disables caching.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._bounds: DateBounds | None = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return self._bounds is not None and time.monotonic() < self._expires_at
+
+    def invalidate(self) -> None:
+        self._bounds = None
+        self._generation += 1
+
+    async def get(self, db_session: AsyncSession) -> DateBounds:
+        if self._fresh():
+            return self._bounds
+        async with self._lock:
+            if self._fresh():
+                return self._bounds
+            generation = self._generation
+            bounds = await uav_flight_repo.get_date_bounds(db_session)
+            if self.ttl > 0 and generation == self._generation:
+                self._bounds = bounds
+                self._expires_at = time.monotonic() + self.ttl
+            return bounds
+
+
+date_bounds_cache = DateBoundsCache(ttl=application_settings.APP_DATE_BOUNDS_TTL)
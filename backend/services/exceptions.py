@@ -26,3 +26,51 @@ class FileDeactivateError(ServiceError):
     """Raised when existing file metadata records cannot be deactivated."""
 
     pass
+
+
+class FileProcessError(ServiceError):
+    """Raised when an uploaded file cannot be parsed or ingested."""
+
+    pass
+
+
+class IngestQueueFullError(ServiceError):
+    """Raised when the ingestion queue cannot accept another file."""
+
+    pass
+
+
+class FileTooLargeError(ServiceError):
+    """Raised when an upload exceeds the allowed size."""
+
+    pass
+
+
+class RegionAssignError(ServiceError):
+    """Raised when flights cannot be assigned to regions."""
+
+    pass
+
+
+class OperatorCacheError(ServiceError):
+    """Raised when operator classifications cannot be loaded or stored."""
+
+    pass
+
+
+class FlightStatsError(ServiceError):
+    """Raised when flight statistics cannot be refreshed or read."""
+
+    pass
+
+
+class HeatmapError(ServiceError):
+    """Raised when a flight density grid or tile cannot be built."""
+
+    pass
+
+
+class RegionGeometryError(ServiceError):
+    """Raised when simplified region geometries cannot be built or read."""
+
+    pass
@@ -7,7 +7,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.database.models import FileMetadataModel
 from backend.repositories.file_repository import file_metadata_repo
+from backend.services.date_bounds_cache import date_bounds_cache
 from backend.services.exceptions import FileCreateError, FileDeactivateError, ServiceError
+from backend.services.tile_cache import tile_cache
 
 
 async def deactivate_old_files(
@@ -54,6 +56,8 @@ async def deactivate_old_files(
             )
     except SQLAlchemyError as exc:
         raise FileDeactivateError(f'Failed to deactivate old files: {exc}') from exc
+    date_bounds_cache.invalidate()
+    tile_cache.invalidate()
 
 
 async def create_file_metadata(
@@ -67,6 +71,8 @@ async def create_file_metadata(
     is_active: bool = True,
     deactivate_previous: bool = True,
     deactivate_filters: dict[str, Any] | None = None,
+    content_sha256: str | None = None,
+    sheet_hashes: dict[str, str | None] | None = None,
 ) -> FileMetadataModel:
     """Create a new FileMetadata record and optionally deactivate older active versions.
 
@@ -82,6 +88,8 @@ async def create_file_metadata(
         is_active: Whether the created record should be active.
         deactivate_previous: If True, deactivates older active records for the same filename.
         deactivate_filters: Extra filters for deactivation (merged with `{'filename': filename}`).
+        content_sha256: Optional hex SHA-256 of the file content.
+        sheet_hashes: Optional content hash of each sheet, by sheet name.
 
     Returns:
         FileMetadata: Created file metadata row.
@@ -99,6 +107,8 @@ async def create_file_metadata(
             message=message,
             sheet_names=sheet_names,
             is_active=is_active,
+            content_sha256=content_sha256,
+            sheet_hashes=sheet_hashes,
         )
     except SQLAlchemyError as exc:
         raise FileCreateError(f"Failed to create file metadata for '{filename}': {exc}") from exc
@@ -117,20 +127,146 @@ async def create_file_metadata(
     return new_file
 
 
+async def find_processed_file(
+    db_session: AsyncSession, *, filename: str, content_sha256: str
+) -> FileMetadataModel | None:
+    """Find the active, processed version of `filename` with exactly this content.
+
+    Queued or failed uploads are not matched: their content may never be ingested.
+
+    Args:
+        db_session: Active async DB session.
+        filename: Stored file name.
+        content_sha256: Hex SHA-256 of the uploaded content.
+
+    Returns:
+        FileMetadata | None: The matching record, if any.
+
+    Raises:
+        ServiceError: Wrapped SQLAlchemy errors.
+    """
+    try:
+        files = await file_metadata_repo.get_all(
+            db_session,
+            filename=filename,
+            content_sha256=content_sha256,
+            status='processed',
+            is_active=True,
+        )
+    except SQLAlchemyError as exc:
+        raise ServiceError(f'Failed to look up file by content: {exc}') from exc
+    return files[0] if files else None
+
+
+async def unchanged_sheets(
+    db_session: AsyncSession,
+    *,
+    filename: str,
+    file_id: str,
+    sheet_hashes: dict[str, str | None] | None,
+) -> set[str]:
+    """Names of sheets whose content equals that of the active processed version.
+
+    The flights of such a sheet are already stored, bound to an earlier version
+    of the file, so ingesting it again would only hit `ON CONFLICT DO NOTHING`.
+    Sheets without a hash are never reported as unchanged.
+
+    Args:
+        db_session: Active async DB session.
+        filename: Stored file name.
+        file_id: FileMetadata.file_id of the new version, excluded from the lookup.
+        sheet_hashes: Content hash of each sheet of the new version.
+
+    Returns:
+        set[str]: Sheet names that can be skipped.
+
+    Raises:
+        ServiceError: Wrapped SQLAlchemy errors.
+    """
+    if not sheet_hashes:
+        return set()
+    try:
+        previous = await file_metadata_repo.get_all(
+            db_session, filename=filename, status='processed', is_active=True
+        )
+    except SQLAlchemyError as exc:
+        raise ServiceError(f'Failed to get previous file versions: {exc}') from exc
+
+    known = {
+        (name, digest)
+        for fm in previous
+        if str(fm.file_id) != str(file_id)
+        for name, digest in (fm.sheet_hashes or {}).items()
+        if digest
+    }
+    return {name for name, digest in sheet_hashes.items() if digest and (name, digest) in known}
+
+
+async def fail_unfinished_files(db_session: AsyncSession, *, message: str, error: str) -> list[str]:
+    """Mark every `queued` or `processing` FileMetadata record as `failed`.
+
+    Args:
+        db_session: Active async DB session.
+        message: Status message of the failed records.
+        error: Error detail of the failed records.
+
+    Returns:
+        list[str]: Ids of the records marked as failed.
+
+    Raises:
+        ServiceError: Wrapped SQLAlchemy errors.
+    """
+    try:
+        return await file_metadata_repo.update_by_status(
+            db_session, ('queued', 'processing'), status='failed', message=message, error=error
+        )
+    except SQLAlchemyError as exc:
+        raise ServiceError(f'Failed to fail unfinished files: {exc}') from exc
+
+
+async def get_file_metadata(db_session: AsyncSession, *, file_id: str) -> FileMetadataModel | None:
+    """Fetch a FileMetadata record by id.
+
+    Args:
+        db_session: Active async DB session.
+        file_id: FileMetadata.file_id (UUID as str/UUID).
+
+    Returns:
+        FileMetadata | None: The record, or None if it does not exist.
+
+    Raises:
+        ServiceError: Wrapped SQLAlchemy errors.
+    """
+    try:
+        return await file_metadata_repo.get_one(db_session, file_id=file_id)
+    except SQLAlchemyError as exc:
+        raise ServiceError(f'Failed to get file metadata: {exc}') from exc
+
+
 async def update_file_status(
     db_session: AsyncSession,
     *,
     file_id: str,
     status: str,
     message: str | None = None,
+    rows_parsed: int | None = None,
+    rows_inserted: int | None = None,
+    current_sheet: str | None = None,
+    error: str | None = None,
+    timings: dict[str, Any] | None = None,
 ) -> None:
-    """Update status/message of a FileMetadata record.
+    """Update status/message and ingestion progress of a FileMetadata record.
 
     Args:
         db_session: Active async DB session.
         file_id: FileMetadata.file_id (UUID as str/UUID).
         status: New status value.
         message: Optional message.
+        rows_parsed: Optional number of rows mapped so far.
+        rows_inserted: Optional number of flights inserted so far.
+        current_sheet: Optional name of the sheet being processed.
+        error: Optional error detail of a failed ingestion.
+        timings: Optional timing report of the ingestion (`IngestProfile.as_dict`).
 
     Raises:
         ServiceError: Wrapped SQLAlchemy errors.
@@ -138,7 +274,17 @@ async def update_file_status(
     try:
         values: dict[str, Any] = {'status': status}
         if message is not None:
-            values['message'] = message
+            values['message'] = message[:128]
+        if rows_parsed is not None:
+            values['rows_parsed'] = rows_parsed
+        if rows_inserted is not None:
+            values['rows_inserted'] = rows_inserted
+        if current_sheet is not None:
+            values['current_sheet'] = current_sheet
+        if error is not None:
+            values['error'] = error
+        if timings is not None:
+            values['timings'] = timings
         await file_metadata_repo.update_one({'file_id': file_id}, db_session, **values)
     except SQLAlchemyError as exc:
         raise ServiceError(f'Failed to update file status: {exc}') from exc
@@ -0,0 +1,175 @@
+"""Flight density aggregates for map rendering.
+
+The map gets takeoff counts per grid cell instead of raw flights: a JSON grid
+of `ST_SnapToGrid` buckets whose size follows the zoom level, or a Mapbox
+Vector Tile per `z/x/y`. Both are cached in `tile_cache` per request and data
+version; the ETag combines the version with the request's cache key.
+"""
+
+import hashlib
+import logging
+from collections.abc import Hashable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.repositories.uav_repository import uav_flight_repo
+from backend.services.exceptions import HeatmapError
+from backend.services.tile_cache import tile_cache
+from backend.services.uav_service import validate_bbox
+
+logger = logging.getLogger(__name__)
+
+MAX_ZOOM = 20
+# Grid cells along one side of a map tile at the requested zoom
+GRID_CELLS_PER_TILE = 32
+TILE_CELLS = 256
+# Upper bound of grid cells a single JSON request may cover
+MAX_GRID_CELLS = 65_536
+
+WORLD_BBOX = (-180.0, -90.0, 180.0, 90.0)
+
+
+@dataclass
+class CachedAggregate:
+    """An aggregate together with its cache key and the data version it was built for."""
+
+    content: Any
+    version: str
+    key: Hashable
+
+    @property
+    def etag(self) -> str:
+        return aggregate_etag(self.key, self.version)
+
+
+def aggregate_etag(key: Hashable, version: str) -> str:
+    """ETag of the aggregate cached under `key` at data `version`."""
+    return f'{version}-{hashlib.sha1(repr(key).encode()).hexdigest()[:16]}'
+
+
+def grid_cell_size(zoom: int) -> float:
+    """Side of a JSON grid cell in degrees at `zoom`."""
+    return 360 / (2**zoom * GRID_CELLS_PER_TILE)
+
+
+def _check_zoom(zoom: int) -> None:
+    if not 0 <= zoom <= MAX_ZOOM:
+        raise ValueError(f'Zoom must be between 0 and {MAX_ZOOM}')
+
+
+def _check_window(start: datetime | None, end: datetime | None) -> None:
+    if start and end and start > end:
+        raise ValueError('date_from must not be after date_to')
+
+
+def heatmap_key(
+    *,
+    zoom: int,
+    bbox: tuple[float, float, float, float] | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> tuple:
+    """Validate a heatmap request and return its cache key.
+
+    Raises:
+        ValueError: On a bad zoom, bbox or time window, or if the bbox
+            covers more than `MAX_GRID_CELLS` cells at this zoom.
+    """
+    _check_zoom(zoom)
+    _check_window(start, end)
+    bbox = validate_bbox(bbox) if bbox is not None else WORLD_BBOX
+    cell_size = grid_cell_size(zoom)
+    cells = ((bbox[2] - bbox[0]) / cell_size + 1) * ((bbox[3] - bbox[1]) / cell_size + 1)
+    if cells > MAX_GRID_CELLS:
+        raise ValueError('Area is too large for this zoom, narrow the bbox')
+    return ('grid', zoom, bbox, start, end)
+
+
+def tile_key(
+    *,
+    z: int,
+    x: int,
+    y: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> tuple:
+    """Validate a vector tile request and return its cache key.
+
+    Raises:
+        ValueError: On tile coordinates outside the zoom level or a bad time window.
+    """
+    _check_zoom(z)
+    if not (0 <= x < 2**z and 0 <= y < 2**z):
+        raise ValueError(f'Tile {z}/{x}/{y} does not exist')
+    _check_window(start, end)
+    return ('mvt', z, x, y, start, end)
+
+
+async def get_flight_heatmap(
+    db_session: AsyncSession,
+    *,
+    zoom: int,
+    bbox: tuple[float, float, float, float] | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> CachedAggregate:
+    """Takeoff counts per grid cell, as `{'cell_size': ..., 'cells': [[lon, lat, flights]]}`.
+
+    Raises:
+        ValueError: On a bad zoom, bbox or time window, or if the bbox
+            covers more than `MAX_GRID_CELLS` cells at this zoom.
+        HeatmapError: On DB errors.
+    """
+    key = heatmap_key(zoom=zoom, bbox=bbox, start=start, end=end)
+    _, zoom, bbox, start, end = key
+    cell_size = grid_cell_size(zoom)
+
+    version = tile_cache.version
+    grid = tile_cache.get(key)
+    if grid is None:
+        try:
+            rows = await uav_flight_repo.get_density_grid(
+                db_session, cell_size=cell_size, bbox=bbox, start=start, end=end
+            )
+        except SQLAlchemyError as exc:
+            raise HeatmapError(f'Failed to build flight heatmap: {exc}') from exc
+        grid = {
+            'cell_size': cell_size,
+            'cells': [(row.lon, row.lat, row.flights) for row in rows],
+        }
+        tile_cache.put(key, grid, version=version)
+    return CachedAggregate(grid, version, key)
+
+
+async def get_flight_tile(
+    db_session: AsyncSession,
+    *,
+    z: int,
+    x: int,
+    y: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> CachedAggregate:
+    """Vector tile `z/x/y` of takeoff counts on a `TILE_CELLS`-wide grid.
+
+    Raises:
+        ValueError: On tile coordinates outside the zoom level or a bad time window.
+        HeatmapError: On DB errors.
+    """
+    key = tile_key(z=z, x=x, y=y, start=start, end=end)
+
+    version = tile_cache.version
+    tile = tile_cache.get(key)
+    if tile is None:
+        try:
+            tile = await uav_flight_repo.get_density_tile(
+                db_session, z=z, x=x, y=y, cells=TILE_CELLS, start=start, end=end
+            )
+        except SQLAlchemyError as exc:
+            raise HeatmapError(f'Failed to build flight tile {z}/{x}/{y}: {exc}') from exc
+        tile_cache.put(key, tile, version=version)
+    return CachedAggregate(tile, version, key)
@@ -0,0 +1,113 @@
+"""Timing breakdown of one workbook ingestion.
+
+Seconds are summed per sheet and per stage:
+
+- `load`: reading rows with openpyxl;
+- `map`: `VectorizedMapper.map_frame`;
+- `regions`: resolving region ids with the in-process index;
+- `records`: validating the mapped columns into `FlightRecords`;
+- `insert`: the INSERT/COPY of a batch, including the region trigger.
+
+With a parse pool `load` and `map` are measured in the worker processes, so
+they can add up to more than the wall time. Whole-file steps (region
+assignment, statistics, deactivation) are kept apart from the sheets.
+Optionally the run is captured with cProfile; only the event loop process is
+profiled, and other coroutines running meanwhile show up in the profile too.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOP = 40
+
+# cProfile allows one active profiler per interpreter
+_profiling = False
+
+
+class IngestProfile:
+    """Per-sheet, per-stage seconds and row counts of an ingestion."""
+
+    def __init__(self, *, capture: bool = False) -> None:
+        self.capture = capture
+        self.sheets: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.rows: dict[str, int] = defaultdict(int)
+        self.steps: dict[str, float] = {}
+        self.wall_seconds = 0.0
+        self.profile: str | None = None
+
+    def add(self, sheet_name: str, rows: int = 0, **stage_seconds: float) -> None:
+        self.rows[sheet_name] += rows
+        stages = self.sheets[sheet_name]
+        for stage, seconds in stage_seconds.items():
+            stages[stage] += seconds
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Time a whole-file step."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = self.steps.get(name, 0.0) + time.perf_counter() - started
+
+    @contextmanager
+    def run(self) -> Iterator[None]:
+        """Measure the wall time of the ingestion and capture it if requested."""
+        global _profiling
+        profiler = None
+        if self.capture:
+            if _profiling:
+                logger.warning('Another ingestion is being profiled, capture skipped')
+            else:
+                _profiling = True
+                profiler = cProfile.Profile()
+                profiler.enable()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.wall_seconds = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+                _profiling = False
+                self.profile = _format_profile(profiler)
+
+    def totals(self) -> dict[str, float]:
+        totals: dict[str, float] = defaultdict(float)
+        for stages in self.sheets.values():
+            for stage, seconds in stages.items():
+                totals[stage] += seconds
+        return dict(totals)
+
+    def as_dict(self) -> dict[str, Any]:
+        """JSON-ready report stored in `file_metadata.timings`."""
+        return {
+            'wall_seconds': round(self.wall_seconds, 4),
+            'stages': _rounded(self.totals()),
+            'steps': _rounded(self.steps),
+            'sheets': {
+                name: {'rows': self.rows[name], 'stages': _rounded(stages)}
+                for name, stages in self.sheets.items()
+            },
+            'profile': self.profile,
+        }
+
+
+def _rounded(seconds: dict[str, float]) -> dict[str, float]:
+    return {name: round(value, 4) for name, value in seconds.items()}
+
+
+def _format_profile(profiler: cProfile.Profile) -> str:
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(PROFILE_TOP)
+    return out.getvalue()
@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import aclosing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Collection
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.settings import application_settings
+from backend.database.base import db_manager
+from backend.metrics import record_ingest_batch
+from backend.services.date_bounds_cache import date_bounds_cache
+from backend.services.exceptions import FileProcessError, IngestQueueFullError, ServiceError
+from backend.services.file_service import (
+    deactivate_old_files,
+    fail_unfinished_files,
+    unchanged_sheets,
+    update_file_status,
+)
+from backend.services.ingest_profile import IngestProfile
+from backend.services.operator_service import (
+    load_operator_classifications,
+    save_operator_classifications,
+)
+from backend.services.parse_service.geocoder import DefaultGeocoder
+from backend.services.parse_service.loader import StreamingExcelLoader
+from backend.services.parse_service.mapper import VectorizedMapper
+from backend.services.parse_service.party_classifier import PartyClassifier
+from backend.services.parse_service.pool import ParsedChunk, ParsePool, iter_mapped_chunks
+from backend.services.parse_service.records import FlightRecords, flight_records
+from backend.services.region_index import region_index
+from backend.services.stats_service import refresh_flight_stats
+from backend.services.tile_cache import tile_cache
+from backend.services.uav_service import (
+    assign_flight_regions,
+    copy_uav_flights,
+    create_uav_flights,
+    disable_region_trigger,
+)
+
+logger = logging.getLogger(__name__)
+
+# Shared by all files and sheets so operator classifications are computed once
+party_classifier = PartyClassifier(cache_size=application_settings.APP_OPERATOR_CACHE_SIZE)
+
+parse_pool = ParsePool(
+    workers=application_settings.APP_PARSE_WORKERS,
+    queue_size=application_settings.APP_PARSE_QUEUE_SIZE,
+)
+
+
+@dataclass
+class IngestJob:
+    """An uploaded workbook spooled to `path`, waiting to be parsed."""
+
+    file_id: str
+    filename: str
+    path: Path
+    profile: bool = False
+    sheet_hashes: dict[str, str | None] | None = None
+
+
+@dataclass
+class IngestProgress:
+    """Running counters of a single ingestion, mirrored to `file_metadata`."""
+
+    rows_parsed: int = 0
+    rows_inserted: int = 0
+    current_sheet: str | None = None
+
+
+ProgressCallback = Callable[[IngestProgress], Awaitable[None]]
+
+
+async def process_xlsx_file(
+    db_session: AsyncSession,
+    path: Path,
+    file_id: str,
+    on_progress: ProgressCallback | None = None,
+    classifier: PartyClassifier | None = None,
+    profile: IngestProfile | None = None,
+    skip_sheets: Collection[str] = (),
+) -> IngestProgress:
+    """Parse an Excel workbook and store its flights.
+
+    Sheets are streamed in chunks of `APP_BATCH_PROCESSING` rows; each chunk
+    is mapped at once, validated column by column (`flight_records`) and
+    inserted as one batch bound to `file_id`. With
+    `APP_PARSE_WORKERS > 0` sheets are read and mapped in the parse process
+    pool, and chunks are inserted in the order they finish. With
+    `APP_REGION_ASSIGNMENT='index'` region ids are resolved in process before
+    the insert.
+    `on_progress` is awaited after each inserted batch. Stage timings of every
+    batch are exported as metrics and added to `profile`.
+
+    Args:
+        db_session: Active async DB session used for the inserts.
+        path: Path of the workbook on disk.
+        file_id: FileMetadata.file_id the flights belong to.
+        on_progress: Optional progress reporter.
+        classifier: Operator classifier; defaults to the shared cached one.
+        profile: Optional timing breakdown to fill.
+        skip_sheets: Names of sheets not to read at all.
+
+    Returns:
+        IngestProgress: Final counters.
+
+    Raises:
+        ServiceError: On DB errors while inserting.
+        FileProcessError: On any parsing error.
+    """
+    progress = IngestProgress()
+    classifier = classifier or party_classifier
+    resolve_regions = application_settings.APP_REGION_ASSIGNMENT == 'index'
+    if resolve_regions:
+        await region_index.ensure_loaded(db_session)
+
+    try:
+        async with aclosing(_iter_frames(path, classifier, skip_sheets)) as frames:
+            async for chunk in frames:
+                progress.current_sheet = chunk.sheet_name
+                started = time.perf_counter()
+                if resolve_regions:
+                    region_index.fill_frame(chunk.frame)
+                regions_done = time.perf_counter()
+                records = flight_records(chunk.frame, file_id=file_id)
+                records_done = time.perf_counter()
+                inserted = await _insert_batch(db_session, records)
+                stages = {
+                    'load': chunk.load_seconds,
+                    'map': chunk.map_seconds,
+                    'regions': regions_done - started,
+                    'records': records_done - regions_done,
+                    'insert': time.perf_counter() - records_done,
+                }
+                record_ingest_batch(parsed=len(records), inserted=inserted, **stages)
+                if profile is not None:
+                    profile.add(chunk.sheet_name, len(records), **stages)
+                progress.rows_parsed += len(records)
+                progress.rows_inserted += inserted
+                logger.info('Created uav models %s / %s', progress.rows_inserted, chunk.sheet_name)
+                if on_progress is not None:
+                    await on_progress(progress)
+
+    except ServiceError:
+        raise
+    except Exception as exc:
+        raise FileProcessError(f'Unexpected parsing error: {exc}') from exc
+    return progress
+
+
+async def _iter_frames(
+    path: Path, classifier: PartyClassifier, skip_sheets: Collection[str] = ()
+) -> AsyncIterator[ParsedChunk]:
+    chunk_rows = application_settings.APP_BATCH_PROCESSING
+    with StreamingExcelLoader(path, chunk_rows=chunk_rows) as loader:
+        sheet_names = [name for name in loader.sheet_names if name not in skip_sheets]
+        if application_settings.APP_PARSE_WORKERS <= 0:
+            mapper = VectorizedMapper(DefaultGeocoder(), classifier)
+            for sheet_name in sheet_names:
+                for frame, load_seconds, map_seconds in iter_mapped_chunks(
+                    loader, sheet_name, mapper
+                ):
+                    yield ParsedChunk(
+                        sheet_name, frame, load_seconds=load_seconds, map_seconds=map_seconds
+                    )
+            return
+
+    chunks = parse_pool.iter_chunks(path, sheet_names, chunk_rows=chunk_rows, classifier=classifier)
+    async with aclosing(chunks):
+        async for chunk in chunks:
+            yield chunk
+
+
+async def _insert_batch(db_session: AsyncSession, batch: FlightRecords) -> int:
+    if application_settings.APP_INGEST_COPY:
+        result = await copy_uav_flights(db_session, batch)
+        return result.inserted
+    inserted = await create_uav_flights(db_session, data=batch.as_dicts())
+    return len(inserted or [])
+
+
+async def _report_status(file_id: str, status: str, **fields) -> None:
+    """Persist file status in its own short transaction so pollers see it at once."""
+    async with db_manager.async_session() as session:
+        async with session.begin():
+            await update_file_status(session, file_id=file_id, status=status, **fields)
+
+
+async def _load_operator_cache() -> None:
+    if party_classifier.cache_info().size:
+        return
+    try:
+        async with db_manager.async_session() as session:
+            await load_operator_classifications(session, party_classifier)
+    except ServiceError:
+        logger.warning('Operator classifications not loaded', exc_info=True)
+
+
+async def _save_operator_cache() -> None:
+    try:
+        async with db_manager.async_session() as session:
+            async with session.begin():
+                await save_operator_classifications(session, party_classifier)
+    except ServiceError:
+        logger.warning('Operator classifications not saved', exc_info=True)
+
+
+async def run_ingest_job(job: IngestJob) -> None:
+    """Parse one queued workbook and record the outcome on its FileMetadata row.
+
+    Flights are inserted in a single transaction, so a failed file leaves no
+    partial data behind; progress is committed separately as it goes. Regions
+    are resolved according to `APP_REGION_ASSIGNMENT`: by the in-process index
+    before insert (`index`), by one set-based pass over the file after the load
+    (`sql`), or per row by the insert trigger (`trigger`). On success older
+    active versions of the same filename are deactivated. Sheets whose content
+    hash equals that of the active processed version are not read again:
+    their flights are already stored. The file's flights are merged into the
+    daily statistics rollup in the same transaction.
+    With `APP_OPERATOR_CACHE_PERSIST` operator classifications are read from
+    and written back to `operator_classifications`. The timing breakdown of the
+    run (see `IngestProfile`) is stored in `file_metadata.timings`, with a
+    cProfile report if `job.profile` or `APP_INGEST_PROFILE` is set.
+    """
+
+    async def on_progress(progress: IngestProgress) -> None:
+        await _report_status(
+            job.file_id,
+            'processing',
+            rows_parsed=progress.rows_parsed,
+            rows_inserted=progress.rows_inserted,
+            current_sheet=progress.current_sheet,
+        )
+
+    profile = IngestProfile(capture=job.profile or application_settings.APP_INGEST_PROFILE)
+    try:
+        await _report_status(job.file_id, 'processing', message='Processing')
+        with profile.run():
+            if application_settings.APP_OPERATOR_CACHE_PERSIST:
+                with profile.step('operators_load'):
+                    await _load_operator_cache()
+            async with db_manager.async_session() as session:
+                async with session.begin():
+                    if application_settings.APP_REGION_ASSIGNMENT != 'trigger':
+                        await disable_region_trigger(session)
+                    skip_sheets = await unchanged_sheets(
+                        session,
+                        filename=job.filename,
+                        file_id=job.file_id,
+                        sheet_hashes=job.sheet_hashes,
+                    )
+                    progress = await process_xlsx_file(
+                        session,
+                        job.path,
+                        job.file_id,
+                        on_progress=on_progress,
+                        profile=profile,
+                        skip_sheets=skip_sheets,
+                    )
+                    if application_settings.APP_REGION_ASSIGNMENT == 'sql':
+                        with profile.step('assign_regions'):
+                            await assign_flight_regions(session, file_id=job.file_id)
+                    with profile.step('stats'):
+                        await refresh_flight_stats(session, file_id=job.file_id)
+                    with profile.step('deactivate'):
+                        await deactivate_old_files(
+                            session, filename=job.filename, exclude_file_id=job.file_id
+                        )
+                    commit_started = time.perf_counter()
+                profile.steps['commit'] = time.perf_counter() - commit_started
+            # Bounds and tiles read while the transaction was open may predate these flights
+            date_bounds_cache.invalidate()
+            tile_cache.invalidate()
+            if application_settings.APP_OPERATOR_CACHE_PERSIST:
+                with profile.step('operators_save'):
+                    await _save_operator_cache()
+        message = 'File processed successfully'
+        if skip_sheets:
+            message += f', {len(skip_sheets)} unchanged sheet(s) skipped'
+        await _report_status(
+            job.file_id,
+            'processed',
+            message=message,
+            rows_parsed=progress.rows_parsed,
+            rows_inserted=progress.rows_inserted,
+            timings=profile.as_dict(),
+        )
+    except Exception as exc:
+        logger.exception('Failed to process file %s', job.file_id)
+        await _report_status(
+            job.file_id,
+            'failed',
+            message='Failed to process file',
+            error=str(exc),
+            timings=profile.as_dict(),
+        )
+    finally:
+        job.path.unlink(missing_ok=True)
+
+
+async def fail_interrupted_files() -> None:
+    """Fail the files a previous run of the process left queued or processing.
+
+    Neither the queue nor the workbooks it holds outlive the process, so such
+    files can never finish and are marked `failed` for clients polling their
+    status. Must run before the queue accepts jobs; it assumes a single
+    process serves the ingest queue, as `entrypoint.sh` starts one.
+    """
+    try:
+        async with db_manager.async_session() as session:
+            async with session.begin():
+                file_ids = await fail_unfinished_files(
+                    session,
+                    message='Interrupted by a server restart, upload the file again',
+                    error='Ingestion was interrupted by a server restart',
+                )
+    except ServiceError:
+        logger.warning('Interrupted files not marked as failed', exc_info=True)
+        return
+    if file_ids:
+        logger.warning('Marked %s interrupted files as failed: %s', len(file_ids), file_ids)
+
+
+class IngestQueue:
+    """Bounded in-process queue of uploaded workbooks served by a pool of workers."""
+
+    def __init__(self, maxsize: int, workers: int):
+        self.maxsize = maxsize
+        self.workers = workers
+        self._queue: asyncio.Queue[IngestJob] | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def full(self) -> bool:
+        return self._queue is not None and self._queue.full()
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f'ingest-worker-{n}')
+            for n in range(self.workers)
+        ]
+        logger.info('Ingest queue started with %s workers', self.workers)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while self._queue is not None and not self._queue.empty():
+            self._queue.get_nowait().path.unlink(missing_ok=True)
+        self._queue = None
+
+    def submit(self, job: IngestJob) -> None:
+        """Enqueue a job without waiting.
+
+        Raises:
+            IngestQueueFullError: If the queue is not running or has no free slot.
+        """
+        if self._queue is None:
+            raise IngestQueueFullError('Ingest queue is not running')
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull as exc:
+            raise IngestQueueFullError(
+                f'Ingest queue is full ({self.maxsize} files waiting)'
+            ) from exc
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            job = await queue.get()
+            try:
+                await run_ingest_job(job)
+            except Exception:
+                logger.exception('Ingest worker crashed on file %s', job.file_id)
+            finally:
+                queue.task_done()
+
+
+ingest_queue = IngestQueue(
+    maxsize=application_settings.APP_INGEST_QUEUE_SIZE,
+    workers=application_settings.APP_INGEST_WORKERS,
+)
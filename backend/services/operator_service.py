@@ -0,0 +1,82 @@
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.repositories.operator_repository import operator_classification_repo
+from backend.services.exceptions import OperatorCacheError
+from backend.services.parse_service.party_classifier import PartyClassification, PartyClassifier
+
+logger = logging.getLogger(__name__)
+
+# 4 bind parameters per row, asyncpg accepts at most 32767 per statement
+_INSERT_CHUNK = 5000
+
+
+async def load_operator_classifications(
+    db_session: AsyncSession, classifier: PartyClassifier
+) -> int:
+    """Seed the classifier cache with classifications stored by earlier uploads.
+
+    At most `classifier.cache_size` rows are loaded.
+
+    Args:
+        db_session: Active async DB session.
+        classifier: Classifier whose cache is filled.
+
+    Returns:
+        int: Number of classifications loaded.
+
+    Raises:
+        OperatorCacheError: On DB errors.
+    """
+    if classifier.cache_size <= 0:
+        return 0
+    try:
+        rows = await operator_classification_repo.get_many(db_session, limit=classifier.cache_size)
+    except SQLAlchemyError as exc:
+        raise OperatorCacheError(f'Failed to load operator classifications: {exc}') from exc
+
+    classifier.seed(
+        (row.operator_raw, PartyClassification(row.category, row.confidence, row.normalized))
+        for row in rows
+    )
+    logger.info('Loaded %s operator classifications', len(rows))
+    return len(rows)
+
+
+async def save_operator_classifications(
+    db_session: AsyncSession, classifier: PartyClassifier
+) -> int:
+    """Store classifications computed since the last save.
+
+    Operators that are already stored are left untouched.
+
+    Args:
+        db_session: Active async DB session.
+        classifier: Classifier to take new classifications from.
+
+    Returns:
+        int: Number of rows inserted.
+
+    Raises:
+        OperatorCacheError: On DB errors.
+    """
+    rows = [
+        {
+            'operator_raw': key,
+            'category': result.category,
+            'confidence': result.confidence,
+            'normalized': result.normalized,
+        }
+        for key, result in classifier.pop_new().items()
+    ]
+    inserted = 0
+    try:
+        for i in range(0, len(rows), _INSERT_CHUNK):
+            inserted += await operator_classification_repo.insert_missing(
+                db_session, rows[i : i + _INSERT_CHUNK]
+            )
+    except SQLAlchemyError as exc:
+        raise OperatorCacheError(f'Failed to save operator classifications: {exc}') from exc
+    return inserted
@@ -1,34 +1,26 @@
-import re
 from typing import Protocol
 
+import pandas as pd
+
+from .rules import LATLON_PART_RE, LATLON_SPLIT_RE, LATLON_TRANSLATION
+
 
 class Geocoder(Protocol):
     def parse_latlon(self, val: str | None) -> tuple[float, float] | None: ...
 
+    def parse_latlon_series(self, values: pd.Series) -> pd.DataFrame: ...
+
 
 class DefaultGeocoder(Geocoder):
     def parse_latlon(self, val: str | None) -> tuple[float, float] | None:
         if val is None:
             return None
-        s = (
-            val.strip()
-            .upper()
-            .replace('°', '')
-            .replace("'", '')
-            .replace('"', '')
-            .replace(',', ' ')
-            .replace('  ', ' ')
-        )
-        s = s.replace('С', 'N').replace('Ю', 'S').replace('В', 'E').replace('З', 'W')
-
-        m_lat = re.search(r'([NS])', s)
-        m_lon = re.search(r'([EW])', s)
-        if not m_lat or not m_lon:
+        m = LATLON_SPLIT_RE.match(val.strip().upper().translate(LATLON_TRANSLATION))
+        if not m:
             return None
-        lat_dir = m_lat.group(1)
-        lon_dir = m_lon.group(1)
-        lat_part = s[: m_lat.start()].strip()
-        lon_part = s[m_lat.end() : m_lon.start()].strip()
+        lat_part, lat_dir, lon_part, lon_dir = m.groups()
+        lat_part = lat_part.strip()
+        lon_part = lon_part.strip()
         if not lat_part:
             return None
         if not lon_part:
@@ -46,10 +38,37 @@ class DefaultGeocoder(Geocoder):
 
     def _parse_part(self, part: str) -> float | None:
         part = part.replace(' ', '')
-        m = re.match(r'^(\d+)(\d{2}(?:\.\d+)?)$', part)
+        m = LATLON_PART_RE.match(part)
         if not m:
             return None
         deg_str, min_str = m.group(1), m.group(2)
         deg = int(deg_str)
         minutes = float(min_str)
         return deg + minutes / 60.0
+
+    def parse_latlon_series(self, values: pd.Series) -> pd.DataFrame:
+        """Vectorized `parse_latlon` over a whole column.
+
+        Returns a frame with `lat`/`lon` float columns aligned to `values.index`;
+        unparsable or missing entries are NaN.
+        """
+        s = (
+            values.where(values.notna(), '')
+            .astype(str)
+            .str.strip()
+            .str.upper()
+            .str.translate(LATLON_TRANSLATION)
+        )
+
+        parts = s.str.extract(LATLON_SPLIT_RE)
+        lat = self._parse_part_series(parts[0])
+        lon = self._parse_part_series(parts[2])
+        lat = lat.where(parts[1] != 'S', -lat)
+        lon = lon.where(parts[3] != 'W', -lon)
+        return pd.DataFrame({'lat': lat, 'lon': lon}, index=values.index)
+
+    def _parse_part_series(self, parts: pd.Series) -> pd.Series:
+        m = parts.str.strip().str.replace(' ', '', regex=False).str.extract(LATLON_PART_RE)
+        deg = pd.to_numeric(m[0], errors='coerce')
+        minutes = pd.to_numeric(m[1], errors='coerce')
+        return (deg + minutes / 60.0).astype(float)
@@ -1,8 +1,22 @@
+import hashlib
+import os
+import tempfile
 from abc import ABC, abstractmethod
-from typing import Any, Union
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterator, Protocol, Union
 
+import openpyxl
 import pandas as pd
 
+from backend.services.exceptions import FileTooLargeError
+
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+
+class AsyncReadable(Protocol):
+    async def read(self, size: int = -1) -> bytes: ...
+
 
 class Loader(ABC):
     @abstractmethod
@@ -21,3 +35,112 @@ class ExcelLoader(Loader):
             self.source, sheet_name=self.sheet_name, usecols=self.usecols, engine='openpyxl'
         )
         return df
+
+
+class StreamingExcelLoader(Loader):
+    """Reads an XLSX file sheet by sheet in fixed-size row chunks.
+
+    The workbook is opened in openpyxl `read_only` mode and rows are pulled
+    lazily with `iter_rows(values_only=True)`, so memory stays bounded by
+    `chunk_rows` regardless of the file size. The first row of a sheet is
+    the header, as with `pd.read_excel`; fully empty rows are skipped.
+    """
+
+    def __init__(self, path: str | Path, sheet_name: str | int = 0, chunk_rows: int = 1500):
+        self.path = Path(path)
+        self.sheet_name = sheet_name
+        self.chunk_rows = chunk_rows
+        self._workbook: Any = None
+
+    def __enter__(self) -> 'StreamingExcelLoader':
+        self._open()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+
+    @property
+    def sheet_names(self) -> list[str]:
+        return list(self._open().sheetnames)
+
+    def iter_chunks(self, sheet_name: str | int | None = None) -> Iterator[pd.DataFrame]:
+        """Yield DataFrames of at most `chunk_rows` rows for one sheet."""
+        workbook = self._open()
+        sheet_name = self.sheet_name if sheet_name is None else sheet_name
+        if isinstance(sheet_name, int):
+            sheet_name = workbook.sheetnames[sheet_name]
+
+        rows = (
+            row
+            for row in workbook[sheet_name].iter_rows(values_only=True)
+            if any(value is not None for value in row)
+        )
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [
+            name if name is not None else f'Unnamed: {idx}' for idx, name in enumerate(header)
+        ]
+        width = len(columns)
+
+        offset = 0
+        while chunk := list(islice(rows, self.chunk_rows)):
+            df = pd.DataFrame.from_records(
+                [row[:width] + (None,) * (width - len(row)) for row in chunk],
+                columns=columns,
+            )
+            df.index += offset
+            offset += len(df)
+            yield df
+
+    def load(self) -> pd.DataFrame:
+        chunks = list(self.iter_chunks())
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks)
+
+    def _open(self) -> Any:
+        if self._workbook is None:
+            self._workbook = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        return self._workbook
+
+
+async def spool_to_tempfile(
+    source: AsyncReadable,
+    *,
+    max_size: int,
+    suffix: str = '.xlsx',
+    chunk_size: int = SPOOL_CHUNK_SIZE,
+) -> tuple[Path, int, str]:
+    """Copy an async byte stream (e.g. an `UploadFile`) to a temp file in chunks.
+
+    The SHA-256 of the content is computed on the way.
+
+    Returns:
+        tuple[Path, int, str]: Path of the temp file, number of bytes written
+        and the hex SHA-256. The caller owns the file and must remove it.
+
+    Raises:
+        FileTooLargeError: If the stream exceeds `max_size` bytes.
+    """
+    fd, name = tempfile.mkstemp(suffix=suffix, prefix='upload-')
+    path = Path(name)
+    size = 0
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while data := await source.read(chunk_size):
+                size += len(data)
+                if size > max_size:
+                    raise FileTooLargeError(f'File exceeds {max_size} bytes')
+                digest.update(data)
+                out.write(data)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return path, size, digest.hexdigest()
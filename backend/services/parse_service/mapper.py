@@ -1,15 +1,33 @@
-import re
 from datetime import datetime
 from math import atan2, cos, radians, sin, sqrt
-from typing import Any, Optional, Protocol
+from typing import Any, Iterator, Optional, Protocol
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 
 from backend.dto import UavFlightCreateDTO
 
 from .geocoder import Geocoder
 from .party_classifier import PartyClassifier
+from .rules import (
+    ADARRZ_RE,
+    ADD_RE,
+    ADD_VALUE_RE,
+    ADEPZ_RE,
+    ATA_RE,
+    ATD_RE,
+    COORD_RE,
+    OPR_RE,
+    SID_RE,
+    SID_VALUE_RE,
+    TIME_VALUE_RE,
+    TYP_RE,
+    TYP_VALUE_RE,
+    match_group,
+    tokenize_aftn,
+    tokenize_shr,
+)
 
 
 def ensure_aware(x, tz='Europe/Moscow'):
@@ -26,10 +44,17 @@ def ensure_aware(x, tz='Europe/Moscow'):
     return x.to_pydatetime()
 
 
+EARTH_RADIUS_KM = 6371.0
+
+
 class Mapper(Protocol):
     def map_row(self, row: pd.Series) -> UavFlightCreateDTO: ...
 
 
+class BatchMapper(Protocol):
+    def map_frame(self, df: pd.DataFrame) -> pd.DataFrame: ...
+
+
 class DefaultMapper(Mapper):
     def __init__(self, geocoder: Geocoder, party_classifier: PartyClassifier):
         self.geocoder = geocoder
@@ -41,37 +66,28 @@ class DefaultMapper(Mapper):
         raw_dep = row.get('DEP', '')
         raw_arr = row.get('ARR', '')
 
-        sid = self._extract(raw_dep, r'-SID\s+(\d+)') or ''
-        uav_type = self._extract(raw_shr, r'TYP/([A-Z0-9]+)') or 'UNKNOWN'
+        dep = tokenize_aftn(self._text(raw_dep))
+        arr = tokenize_aftn(self._text(raw_arr))
+        shr = tokenize_shr(self._text(raw_shr))
+
+        sid = match_group(SID_VALUE_RE, dep.get('SID')) or ''
+        uav_type = match_group(TYP_VALUE_RE, shr.get('TYP')) or 'UNKNOWN'
 
-        operator_raw = self._extract(raw_shr, r'OPR/([\s\S]*?)(?:\b[A-Z]{2,4}/|$)') or ''
+        operator_raw = shr.get('OPR', '')
         operator_raw = operator_raw.strip().upper().replace('\n', ' ').replace('\r', ' ')
 
         operator_classification = self.party_classifier.classify(operator_raw)
         operator_type = operator_classification.category
 
-        route_lines = re.findall(r'^-M.*$', raw_shr, flags=re.MULTILINE)
-        route_points = []
-        for line in route_lines:
-            coords = re.findall(r'\d{4,6}[NSСЮ]\d{5,7}[EWВЗ]', line)
-            for c in coords:
-                pt = self.geocoder.parse_latlon(c)
-                if pt:
-                    route_points.append(pt)
-
-        takeoff_coords = self.geocoder.parse_latlon(
-            self._extract(raw_dep, r'-ADEPZ\b[\s\S]*?(\d{4,6}[NSСЮ]\d{5,7}[EWВЗ])')
-        )
-        landing_coords = self.geocoder.parse_latlon(
-            self._extract(raw_arr, r'-ADARRZ\b[\s\S]*?(\d{4,6}[NSСЮ]\d{5,7}[EWВЗ])')
-        )
+        takeoff_coords = self.geocoder.parse_latlon(self._search_coord(dep.get('ADEPZ')))
+        landing_coords = self.geocoder.parse_latlon(self._search_coord(arr.get('ADARRZ')))
 
-        dof = self._extract(raw_dep, r'-ADD\s+(\d{6})')
+        dof = match_group(ADD_VALUE_RE, dep.get('ADD'))
         dep_time = ensure_aware(
-            self._make_timestamp(dof, self._extract(raw_dep, r'-ATD\s+(\d{4})'))
+            self._make_timestamp(dof, match_group(TIME_VALUE_RE, dep.get('ATD')))
         )
         arr_time = ensure_aware(
-            self._make_timestamp(dof, self._extract(raw_arr, r'-ATA\s+(\d{4})'))
+            self._make_timestamp(dof, match_group(TIME_VALUE_RE, arr.get('ATA')))
         )
 
         date = None
@@ -125,14 +141,19 @@ class DefaultMapper(Mapper):
             major_region_id=None,
         )
 
-    def _extract(self, text: Any, pattern: str) -> str | None:
-        text = str(text) if text is not None else ''
-        m = re.search(pattern, text)
-        return m.group(1) if m else None
+    def _text(self, value: Any) -> str:
+        return str(value) if value is not None else ''
+
+    def _search_coord(self, value: str | None) -> str | None:
+        m = COORD_RE.search(value) if value else None
+        return m.group(0) if m else None
 
     def _make_timestamp(self, yymmdd: str | None, hhmm: str | None) -> Optional[pd.Timestamp]:
         if yymmdd and hhmm:
-            return pd.to_datetime(yymmdd + hhmm, format='%y%m%d%H%M', errors='coerce')
+            try:
+                return pd.Timestamp(datetime.strptime(yymmdd + hhmm, '%y%m%d%H%M'))
+            except ValueError:
+                return pd.NaT
         return None
 
     def _haversine(self, lat1, lon1, lat2, lon2):
@@ -148,3 +169,142 @@ class DefaultMapper(Mapper):
 
         distance = R * c
         return distance
+
+
+class VectorizedMapper(BatchMapper):
+    """Column-wise counterpart of `DefaultMapper`.
+
+    Maps a whole sheet at once: every field is pulled out with `.str.extract`
+    over precompiled patterns, timestamps are parsed in a single `to_datetime`
+    call and distance/speed are computed on NumPy arrays. The result matches
+    `DefaultMapper.map_row` field for field.
+    """
+
+    def __init__(
+        self,
+        geocoder: Geocoder,
+        party_classifier: PartyClassifier,
+        tz: ZoneInfo | str = 'Europe/Moscow',
+    ):
+        self.geocoder = geocoder
+        self.party_classifier = party_classifier
+        self.tz = ZoneInfo(tz) if isinstance(tz, str) else tz
+
+    def map_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Map a raw journal sheet into a frame with `UavFlightCreateDTO` columns."""
+        city = df['Центр ЕС ОрВД'] if 'Центр ЕС ОрВД' in df else pd.Series('', index=df.index)
+        raw_shr = self._text_column(df, 'SHR')
+        raw_dep = self._text_column(df, 'DEP')
+        raw_arr = self._text_column(df, 'ARR')
+
+        sid = raw_dep.str.extract(SID_RE, expand=False).fillna('')
+        uav_type = raw_shr.str.extract(TYP_RE, expand=False).fillna('UNKNOWN')
+
+        operator_raw = (
+            raw_shr.str.extract(OPR_RE, expand=False)
+            .fillna('')
+            .str.strip()
+            .str.upper()
+            .str.replace('\n', ' ', regex=False)
+            .str.replace('\r', ' ', regex=False)
+        )
+        categories = {
+            name: self.party_classifier.classify(name).category for name in operator_raw.unique()
+        }
+        operator_type = operator_raw.map(categories)
+
+        takeoff = self.geocoder.parse_latlon_series(raw_dep.str.extract(ADEPZ_RE, expand=False))
+        landing = self.geocoder.parse_latlon_series(raw_arr.str.extract(ADARRZ_RE, expand=False))
+
+        dof = raw_dep.str.extract(ADD_RE, expand=False)
+        atd = raw_dep.str.extract(ATD_RE, expand=False)
+        ata = raw_arr.str.extract(ATA_RE, expand=False)
+        stamps = pd.to_datetime(
+            pd.concat([dof + atd, dof + ata], ignore_index=True),
+            format='%y%m%d%H%M',
+            errors='coerce',
+        )
+        dep_naive = pd.Series(stamps.iloc[: len(df)].to_numpy(), index=df.index)
+        arr_naive = pd.Series(stamps.iloc[len(df) :].to_numpy(), index=df.index)
+
+        # `timedelta.seconds` semantics: wall-clock difference wrapped into one day
+        delta_s = (arr_naive - dep_naive).dt.total_seconds()
+        duration = (np.mod(delta_s, 86400) // 60).astype('Int64')
+
+        has_takeoff = takeoff['lat'].notna() & takeoff['lon'].notna()
+        has_landing = landing['lat'].notna() & landing['lon'].notna()
+        latitude = takeoff['lat'].where(has_takeoff, landing['lat'])
+        longitude = takeoff['lon'].where(has_takeoff, landing['lon'])
+
+        distance_km = self._haversine(
+            takeoff['lat'].to_numpy(),
+            takeoff['lon'].to_numpy(),
+            landing['lat'].to_numpy(),
+            landing['lon'].to_numpy(),
+        )
+        distance_km = pd.Series(distance_km, index=df.index).where(has_takeoff & has_landing)
+        duration_f = duration.astype(float)
+        average_speed_kmh = (distance_km / duration_f * 60).where(duration_f > 0)
+
+        dep_time = dep_naive.dt.tz_localize(self.tz)
+        arr_time = arr_naive.dt.tz_localize(self.tz)
+
+        return pd.DataFrame(
+            {
+                'flight_id': sid,
+                'file_id': None,
+                'uav_type': uav_type,
+                'operator_name': operator_raw.where(operator_raw != '', None),
+                'operator_type': operator_type,
+                'takeoff_lat': takeoff['lat'].where(has_takeoff),
+                'takeoff_lon': takeoff['lon'].where(has_takeoff),
+                'landing_lat': landing['lat'].where(has_landing),
+                'landing_lon': landing['lon'].where(has_landing),
+                'latitude': latitude,
+                'longitude': longitude,
+                'takeoff_datetime': dep_time,
+                'landing_datetime': arr_time,
+                'date': dep_time.where(dep_time.notna(), arr_time),
+                'duration_minutes': duration,
+                'city': city,
+                'distance_km': distance_km,
+                'average_speed_kmh': average_speed_kmh,
+                'takeoff_region_id': None,
+                'landing_region_id': None,
+                'major_region_id': None,
+            },
+            index=df.index,
+        )
+
+    @staticmethod
+    def iter_records(frame: pd.DataFrame) -> Iterator[dict[str, Any]]:
+        """Yield plain dict rows from `map_frame` output with missing values as None."""
+        columns = {}
+        for name, col in frame.items():
+            values = col.astype(object)
+            if isinstance(col.dtype, pd.DatetimeTZDtype):
+                values = pd.Series(col.array.to_pydatetime(), index=col.index, dtype=object)
+            columns[name] = values.where(col.notna(), None)
+        yield from pd.DataFrame(columns, index=frame.index).to_dict('records')
+
+    def map_dtos(self, df: pd.DataFrame) -> list[UavFlightCreateDTO]:
+        return [UavFlightCreateDTO(**rec) for rec in self.iter_records(self.map_frame(df))]
+
+    def _text_column(self, df: pd.DataFrame, name: str) -> pd.Series:
+        if name not in df:
+            return pd.Series('', index=df.index, dtype=object)
+        col = df[name]
+        return col.where(col.notna(), '').astype(str)
+
+    def _haversine(
+        self, lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray
+    ) -> np.ndarray:
+        lat1, lon1, lat2, lon2 = (np.radians(v.astype(float)) for v in (lat1, lon1, lat2, lon2))
+
+        dlat = lat2 - lat1
+        dlon = lon2 - lon1
+
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+        return EARTH_RADIUS_KM * c
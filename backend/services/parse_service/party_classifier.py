@@ -1,6 +1,9 @@
 import re
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Optional
+
+from prometheus_client import Counter
 
 LEGAL_MARKERS_RU = r"""
     \b(ООО|АО|ПАО|ЗАО|ОАО|НКО|ФГУП|ГУП|МУП|СПАО|САО|НПАО|ПК|
@@ -46,8 +49,15 @@ ORG_KEYWORDS = [
 
 QUOTES = r"[«»\"'„“”]"
 
+CLASSIFIER_CACHE_HITS = Counter(
+    'party_classifier_cache_hits_total', 'PartyClassifier.classify calls served from the cache'
+)
+CLASSIFIER_CACHE_MISSES = Counter(
+    'party_classifier_cache_misses_total', 'PartyClassifier.classify calls that ran the rules'
+)
 
-@dataclass
+
+@dataclass(frozen=True)
 class PartyClassification:
     """Результат классификации стороны."""
 
@@ -56,21 +66,100 @@ class PartyClassification:
     normalized: str
 
 
-class PartyClassifier:
-    """Класс для классификации сторон (операторов)."""
+@dataclass
+class ClassifierCacheInfo:
+    """Статистика кэша классификатора."""
+
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
 
-    def __init__(self):
+
+class PartyClassifier:
+    """Класс для классификации сторон (операторов).
+
+    Результаты `classify` кэшируются в LRU-кэше по исходной строке оператора
+    (`cache_size=0` отключает кэш). Новые результаты копятся до вызова
+    `pop_new`, чтобы их можно было сохранить в БД; `seed` загружает ранее
+    сохранённые классификации без пересчёта.
+    """
+
+    def __init__(self, cache_size: int = 4096):
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, PartyClassification] = OrderedDict()
+        self._new: dict[str, PartyClassification] = {}
+        self.hits = 0
+        self.misses = 0
         self.legal_markers_ru = re.compile(LEGAL_MARKERS_RU, re.X | re.IGNORECASE)
         self.legal_markers_intl = re.compile(LEGAL_MARKERS_INTL, re.X | re.IGNORECASE)
         self.ie_markers = re.compile(IE_MARKERS, re.X | re.IGNORECASE)
+        self.fio_ru = [re.compile(p) for p in (FIO_THREE, FIO_INITS, FIO_TWO)]
+        self.fio_lat = re.compile(FIO_LAT)
+        self.quotes = re.compile(QUOTES)
+        self.spaces = re.compile(r'\s+')
 
     def _normalize(self, s: Optional[str]) -> str:
         txt = (s or '').strip()
-        txt = re.sub(QUOTES, ' ', txt)
-        txt = re.sub(r'\s+', ' ', txt)
+        txt = self.quotes.sub(' ', txt)
+        txt = self.spaces.sub(' ', txt)
         return txt.strip()
 
     def classify(self, s: Optional[str]) -> PartyClassification:
+        key = s or ''
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            CLASSIFIER_CACHE_HITS.inc()
+            return cached
+
+        self.misses += 1
+        CLASSIFIER_CACHE_MISSES.inc()
+        result = self._classify(s)
+        if self.cache_size > 0:
+            self._remember(key, result)
+            self._new[key] = result
+        return result
+
+    def seed(self, items: Iterable[tuple[str, PartyClassification]], *, new: bool = False) -> None:
+        """Заполнить кэш готовыми классификациями.
+
+        С `new=True` они также попадут в `pop_new` (например, вычисленные в
+        другом процессе и ещё не сохранённые).
+        """
+        for key, result in items:
+            self._remember(key, result)
+            if new and self.cache_size > 0:
+                self._new[key] = result
+
+    def snapshot(self) -> dict[str, PartyClassification]:
+        """Копия содержимого кэша для передачи в другой процесс."""
+        return dict(self._cache)
+
+    def pop_new(self) -> dict[str, PartyClassification]:
+        """Вернуть классификации, вычисленные после прошлого вызова, и забыть их."""
+        new, self._new = self._new, {}
+        return new
+
+    def cache_info(self) -> ClassifierCacheInfo:
+        return ClassifierCacheInfo(self.hits, self.misses, len(self._cache), self.cache_size)
+
+    def cache_clear(self) -> None:
+        self._cache.clear()
+        self._new.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, result: PartyClassification) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _classify(self, s: Optional[str]) -> PartyClassification:
         norm = self._normalize(s)
         upper = norm.upper()
 
@@ -80,9 +169,9 @@ class PartyClassifier:
         if self.ie_markers.search(upper):
             return PartyClassification('individual_entrepreneur', 0.95, norm)
 
-        if re.match(FIO_THREE, norm) or re.match(FIO_INITS, norm) or re.match(FIO_TWO, norm):
+        if any(p.match(norm) for p in self.fio_ru):
             return PartyClassification('individual', 0.9, norm)
-        if re.match(FIO_LAT, norm):
+        if self.fio_lat.match(norm):
             return PartyClassification('individual', 0.8, norm)
 
         if any(w in norm.lower() for w in ORG_KEYWORDS):
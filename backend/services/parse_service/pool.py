@@ -0,0 +1,215 @@
+"""Parsing of workbook sheets in a pool of worker processes.
+
+Reading a sheet with openpyxl and mapping its rows are both CPU-bound, so each
+sheet is handed to a `ProcessPoolExecutor` task that reads it in row chunks,
+maps every chunk with `VectorizedMapper` and puts the mapped frames on a
+bounded queue. The event loop only takes frames off the queue; a full queue
+blocks the workers until the consumer catches up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import queue as queue_module
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Sequence
+
+import pandas as pd
+
+from backend.services.exceptions import FileProcessError
+
+from .geocoder import DefaultGeocoder
+from .loader import StreamingExcelLoader
+from .mapper import VectorizedMapper
+from .party_classifier import PartyClassification, PartyClassifier
+
+logger = logging.getLogger(__name__)
+
+_POLL_SECONDS = 0.5
+
+# Classifier of the current worker process, kept across tasks
+_worker_classifier: PartyClassifier | None = None
+
+
+@dataclass
+class ParsedChunk:
+    """A mapped row chunk of one sheet, or the end marker of that sheet (`frame=None`)."""
+
+    sheet_name: str
+    frame: pd.DataFrame | None
+    classifications: dict[str, PartyClassification] = field(default_factory=dict)
+    error: str | None = None
+    load_seconds: float = 0.0
+    map_seconds: float = 0.0
+
+
+def iter_mapped_chunks(
+    loader: StreamingExcelLoader, sheet_name: str, mapper: VectorizedMapper
+) -> Iterator[tuple[pd.DataFrame, float, float]]:
+    """Yield mapped row chunks of a sheet with the seconds spent reading and mapping each."""
+    chunks = loader.iter_chunks(sheet_name)
+    while True:
+        started = time.perf_counter()
+        chunk = next(chunks, None)
+        loaded = time.perf_counter()
+        if chunk is None:
+            return
+        frame = mapper.map_frame(chunk)
+        yield frame, loaded - started, time.perf_counter() - loaded
+
+
+def _put(out, cancelled, item: ParsedChunk) -> bool:
+    while not cancelled.is_set():
+        try:
+            out.put(item, timeout=_POLL_SECONDS)
+            return True
+        except queue_module.Full:
+            continue
+    return False
+
+
+def parse_sheet(
+    path: str,
+    sheet_name: str,
+    chunk_rows: int,
+    out,
+    cancelled,
+    known: dict[str, PartyClassification],
+    cache_size: int,
+) -> int:
+    """Worker task: map one sheet chunk by chunk and stream the frames to `out`.
+
+    Operator classifications are seeded from `known`; the ones computed here
+    travel back with each chunk. Errors are reported as a `ParsedChunk` with
+    `error` set. Returns the number of mapped rows.
+    """
+    global _worker_classifier
+    if _worker_classifier is None or _worker_classifier.cache_size != cache_size:
+        _worker_classifier = PartyClassifier(cache_size=cache_size)
+    classifier = _worker_classifier
+    classifier.seed(known.items())
+    mapper = VectorizedMapper(DefaultGeocoder(), classifier)
+
+    rows = 0
+    try:
+        with StreamingExcelLoader(path, chunk_rows=chunk_rows) as loader:
+            for frame, load_seconds, map_seconds in iter_mapped_chunks(loader, sheet_name, mapper):
+                rows += len(frame)
+                item = ParsedChunk(
+                    sheet_name,
+                    frame,
+                    classifier.pop_new(),
+                    load_seconds=load_seconds,
+                    map_seconds=map_seconds,
+                )
+                if not _put(out, cancelled, item):
+                    return rows
+    except Exception as exc:
+        _put(out, cancelled, ParsedChunk(sheet_name, None, error=f'{type(exc).__name__}: {exc}'))
+        return rows
+    _put(out, cancelled, ParsedChunk(sheet_name, None))
+    return rows
+
+
+class ParsePool:
+    """Process pool that parses workbooks sheet by sheet.
+
+    Worker processes are spawned on first use and live until `stop`. At most
+    `queue_size` mapped chunks per file wait for the consumer.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor: ProcessPoolExecutor | None = None
+        self._manager = None
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    def start(self) -> None:
+        if self.running:
+            return
+        context = multiprocessing.get_context('spawn')
+        self._manager = context.Manager()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        logger.info('Parse pool started with %s processes', self.workers)
+
+    def stop(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    async def iter_chunks(
+        self,
+        path: Path,
+        sheet_names: Sequence[str],
+        *,
+        chunk_rows: int,
+        classifier: PartyClassifier,
+    ) -> AsyncIterator[ParsedChunk]:
+        """Yield mapped chunks of all sheets in completion order.
+
+        New operator classifications from the workers are merged into
+        `classifier` (as new, so they can be persisted).
+
+        Raises:
+            FileProcessError: If a sheet fails to parse or a worker dies.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        out = self._manager.Queue(maxsize=self.queue_size)
+        cancelled = self._manager.Event()
+        known = classifier.snapshot()
+        tasks = [
+            loop.run_in_executor(
+                self._executor,
+                parse_sheet,
+                str(path),
+                sheet_name,
+                chunk_rows,
+                out,
+                cancelled,
+                known,
+                classifier.cache_size,
+            )
+            for sheet_name in sheet_names
+        ]
+        pending = len(tasks)
+        try:
+            while pending:
+                item = await self._next(loop, out, tasks)
+                if item.error is not None:
+                    raise FileProcessError(
+                        f"Failed to parse sheet '{item.sheet_name}': {item.error}"
+                    )
+                if item.frame is None:
+                    pending -= 1
+                    continue
+                classifier.seed(item.classifications.items(), new=True)
+                yield item
+        finally:
+            cancelled.set()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _next(self, loop, out, tasks: list[asyncio.Future]) -> ParsedChunk:
+        get = partial(out.get, timeout=_POLL_SECONDS)
+        while True:
+            try:
+                return await loop.run_in_executor(None, get)
+            except queue_module.Empty:
+                for task in tasks:
+                    if task.done() and task.exception() is not None:
+                        raise FileProcessError(
+                            f'Parse worker failed: {task.exception()}'
+                        ) from task.exception()
@@ -0,0 +1,112 @@
+"""Columnar flight records passed from the mapper to the repository.
+
+`flight_records` validates a `VectorizedMapper.map_frame` result one column at
+a time, with the same coercions `UavFlightCreateDTO` would apply per row, and
+returns plain row tuples in `uav_flights` column order that COPY can load as
+is. `UavFlightCreateDTO` stays the type of the API.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable
+from uuid import UUID
+
+import numpy as np
+import pandas as pd
+
+
+def _missing_to_none(values: np.ndarray, missing: np.ndarray) -> np.ndarray:
+    if missing.any():
+        values = values.copy()
+        values[missing] = None
+    return values
+
+
+def _text(col: pd.Series) -> np.ndarray:
+    missing = col.isna().to_numpy()
+    values = _missing_to_none(col.to_numpy(dtype=object), missing)
+    if pd.api.types.infer_dtype(values, skipna=True) not in ('string', 'empty'):
+        # Cells Excel typed as numbers, e.g. a numeric ATC centre code
+        values = np.array([None if m else str(v) for v, m in zip(values, missing)], dtype=object)
+    return values
+
+
+def _float(col: pd.Series) -> np.ndarray:
+    if not pd.api.types.is_numeric_dtype(col):
+        col = pd.to_numeric(col)
+    return col.astype(float).to_numpy(dtype=object, na_value=None)
+
+
+def _int(col: pd.Series) -> np.ndarray:
+    try:
+        ints = pd.array(col, dtype='Int64')
+    except TypeError as exc:
+        raise ValueError(str(exc)) from exc
+    return ints.to_numpy(dtype=object, na_value=None)
+
+
+def _datetime(col: pd.Series) -> np.ndarray:
+    if not pd.api.types.is_datetime64_any_dtype(col):
+        col = pd.to_datetime(col)
+    return _missing_to_none(col.array.to_pydatetime(), col.isna().to_numpy())
+
+
+FLIGHT_COLUMNS: dict[str, Callable[[pd.Series], np.ndarray]] = {
+    'flight_id': _text,
+    'uav_type': _text,
+    'operator_name': _text,
+    'operator_type': _text,
+    'takeoff_lat': _float,
+    'takeoff_lon': _float,
+    'landing_lat': _float,
+    'landing_lon': _float,
+    'latitude': _float,
+    'longitude': _float,
+    'takeoff_datetime': _datetime,
+    'landing_datetime': _datetime,
+    'date': _datetime,
+    'duration_minutes': _int,
+    'city': _text,
+    'distance_km': _float,
+    'average_speed_kmh': _float,
+    'takeoff_region_id': _int,
+    'landing_region_id': _int,
+    'major_region_id': _int,
+}
+
+
+@dataclass(slots=True)
+class FlightRecords:
+    """Validated flight rows; `rows[i][j]` is the value of `columns[j]`."""
+
+    columns: tuple[str, ...]
+    rows: list[tuple[Any, ...]]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def as_dicts(self) -> list[dict[str, Any]]:
+        return [dict(zip(self.columns, row)) for row in self.rows]
+
+
+def flight_records(frame: pd.DataFrame, *, file_id: str | UUID | None = None) -> FlightRecords:
+    """Validate a mapped frame column by column and build its row tuples.
+
+    Missing values become None, numbers are coerced to float/int and other
+    values of text columns are converted with `str()`.
+
+    Raises:
+        ValueError: If a column cannot be coerced, naming the column.
+    """
+    columns = ['file_id']
+    values: list[Any] = [[UUID(str(file_id)) if file_id is not None else None] * len(frame)]
+    for name, convert in FLIGHT_COLUMNS.items():
+        if name not in frame:
+            continue
+        try:
+            values.append(convert(frame[name]))
+        except (ValueError, TypeError) as exc:
+            raise ValueError(f'Invalid column {name}: {exc}') from exc
+        columns.append(name)
+    return FlightRecords(tuple(columns), list(zip(*values)))
@@ -0,0 +1,94 @@
+"""Compiled parse rules for flight plan messages.
+
+Every pattern used to pick fields out of SHR/DEP/ARR messages and to parse
+coordinates is compiled here once at import time. Messages are split into
+fields in a single pass by `tokenize_aftn` / `tokenize_shr`; the `*_VALUE_RE`
+patterns are then matched against the (short) field values only.
+"""
+
+import re
+
+COORD = r'\d{4,6}[NSСЮ]\d{5,7}[EWВЗ]'
+COORD_RE = re.compile(COORD)
+
+# Whole-message patterns, used by the column-wise mapper with `.str.extract`
+SID_RE = re.compile(r'-SID\s+(\d+)')
+TYP_RE = re.compile(r'TYP/([A-Z0-9]+)')
+OPR_RE = re.compile(r'OPR/([\s\S]*?)(?:\b[A-Z]{2,4}/|$)')
+ADEPZ_RE = re.compile(rf'-ADEPZ\b[\s\S]*?({COORD})')
+ADARRZ_RE = re.compile(rf'-ADARRZ\b[\s\S]*?({COORD})')
+ADD_RE = re.compile(r'-ADD\s+(\d{6})')
+ATD_RE = re.compile(r'-ATD\s+(\d{4})')
+ATA_RE = re.compile(r'-ATA\s+(\d{4})')
+
+# Field boundaries: `-KEY value` lines of DEP/ARR and `KEY/value` tokens of SHR
+AFTN_FIELD_RE = re.compile(r'^-([A-Z]+)\b[ \t]*(.*(?:\n(?!-[A-Z]).*)*)', re.MULTILINE)
+SHR_KEY_RE = re.compile(r'\b([A-Z]{2,4})\Z')
+
+# Patterns applied to a single tokenized field value
+SID_VALUE_RE = re.compile(r'\s*(\d+)')
+TYP_VALUE_RE = re.compile(r'[A-Z0-9]+')
+ADD_VALUE_RE = re.compile(r'\s*(\d{6})')
+TIME_VALUE_RE = re.compile(r'\s*(\d{4})')
+
+LATLON_TRANSLATION = str.maketrans(
+    {
+        '°': None,
+        "'": None,
+        '"': None,
+        ',': ' ',
+        'С': 'N',
+        'Ю': 'S',
+        'В': 'E',
+        'З': 'W',
+    }
+)
+LATLON_SPLIT_RE = re.compile(r'^([^NSEW]*)([NS])([^EW]*)([EW])')
+LATLON_PART_RE = re.compile(r'^(\d+)(\d{2}(?:\.\d+)?)$')
+
+
+def tokenize_aftn(text: str) -> dict[str, str]:
+    """Split a DEP/ARR message into `{KEY: value}` in one pass.
+
+    A field starts with `-KEY` at the beginning of a line and runs up to the
+    next such line. When a key repeats, the first occurrence wins.
+    """
+    fields: dict[str, str] = {}
+    for m in AFTN_FIELD_RE.finditer(text):
+        fields.setdefault(m.group(1), m.group(2))
+    return fields
+
+
+def tokenize_shr(text: str) -> dict[str, str]:
+    """Split an SHR message into `{KEY: value}` in one pass.
+
+    A field starts at a `KEY/` token (2-4 capital latin letters on a word
+    boundary) and runs up to the next one. When a key repeats, the first
+    occurrence wins. Only the few characters before each `/` are matched
+    against `SHR_KEY_RE`, so free text is never scanned by the regex engine.
+    """
+    fields: dict[str, str] = {}
+    key = None
+    value_start = 0
+    pos = text.find('/')
+    while pos != -1:
+        m = SHR_KEY_RE.search(text, max(pos - 4, 0), pos)
+        if m:
+            if key is not None:
+                fields.setdefault(key, text[value_start : m.start()])
+            key = m.group(1)
+            value_start = pos + 1
+        pos = text.find('/', pos + 1)
+    if key is not None:
+        fields.setdefault(key, text[value_start:])
+    return fields
+
+
+def match_group(pattern: re.Pattern, value: str | None) -> str | None:
+    """Return the first group (or whole match) of `pattern` at the start of `value`."""
+    if not value:
+        return None
+    m = pattern.match(value)
+    if not m:
+        return None
+    return m.group(1) if pattern.groups else m.group(0)
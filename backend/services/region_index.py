@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.geometry.base import BaseGeometry
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.models import RegionModel
+
+logger = logging.getLogger(__name__)
+
+NO_REGION = -1
+
+
+class RegionIndex:
+    """In-process point-in-polygon index over the `regions` table.
+
+    Region polygons are loaded once into a Shapely STRtree with prepared
+    geometries; whole coordinate arrays are resolved in one vectorized call.
+    Semantics follow the `ST_Covers` lookup of the insert trigger: points on
+    a boundary belong to the region, and of several matching regions the
+    smallest id wins.
+    The index is rebuilt when the regions version (count and last update)
+    differs from the one it was built from, so every process picks up a
+    committed shapefile load.
+    """
+
+    def __init__(self) -> None:
+        self._ids: np.ndarray | None = None
+        self._geometries: np.ndarray | None = None
+        self._tree: shapely.STRtree | None = None
+        self._version: tuple[int, datetime | None] | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._tree is not None
+
+    def build(self, ids: Sequence[int], geometries: Sequence[BaseGeometry]) -> None:
+        geoms = np.asarray(geometries, dtype=object)
+        shapely.prepare(geoms)
+        self._ids = np.asarray(ids, dtype=np.int64)
+        self._geometries = geoms
+        self._tree = shapely.STRtree(geoms)
+
+    def invalidate(self) -> None:
+        """Drop the index; it is rebuilt from the database on next use."""
+        self._ids = None
+        self._geometries = None
+        self._tree = None
+        self._version = None
+
+    async def ensure_loaded(self, db_session: AsyncSession) -> None:
+        """Build the index, or rebuild it if the regions changed since it was built."""
+        version = await self._read_version(db_session)
+        if self.loaded and self._version == version:
+            return
+        async with self._lock:
+            if self.loaded and self._version == version:
+                return
+            ids, geometries = await self._read_regions(db_session)
+            self.build(ids, geometries)
+            self._version = version
+            logger.info('Region index built with %s regions', len(ids))
+
+    async def _read_version(self, db_session: AsyncSession) -> tuple[int, datetime | None]:
+        result = await db_session.execute(select(func.count(), func.max(RegionModel.updated_at)))
+        count, updated_at = result.one()
+        return count, updated_at
+
+    async def _read_regions(
+        self, db_session: AsyncSession
+    ) -> tuple[list[int], Sequence[BaseGeometry]]:
+        result = await db_session.execute(
+            select(RegionModel.id, func.ST_AsBinary(RegionModel.geopolygon))
+        )
+        rows = result.all()
+        return [row[0] for row in rows], shapely.from_wkb([bytes(row[1]) for row in rows])
+
+    def resolve(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Return the region id for each (lat, lon) pair, or `NO_REGION`."""
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        out = np.full(lats.shape, NO_REGION, dtype=np.int64)
+        if self._tree is None or not len(self._ids):
+            return out
+
+        valid = np.flatnonzero(~(np.isnan(lats) | np.isnan(lons)))
+        if not len(valid):
+            return out
+        points = shapely.points(lons[valid], lats[valid])
+
+        point_idx, region_idx = self._tree.query(points)
+        hit = shapely.covers(self._geometries[region_idx], points[point_idx])
+        point_idx, region_idx = point_idx[hit], region_idx[hit]
+
+        order = np.lexsort((self._ids[region_idx], point_idx))
+        point_idx, region_idx = point_idx[order], region_idx[order]
+        first_points, first = np.unique(point_idx, return_index=True)
+        out[valid[first_points]] = self._ids[region_idx[first]]
+        return out
+
+    def fill_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Fill region id columns of a `VectorizedMapper.map_frame` result in place."""
+        takeoff = self.resolve(frame['takeoff_lat'].to_numpy(), frame['takeoff_lon'].to_numpy())
+        landing = self.resolve(frame['landing_lat'].to_numpy(), frame['landing_lon'].to_numpy())
+        major = np.where(takeoff != NO_REGION, takeoff, landing)
+        for column, values in (
+            ('takeoff_region_id', takeoff),
+            ('landing_region_id', landing),
+            ('major_region_id', major),
+        ):
+            ids = pd.Series(values, index=frame.index, dtype='Int64')
+            frame[column] = ids.mask(values == NO_REGION)
+        return frame
+
+
+region_index = RegionIndex()
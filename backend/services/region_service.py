@@ -1,13 +1,24 @@
+import gzip
+import hashlib
+import json
+import time
+from dataclasses import dataclass
 from typing import Dict, List, Tuple
 
+import numpy as np
 import shapefile
+import shapely
 from geoalchemy2.shape import from_shape
 from pyproj import Transformer
+from shapely.geometry import MultiPolygon
 from shapely.geometry import Polygon as ShapelyPolygon
-from shapely.ops import transform
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.database.models import RegionModel
+from backend.core.settings import application_settings
+from backend.repositories.region_repository import region_geometry_repo, region_part_repo
+from backend.repositories.uav_repository import region_repo
+from backend.services.exceptions import RegionCreateError, RegionGeometryError
 
 Coordinate = Tuple[float, float]
 Polygon = List[Coordinate]
@@ -16,6 +27,9 @@ RegionPolygons = Dict[str, List[Polygon]]
 project = Transformer.from_crs('EPSG:4326', 'EPSG:6933', always_xy=True).transform
 unproject = Transformer.from_crs('EPSG:6933', 'EPSG:4326', always_xy=True).transform
 SIMPLIFY_TOLERANCE_M = 10000.0
+POLYGON_TYPE_ID = 3
+# 4 bind parameters per row, asyncpg accepts at most 32767 per statement
+_UPSERT_CHUNK = 5000
 
 
 def _detect_name_field_index(sf: shapefile.Reader) -> int | None:
@@ -72,36 +86,268 @@ def group_polygons_by_region(sf: shapefile.Reader) -> RegionPolygons:
     return regions
 
 
-async def save_regions_to_db(region_polygons: RegionPolygons, db_session: AsyncSession):
-    for name, polygons in region_polygons.items():
+def rings_to_multipolygon(rings: List[Polygon]) -> MultiPolygon | None:
+    """Assemble the rings of a region into polygons with holes.
+
+    Ring roles are taken from nesting rather than winding order: a ring
+    inside an even number of other rings is a shell, one inside an odd number
+    is a hole of the ring directly around it (so an island in a lake is a
+    shell again). Containment candidates come from an STRtree, so the cost
+    does not grow with the square of the ring count. Invalid results are
+    repaired with `make_valid`. Returns None if no polygon is left.
+    """
+    rings = [ring for ring in rings if len(ring) >= 3]
+    if not rings:
+        return None
+    ring_polygons = shapely.polygons([shapely.linearrings(ring) for ring in rings])
+    ring_polygons = ring_polygons[~shapely.is_empty(ring_polygons)]
+    count = len(ring_polygons)
+
+    inner, outer = shapely.STRtree(ring_polygons).query(ring_polygons, predicate='within')
+    nested = inner != outer
+    inner, outer = inner[nested], outer[nested]
+    depth = np.bincount(inner, minlength=count)
+    parent = np.full(count, -1)
+    direct = depth[outer] == depth[inner] - 1
+    parent[inner[direct]] = outer[direct]
+
+    holes: dict[int, list] = {}
+    for hole in np.flatnonzero(depth % 2 == 1):
+        holes.setdefault(parent[hole], []).append(ring_polygons[hole].exterior)
+    polygons = [
+        ShapelyPolygon(ring_polygons[shell].exterior, holes.get(shell, []))
+        for shell in np.flatnonzero(depth % 2 == 0)
+    ]
+    geometry = MultiPolygon(polygons)
+    if not geometry.is_valid:
+        # The repaired geometry may be a collection mixing (multi)polygons and lines
+        parts = shapely.get_parts(shapely.get_parts(shapely.make_valid(geometry)))
+        geometry = MultiPolygon(parts[shapely.get_type_id(parts) == POLYGON_TYPE_ID].tolist())
+    return geometry if not geometry.is_empty else None
+
+
+@dataclass
+class RegionLoadResult:
+    """Outcome of loading one region from a shapefile."""
+
+    name: str
+    polygons: int = 0
+    vertices: int = 0
+    area: int | None = None
+    seconds: float = 0.0
+    error: str | None = None
+
+
+@dataclass
+class RegionLoadReport:
+    """Per-region results and per-stage timings (seconds) of a region load."""
+
+    regions: list[RegionLoadResult]
+    timings: dict[str, float]
+
+    @property
+    def loaded(self) -> list[str]:
+        return [region.name for region in self.regions if region.error is None]
+
+
+def _project_coords(coords: np.ndarray) -> np.ndarray:
+    return np.column_stack(project(coords[:, 0], coords[:, 1]))
+
+
+def _unproject_coords(coords: np.ndarray) -> np.ndarray:
+    return np.column_stack(unproject(coords[:, 0], coords[:, 1]))
+
+
+def prepare_regions(region_polygons: RegionPolygons) -> tuple[list[dict], list[RegionLoadResult]]:
+    """Build region rows for `RegionRepository.upsert_by_name`.
+
+    Rings are assembled per region; projection, area and simplification of
+    the legacy outline then run over all regions at once with Shapely array
+    functions, each projection being one pyproj call over every coordinate.
+    A region that cannot be assembled is reported with its error and skipped.
+
+    Returns:
+        Rows to upsert and a result for every input region.
+    """
+    results: list[RegionLoadResult] = []
+    loaded: list[RegionLoadResult] = []
+    geometries: list[MultiPolygon] = []
+    for name, rings in region_polygons.items():
+        started = time.perf_counter()
+        result = RegionLoadResult(name=name)
         try:
-            valid_polygons = [ShapelyPolygon(ring) for ring in polygons if len(ring) >= 3]
-            if not valid_polygons:
-                continue
-            shapely_poly = max(valid_polygons, key=lambda p: p.area)
-            geopolygon = from_shape(shapely_poly, srid=4326)
-            shapely_poly_m = transform(project, shapely_poly)
-            area = int(shapely_poly_m.area) / 1000000
-
-            simplified_m = shapely_poly_m.simplify(SIMPLIFY_TOLERANCE_M, preserve_topology=True)
-            simplified_ll = transform(unproject, simplified_m)
-            geopolygon_str = str([[[y, x] for x, y in simplified_ll.exterior.coords]])
-
-            existing = await db_session.execute(
-                RegionModel.__table__.select().where(RegionModel.name == name)
-            )
-            row = existing.first()
-            if row:
-                await db_session.execute(
-                    RegionModel.__table__.update()
-                    .where(RegionModel.name == name)
-                    .values(area=area, geopolygon=geopolygon, geopolygon_str=geopolygon_str)
-                )
+            geometry = rings_to_multipolygon(rings)
+            if geometry is None:
+                result.error = 'No valid polygons'
             else:
-                await db_session.execute(
-                    RegionModel.__table__.insert().values(
-                        name=name, area=area, geopolygon=geopolygon, geopolygon_str=geopolygon_str
-                    )
-                )
-        except Exception as e:
-            print(f'[ERROR] {name}: {e}')
+                result.polygons = len(geometry.geoms)
+                result.vertices = shapely.get_num_coordinates(geometry)
+                loaded.append(result)
+                geometries.append(geometry)
+        except Exception as exc:
+            result.error = f'{type(exc).__name__}: {exc}'
+        result.seconds = time.perf_counter() - started
+        results.append(result)
+    if not geometries:
+        return [], results
+
+    geoms = np.empty(len(geometries), dtype=object)
+    geoms[:] = geometries
+    projected = shapely.transform(geoms, _project_coords)
+    areas = shapely.area(projected)
+
+    # The legacy string keeps the outline of the largest polygon only
+    parts, owner = shapely.get_parts(projected, return_index=True)
+    order = np.lexsort((-shapely.area(parts), owner))
+    _, first = np.unique(owner[order], return_index=True)
+    largest = parts[order[first]]
+    outlines = shapely.transform(
+        shapely.simplify(largest, SIMPLIFY_TOLERANCE_M, preserve_topology=True), _unproject_coords
+    )
+
+    rows = []
+    for result, geometry, area, outline in zip(loaded, geoms, areas, outlines):
+        result.area = round(area / 1_000_000)
+        rows.append(
+            {
+                'name': result.name,
+                'area': result.area,
+                'geopolygon': from_shape(geometry, srid=4326),
+                'geopolygon_str': str([[[y, x] for x, y in outline.exterior.coords]]),
+            }
+        )
+    return rows, results
+
+
+async def save_regions_to_db(
+    region_polygons: RegionPolygons, db_session: AsyncSession
+) -> RegionLoadReport:
+    """Insert or update regions by name in one batch and rebuild their lookup parts.
+
+    Args:
+        region_polygons: Rings per region name, from `group_polygons_by_region`.
+        db_session: Active async DB session.
+
+    Returns:
+        RegionLoadReport: Per-region results (regions that failed are not
+            written) and stage timings.
+
+    Raises:
+        RegionCreateError: On DB errors.
+        RegionGeometryError: If region parts cannot be rebuilt.
+    """
+    timings = {}
+    started = time.perf_counter()
+    rows, results = prepare_regions(region_polygons)
+    timings['prepare'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    try:
+        for i in range(0, len(rows), _UPSERT_CHUNK):
+            await region_repo.upsert_by_name(db_session, rows[i : i + _UPSERT_CHUNK])
+    except SQLAlchemyError as exc:
+        raise RegionCreateError(f'Failed to save regions: {exc}') from exc
+    timings['write'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await refresh_region_parts(db_session)
+    timings['subdivide'] = time.perf_counter() - started
+    return RegionLoadReport(results, timings)
+
+
+async def refresh_region_parts(db_session: AsyncSession) -> int:
+    """Rebuild `region_parts`, the subdivided copy of region polygons used for lookups.
+
+    Polygons with more than `APP_REGION_SUBDIVIDE_VERTICES` vertices are split
+    with `ST_Subdivide`, so each point-in-polygon test touches a small piece.
+
+    Returns:
+        int: Number of parts written.
+
+    Raises:
+        RegionGeometryError: On DB errors.
+    """
+    try:
+        return await region_part_repo.refresh(
+            db_session, max_vertices=application_settings.APP_REGION_SUBDIVIDE_VERTICES
+        )
+    except SQLAlchemyError as exc:
+        raise RegionGeometryError(f'Failed to subdivide regions: {exc}') from exc
+
+
+@dataclass(frozen=True)
+class RegionsGeoJSON:
+    """A serialized region FeatureCollection of one level of detail."""
+
+    version: str
+    body: bytes
+    gzipped: bytes
+
+
+# Level of detail -> last built collection, rebuilt when its version changes
+_geojson_cache: dict[int, RegionsGeoJSON] = {}
+
+
+async def refresh_region_geometries(db_session: AsyncSession) -> int:
+    """Re-simplify all regions to every level of `APP_REGION_LODS_M`.
+
+    Call after regions change; the new geometries get a new data version.
+
+    Returns:
+        int: Number of geometries written.
+
+    Raises:
+        RegionGeometryError: On DB errors.
+    """
+    try:
+        return await region_geometry_repo.refresh(
+            db_session, lods=application_settings.APP_REGION_LODS_M
+        )
+    except SQLAlchemyError as exc:
+        raise RegionGeometryError(f'Failed to simplify regions: {exc}') from exc
+
+
+def _feature_collection(rows) -> bytes:
+    # Geometries are stored as GeoJSON already, so they are spliced in as is
+    features = ','.join(
+        '{"type":"Feature","id":%d,"properties":%s,"geometry":%s}'
+        % (
+            row.id,
+            json.dumps({'name': row.name, 'area': row.area}, ensure_ascii=False),
+            row.geojson,
+        )
+        for row in rows
+    )
+    return ('{"type":"FeatureCollection","features":[%s]}' % features).encode()
+
+
+async def get_regions_geojson(db_session: AsyncSession, *, lod_m: int) -> RegionsGeoJSON:
+    """Return the region FeatureCollection of one level of detail.
+
+    The collection and its gzip encoding are built once per data version;
+    a request that finds the version unchanged costs one aggregate query.
+
+    Args:
+        db_session: Active async DB session.
+        lod_m: Simplification tolerance in metres, one of `APP_REGION_LODS_M`.
+
+    Raises:
+        ValueError: If `lod_m` is not a configured level.
+        RegionGeometryError: On DB errors.
+    """
+    if lod_m not in application_settings.APP_REGION_LODS_M:
+        raise ValueError(f'lod must be one of {application_settings.APP_REGION_LODS_M}')
+    try:
+        count, updated_at = await region_geometry_repo.get_version(db_session, lod_m=lod_m)
+        marker = f'{lod_m}:{count}:{updated_at.isoformat() if updated_at else ""}'
+        version = hashlib.sha1(marker.encode()).hexdigest()[:16]
+        cached = _geojson_cache.get(lod_m)
+        if cached is not None and cached.version == version:
+            return cached
+        rows = await region_geometry_repo.get_features(db_session, lod_m=lod_m)
+    except SQLAlchemyError as exc:
+        raise RegionGeometryError(f'Failed to read region geometries: {exc}') from exc
+    body = _feature_collection(rows)
+    collection = RegionsGeoJSON(version, body, gzip.compress(body, mtime=0))
+    _geojson_cache[lod_m] = collection
+    return collection
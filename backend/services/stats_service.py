@@ -0,0 +1,85 @@
+import logging
+from uuid import UUID
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.settings import application_settings
+from backend.repositories.stats_repository import uav_flight_stats_repo
+from backend.schemas.uav_schema import FlightStatsQuery, FlightStatsRow
+from backend.services.exceptions import FlightStatsError
+
+logger = logging.getLogger(__name__)
+
+
+def _stats_tz() -> str:
+    return application_settings.APP_TIMEZONE.key
+
+
+async def refresh_flight_stats(db_session: AsyncSession, *, file_id: UUID | str) -> int:
+    """Merge the flights of a freshly ingested file into the daily rollup.
+
+    Must run once per file, in the transaction that inserted its flights and
+    after their regions are assigned.
+
+    Args:
+        db_session: Active async DB session.
+        file_id: FileMetadata.file_id of the ingested file.
+
+    Returns:
+        int: Number of rollup groups touched.
+
+    Raises:
+        FlightStatsError: On DB errors.
+    """
+    try:
+        return await uav_flight_stats_repo.merge_file(db_session, file_id=file_id, tz=_stats_tz())
+    except SQLAlchemyError as exc:
+        raise FlightStatsError(f'Failed to refresh flight stats: {exc}') from exc
+
+
+async def rebuild_flight_stats(db_session: AsyncSession) -> int:
+    """Recompute the daily rollup from all flights (e.g. after regions change).
+
+    Returns:
+        int: Number of rollup groups.
+
+    Raises:
+        FlightStatsError: On DB errors.
+    """
+    try:
+        groups = await uav_flight_stats_repo.rebuild(db_session, tz=_stats_tz())
+    except SQLAlchemyError as exc:
+        raise FlightStatsError(f'Failed to rebuild flight stats: {exc}') from exc
+    logger.info('Flight stats rebuilt: %s groups', groups)
+    return groups
+
+
+async def get_flight_stats(
+    db_session: AsyncSession,
+    *,
+    query: FlightStatsQuery,
+) -> list[FlightStatsRow]:
+    """Aggregate the daily rollup over the requested dimensions and filters.
+
+    Raises:
+        ValueError: If `date_from` is after `date_to`.
+        FlightStatsError: On DB errors.
+    """
+    if query.date_from and query.date_to and query.date_from > query.date_to:
+        raise ValueError('date_from must not be after date_to')
+    group_by = list(dict.fromkeys(query.group_by))
+    try:
+        rows = await uav_flight_stats_repo.get_stats(
+            db_session,
+            group_by=group_by,
+            date_from=query.date_from,
+            date_to=query.date_to,
+            major_region_id=query.major_region_id,
+            uav_type=query.uav_type,
+            operator_type=query.operator_type,
+        )
+    except SQLAlchemyError as exc:
+        raise FlightStatsError(f'Failed to get flight stats: {exc}') from exc
+    # Without grouping an empty selection still yields one all-NULL row
+    return [FlightStatsRow(**row) for row in rows if row['flights'] is not None]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from backend.core.settings import application_settings
+
+
+class TileCache:
+    """In-process LRU cache of rendered map aggregates (heatmap grids, vector tiles).
+
+    Entries belong to a data version; writers call `invalidate` when flights
+    change, which drops every entry and starts a new version. The version is
+    also what clients get as the ETag. A value computed under an older version
+    is not stored. The TTL bounds staleness for changes made by other
+    processes; `max_entries <= 0` disables caching.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Versions restart with the process; the prefix keeps old ETags from matching
+        self._prefix = uuid.uuid4().hex[:8]
+        self._generation = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    @property
+    def version(self) -> str:
+        return f'{self._prefix}-{self._generation}'
+
+    def invalidate(self) -> None:
+        self._entries.clear()
+        self._generation += 1
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any, *, version: str) -> None:
+        if self.max_entries <= 0 or version != self.version:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+tile_cache = TileCache(
+    max_entries=application_settings.APP_TILE_CACHE_SIZE,
+    ttl=application_settings.APP_TILE_CACHE_TTL,
+)
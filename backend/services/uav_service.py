@@ -1,21 +1,36 @@
+import base64
+import binascii
+import json
 import logging
-from typing import Any
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator
 
+import asyncpg
+import shapely
 from dateutil.parser import isoparse
-from geoalchemy2.elements import WKBElement
-from geoalchemy2.shape import to_shape
-from shapely.geometry import mapping
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.database.base import db_manager
 from backend.database.models import RegionModel, UavFlightModel
-from backend.dto import UavFlightCreateDTO
+from backend.repositories.base_repository import BulkInsertResult
 from backend.repositories.uav_repository import region_repo, uav_flight_repo
-from backend.schemas.uav_schema import DateBoundsQuery
-from backend.services.exceptions import RegionCreateError, UavFlightCreateError
+from backend.schemas.uav_schema import DateBoundsQuery, FlightSearchQuery
+from backend.services.date_bounds_cache import date_bounds_cache
+from backend.services.exceptions import (
+    RegionAssignError,
+    RegionCreateError,
+    UavFlightCreateError,
+)
+from backend.services.parse_service.records import FlightRecords
+from backend.services.tile_cache import tile_cache
 
 logger = logging.getLogger(__name__)
 
+# Vertex cap for search polygons sent by clients
+MAX_SEARCH_POLYGON_POINTS = 10_000
+
 
 async def create_region(
     db_session: AsyncSession,
@@ -32,7 +47,7 @@ async def create_region(
         db_session: Active async DB session.
         name: Region name.
         area: Region area (integer units).
-        geopolygon: POLYGON geometry (SRID=4326).
+        geopolygon: MULTIPOLYGON geometry (SRID=4326).
         geopolygon_str: String representation of polygon (e.g., WKT/GeoJSON).
         **extra: Any additional mapped columns if later added.
 
@@ -58,7 +73,7 @@ async def create_region(
 
 async def create_uav_flights(
     db_session: AsyncSession,
-    data: list[UavFlightCreateDTO],
+    data: list[dict[str, Any]],
 ) -> UavFlightModel | None:
     """Create a UAV flight record.
 
@@ -79,60 +94,316 @@ async def create_uav_flights(
         return None
     except SQLAlchemyError as exc:
         raise UavFlightCreateError(f'Failed to create UAV flight: {exc}') from exc
+    date_bounds_cache.invalidate()
+    tile_cache.invalidate()
     return flight
 
 
+async def copy_uav_flights(
+    db_session: AsyncSession,
+    data: FlightRecords,
+) -> BulkInsertResult:
+    """Bulk-load UAV flights through COPY, skipping already known `flight_id`s.
+
+    Args:
+        db_session: Active async DB session.
+        data: Validated flight rows from `flight_records`.
+
+    Returns:
+        BulkInsertResult: Inserted and skipped row counts.
+
+    Raises:
+        UavFlightCreateError: On DB errors.
+    """
+    try:
+        result = await uav_flight_repo.copy_records(
+            db_session, data.columns, data.rows, conflict_columns=['flight_id']
+        )
+    except (SQLAlchemyError, asyncpg.PostgresError) as exc:
+        raise UavFlightCreateError(f'Failed to copy UAV flights: {exc}') from exc
+    date_bounds_cache.invalidate()
+    tile_cache.invalidate()
+    return result
+
+
+async def disable_region_trigger(db_session: AsyncSession) -> None:
+    """Turn off per-row region lookups of the insert trigger for this transaction.
+
+    Raises:
+        RegionAssignError: On DB errors.
+    """
+    try:
+        await uav_flight_repo.disable_region_trigger(db_session)
+    except SQLAlchemyError as exc:
+        raise RegionAssignError(f'Failed to disable region trigger: {exc}') from exc
+
+
+async def assign_flight_regions(
+    db_session: AsyncSession,
+    *,
+    file_id: str | None = None,
+) -> int:
+    """Assign takeoff/landing/major regions to flights in one set-based pass.
+
+    Args:
+        db_session: Active async DB session.
+        file_id: Limit to flights of one file; None re-runs assignment for all
+            flights, clearing regions of flights no longer inside any region.
+
+    Returns:
+        int: Number of flights processed.
+
+    Raises:
+        RegionAssignError: On DB errors.
+    """
+    try:
+        return await uav_flight_repo.assign_regions(db_session, file_id=file_id)
+    except SQLAlchemyError as exc:
+        raise RegionAssignError(f'Failed to assign regions: {exc}') from exc
+
+
 async def get_uav_date_bounds(db_session: AsyncSession):
     try:
-        min_date, max_date = await uav_flight_repo.get_date_bounds(db_session)
+        min_date, max_date = await date_bounds_cache.get(db_session)
         return min_date, max_date
     except SQLAlchemyError as exc:
         raise UavFlightCreateError(f'Failed to get date bounds: {exc}') from exc
 
 
-async def get_uav_flights_between_dates(
+@dataclass
+class JournalRange:
+    """Validated `/journal-json` query: date range, page size and keyset position."""
+
+    start: datetime
+    end: datetime
+    limit: int | None = None
+    after: tuple[datetime, int] | None = None
+
+
+def encode_flight_cursor(flight: Any) -> str:
+    """Opaque cursor pointing after `flight` in `(date, id)` descending order."""
+    raw = json.dumps([flight.date.isoformat(), flight.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_flight_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of `encode_flight_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        date, flight_id = json.loads(raw)
+        return datetime.fromisoformat(date), int(flight_id)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise ValueError('Invalid cursor') from exc
+
+
+async def resolve_journal_range(
     db_session: AsyncSession,
     *,
     query: DateBoundsQuery,
-):
+) -> JournalRange:
+    """Validate a journal query against the stored date bounds.
+
+    Raises:
+        ValueError: On missing or out-of-range bounds, bad limit or cursor.
+        UavFlightCreateError: On DB errors.
+    """
     try:
         if not query.min_date or not query.max_date:
             raise ValueError('Date bounds for search are not set')
-        min_db, max_db = await uav_flight_repo.get_date_bounds(db_session)
+        min_db, max_db = await date_bounds_cache.get(db_session)
         if min_db is None or max_db is None:
             raise ValueError('Date bounds for search are not set')
-        min_user = isoparse(query.min_date)
-        max_user = isoparse(query.max_date)
-        if min_user < min_db or max_user > max_db:
-            raise ValueError(
-                f'Search bounds ({query.min_date} - {query.max_date}) are outside the allowed range ({min_db} - {max_db})'
-            )
-        limit = query.limit
-        if limit is not None and limit <= 0:
-            raise ValueError('Limit must be greater than zero')
+    except SQLAlchemyError as exc:
+        raise UavFlightCreateError(f'Failed to get flights between dates: {exc}') from exc
+    min_user = isoparse(query.min_date)
+    max_user = isoparse(query.max_date)
+    if min_user < min_db or max_user > max_db:
+        raise ValueError(
+            f'Search bounds ({query.min_date} - {query.max_date}) are outside the allowed range ({min_db} - {max_db})'
+        )
+    limit = query.limit
+    if limit is not None and limit <= 0:
+        raise ValueError('Limit must be greater than zero')
+    after = decode_flight_cursor(query.cursor) if query.cursor else None
+    return JournalRange(start=min_user, end=max_user, limit=limit, after=after)
+
+
+def _point(lon: float | None, lat: float | None) -> dict[str, Any] | None:
+    # Point columns are built by the insert trigger from these same lat/lon floats
+    if lon is None or lat is None:
+        return None
+    return {'type': 'Point', 'coordinates': (lon, lat)}
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _flight_to_dict(flight: Any) -> dict[str, Any]:
+    """Serialize a journal row (`JOURNAL_COLUMNS`) into its JSON-ready dict."""
+    return {
+        'id': flight.id,
+        'flight_id': flight.flight_id,
+        'file_id': str(flight.file_id) if flight.file_id is not None else None,
+        'uav_type': flight.uav_type,
+        'operator_name': flight.operator_name,
+        'operator_type': flight.operator_type,
+        'takeoff_point': _point(flight.takeoff_lon, flight.takeoff_lat),
+        'landing_point': _point(flight.landing_lon, flight.landing_lat),
+        'coordinates': _point(flight.longitude, flight.latitude),
+        'takeoff_lat': flight.takeoff_lat,
+        'takeoff_lon': flight.takeoff_lon,
+        'landing_lat': flight.landing_lat,
+        'landing_lon': flight.landing_lon,
+        'latitude': flight.latitude,
+        'longitude': flight.longitude,
+        'takeoff_datetime': _isoformat(flight.takeoff_datetime),
+        'landing_datetime': _isoformat(flight.landing_datetime),
+        'date': _isoformat(flight.date),
+        'duration_minutes': flight.duration_minutes,
+        'city': flight.city,
+        'major_region_id': flight.major_region_id,
+        'takeoff_region_id': flight.takeoff_region_id,
+        'landing_region_id': flight.landing_region_id,
+        'distance_km': flight.distance_km,
+        'average_speed_kmh': flight.average_speed_kmh,
+    }
+
+
+async def get_uav_flights_between_dates(
+    db_session: AsyncSession,
+    *,
+    query: DateBoundsQuery,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Return one page of flights, newest first, and the cursor of the next page.
+
+    The cursor is None when `limit` is not set or the last page is reached.
+
+    Raises:
+        ValueError: On an invalid query.
+        UavFlightCreateError: On DB errors.
+    """
+    journal = await resolve_journal_range(db_session, query=query)
+    try:
         flights = await uav_flight_repo.get_flights_between_dates(
             db_session,
-            start=min_user,
-            end=max_user,
-            limit=limit,
+            start=journal.start,
+            end=journal.end,
+            limit=journal.limit,
+            after=journal.after,
         )
-
-        result: list[dict[str, Any]] = []
-        for flight in flights:
-            row = {}
-            for column in flight.__table__.columns:
-                value = getattr(flight, column.name)
-
-                if isinstance(value, WKBElement):
-                    try:
-                        row[column.name] = mapping(to_shape(value))
-                    except Exception:
-                        row[column.name] = None
-                elif hasattr(value, 'isoformat'):
-                    row[column.name] = value.isoformat()
-                elif isinstance(value, (str, int, float, bool)) or value is None:
-                    row[column.name] = value
-            result.append(row)
-        return result
     except SQLAlchemyError as exc:
         raise UavFlightCreateError(f'Failed to get flights between dates: {exc}') from exc
+
+    next_cursor = None
+    if journal.limit is not None and len(flights) == journal.limit:
+        next_cursor = encode_flight_cursor(flights[-1])
+    return [_flight_to_dict(flight) for flight in flights], next_cursor
+
+
+async def stream_uav_flights_between_dates(journal: JournalRange) -> AsyncIterator[dict[str, Any]]:
+    """Yield flights of a validated range one by one from a server-side cursor.
+
+    Runs in its own session so the stream can outlive the request's session;
+    `journal.limit` caps the number of rows when set.
+    """
+    async with db_manager.async_session() as session:
+        async with session.begin():
+            flights = uav_flight_repo.stream_flights_between_dates(
+                session,
+                start=journal.start,
+                end=journal.end,
+                limit=journal.limit,
+                after=journal.after,
+            )
+            async for flight in flights:
+                yield _flight_to_dict(flight)
+
+
+@dataclass
+class FlightSearch:
+    """Validated `/flights/search` query, in the form `search_flights` takes."""
+
+    point: str = 'takeoff'
+    bbox: tuple[float, float, float, float] | None = None
+    area_wkt: str | None = None
+    region_id: int | None = None
+    start: datetime | None = None
+    end: datetime | None = None
+    uav_type: str | None = None
+    operator_type: str | None = None
+    after: tuple[datetime, int] | None = None
+
+
+def validate_bbox(bbox) -> tuple[float, float, float, float]:
+    """Check a `[min_lon, min_lat, max_lon, max_lat]` box and return it as floats.
+
+    Raises:
+        ValueError: If the box is empty, inverted or outside WGS 84 bounds.
+    """
+    min_lon, min_lat, max_lon, max_lat = map(float, bbox)
+    if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+        raise ValueError('bbox must be [min_lon, min_lat, max_lon, max_lat] within WGS 84')
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def _search_polygon(geojson: dict) -> str:
+    try:
+        geometry = shapely.geometry.shape(geojson)
+    except (AttributeError, KeyError, TypeError, ValueError, shapely.errors.ShapelyError) as exc:
+        raise ValueError(f'Invalid polygon: {exc}') from exc
+    if geometry.geom_type not in ('Polygon', 'MultiPolygon') or geometry.is_empty:
+        raise ValueError('Polygon must be a non-empty Polygon or MultiPolygon')
+    if shapely.get_num_coordinates(geometry) > MAX_SEARCH_POLYGON_POINTS:
+        raise ValueError(f'Polygon must have at most {MAX_SEARCH_POLYGON_POINTS} points')
+    if not geometry.is_valid:
+        raise ValueError(f'Invalid polygon: {shapely.is_valid_reason(geometry)}')
+    return geometry.wkt
+
+
+def resolve_flight_search(query: FlightSearchQuery) -> FlightSearch:
+    """Validate a search query and convert its geometries for the repository.
+
+    Raises:
+        ValueError: On a malformed bbox, polygon, date range or cursor.
+    """
+    if query.date_from and query.date_to and query.date_from > query.date_to:
+        raise ValueError('date_from must not be after date_to')
+    return FlightSearch(
+        point=query.point,
+        bbox=validate_bbox(query.bbox) if query.bbox is not None else None,
+        area_wkt=_search_polygon(query.polygon) if query.polygon is not None else None,
+        region_id=query.region_id,
+        start=query.date_from,
+        end=query.date_to,
+        uav_type=query.uav_type,
+        operator_type=query.operator_type,
+        after=decode_flight_cursor(query.cursor) if query.cursor else None,
+    )
+
+
+async def search_uav_flights(
+    db_session: AsyncSession,
+    *,
+    query: FlightSearchQuery,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Return one page of flights matching the search, newest first, and the next cursor.
+
+    Raises:
+        ValueError: On an invalid query.
+        UavFlightCreateError: On DB errors.
+    """
+    search = resolve_flight_search(query)
+    try:
+        flights = await uav_flight_repo.search_flights(
+            db_session, limit=query.limit, **asdict(search)
+        )
+    except SQLAlchemyError as exc:
+        raise UavFlightCreateError(f'Failed to search flights: {exc}') from exc
+
+    next_cursor = encode_flight_cursor(flights[-1]) if len(flights) == query.limit else None
+    return [_flight_to_dict(flight) for flight in flights], next_cursor
@@ -0,0 +1,83 @@
+"""LRU cache of verified bearer tokens.
+
+A token is presented on many requests during its lifetime; once its signature
+and claims have been checked, the decoded claims are kept under the SHA-256 of
+the token until the token's `exp`. Tokens without `exp` are not cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from prometheus_client import Counter
+
+TOKEN_CACHE_HITS = Counter(
+    'auth_token_cache_hits_total', 'Bearer tokens accepted without verifying the signature'
+)
+TOKEN_CACHE_MISSES = Counter(
+    'auth_token_cache_misses_total', 'Bearer tokens that needed a full signature check'
+)
+
+
+@dataclass
+class TokenCacheInfo:
+    """Token cache statistics."""
+
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class VerifiedTokenCache:
+    """Decoded claims by token hash; `max_entries <= 0` disables caching."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, claims = entry
+            if time.time() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                TOKEN_CACHE_HITS.inc()
+                return claims
+            del self._entries[key]
+        self.misses += 1
+        TOKEN_CACHE_MISSES.inc()
+        return None
+
+    def put(self, key: bytes, claims: dict[str, Any]) -> None:
+        exp = claims.get('exp')
+        if self.max_entries <= 0 or not isinstance(exp, (int, float)):
+            return
+        self._entries[key] = (float(exp), claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def cache_info(self) -> TokenCacheInfo:
+        return TokenCacheInfo(self.hits, self.misses, len(self._entries), self.max_entries)
+
+    def cache_clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,86 @@
+"""Benchmark: authenticated requests per second with and without the token cache.
+
+Sends `--requests` requests, each with one of `--tokens` distinct bearer
+tokens, through `JWTMiddleware` to an empty endpoint over an in-process ASGI
+transport. Signing keys are preloaded, so neither Keycloak nor a database is
+needed; the figures cover token validation and the middleware only.
+
+    python -m tests.benchmarks.bench_auth --requests 5000 --tokens 50
+"""
+
+import argparse
+import asyncio
+import math
+import time
+
+import httpx
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI
+
+from backend.core.settings import keycloak_settings
+from backend.middleware import JWTMiddleware, validator
+from backend.token_cache import VerifiedTokenCache
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(JWTMiddleware)
+
+    @app.get('/ping')
+    async def ping():
+        return {}
+
+    return app
+
+
+def make_tokens(count: int) -> list[str]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    validator.jwks._keys = {'bench': private_key.public_key()}
+    validator.jwks._expires_at = math.inf
+    exp = int(time.time()) + 3600
+    return [
+        jwt.encode(
+            {'sub': f'user-{n}', 'aud': keycloak_settings.KEYCLOAK_CLIENT_ID, 'exp': exp},
+            private_key,
+            algorithm='RS256',
+            headers={'kid': 'bench'},
+        )
+        for n in range(count)
+    ]
+
+
+async def run(app: FastAPI, tokens: list[str], requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        started = time.perf_counter()
+        for n in range(requests):
+            token = tokens[n % len(tokens)]
+            response = await client.get('/ping', headers={'Authorization': f'Bearer {token}'})
+            response.raise_for_status()
+        return time.perf_counter() - started
+
+
+def main(requests: int, tokens: int, cache_size: int) -> None:
+    app = build_app()
+    bearer = make_tokens(tokens)
+    print(f'{"token cache":<12} {"requests":>9} {"time, s":>9} {"req/s":>9} {"hit ratio":>10}')
+    for label, size in (('off', 0), ('on', cache_size)):
+        validator.tokens = VerifiedTokenCache(size)
+        elapsed = asyncio.run(run(app, bearer, requests))
+        info = validator.tokens.cache_info()
+        print(
+            f'{label:<12} {requests:>9} {elapsed:>9.2f} {requests / elapsed:>9.0f} '
+            f'{info.hit_ratio:>10.1%}'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--tokens', type=int, default=50)
+    parser.add_argument(
+        '--cache-size', type=int, default=keycloak_settings.KEYCLOAK_TOKEN_CACHE_SIZE
+    )
+    args = parser.parse_args()
+    main(args.requests, args.tokens, args.cache_size)
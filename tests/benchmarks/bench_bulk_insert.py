@@ -0,0 +1,112 @@
+"""Benchmark: batched `create_many` INSERTs vs `copy_many` COPY for `uav_flights`.
+
+Runs against the migrated database from `POSTGRES_URI` (with the region
+trigger in place). Every run happens in a transaction that is rolled back.
+`catalog` counts the rows written to pg_class/pg_attribute/pg_type during
+the run, e.g. by staging tables created per batch.
+
+    python -m tests.benchmarks.bench_bulk_insert --rows 10000 100000 1000000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from backend.core.settings import application_settings, postgres_settings
+from backend.repositories.uav_repository import uav_flight_repo
+
+
+def make_rows(n: int) -> list[dict]:
+    run = uuid4().hex[:8]
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(n):
+        lat, lon = random.uniform(43, 68), random.uniform(28, 140)
+        start = base + timedelta(minutes=random.randint(0, 500_000))
+        rows.append(
+            {
+                'flight_id': f'bench-{run}-{i}',
+                'uav_type': 'BLA',
+                'operator_name': 'ООО БЕНЧМАРК',
+                'operator_type': 'legal_entity',
+                'takeoff_lat': lat,
+                'takeoff_lon': lon,
+                'landing_lat': lat + 0.01,
+                'landing_lon': lon + 0.01,
+                'latitude': lat,
+                'longitude': lon,
+                'takeoff_datetime': start,
+                'landing_datetime': start + timedelta(minutes=45),
+                'date': start,
+                'duration_minutes': 45,
+                'city': 'Московский',
+                'distance_km': 1.3,
+                'average_speed_kmh': 1.8,
+            }
+        )
+    return rows
+
+
+async def run_insert(session: AsyncSession, rows: list[dict], batch: int) -> None:
+    for i in range(0, len(rows), batch):
+        await uav_flight_repo.create_many(session, rows[i : i + batch])
+
+
+async def run_copy(session: AsyncSession, rows: list[dict], batch: int) -> None:
+    for i in range(0, len(rows), batch):
+        await uav_flight_repo.copy_many(
+            session, rows[i : i + batch], conflict_columns=['flight_id']
+        )
+
+
+CATALOG_WRITES = text(
+    'SELECT COALESCE(sum(n_tup_ins + n_tup_upd + n_tup_del), 0) FROM pg_stat_xact_sys_tables '
+    "WHERE relname IN ('pg_class', 'pg_attribute', 'pg_type')"
+)
+
+
+async def measure(sessionmaker, fn, rows: list[dict], batch: int) -> tuple[float, int]:
+    async with sessionmaker() as session:
+        await session.begin()
+        started = time.perf_counter()
+        await fn(session, rows, batch)
+        elapsed = time.perf_counter() - started
+        catalog_writes = await session.scalar(CATALOG_WRITES)
+        await session.rollback()
+    return elapsed, catalog_writes
+
+
+async def main(sizes: list[int], batch: int, copy_batch: int) -> None:
+    engine = create_async_engine(postgres_settings.POSTGRES_URI, poolclass=NullPool)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    print(
+        f'{"rows":>10} {"insert, s":>10} {"copy, s":>10} {"insert r/s":>12} {"copy r/s":>12} '
+        f'{"catalog":>8}'
+    )
+    try:
+        for n in sizes:
+            rows = make_rows(n)
+            t_insert, _ = await measure(sessionmaker, run_insert, rows, batch)
+            t_copy, catalog_writes = await measure(sessionmaker, run_copy, rows, copy_batch)
+            print(
+                f'{n:>10} {t_insert:>10.2f} {t_copy:>10.2f} '
+                f'{n / t_insert:>12.0f} {n / t_copy:>12.0f} {catalog_writes:>8}'
+            )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--batch', type=int, default=application_settings.APP_BATCH_PROCESSING)
+    parser.add_argument('--copy-batch', type=int, default=application_settings.APP_BATCH_PROCESSING)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.batch, args.copy_batch))
@@ -0,0 +1,68 @@
+"""Benchmark: per-row cost of turning a mapped frame into insert rows.
+
+Compares the former path (a `UavFlightCreateDTO` per row, then `model_dump`)
+with the columnar `flight_records`. The first sheet of the test dataset is
+mapped once and repeated to `--rows` rows; no database is needed.
+
+    python -m tests.benchmarks.bench_ingest_records --rows 100000 --repeat 3
+"""
+
+import argparse
+import time
+import uuid
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+from backend.dto import UavFlightCreateDTO
+from backend.services.parse_service.geocoder import DefaultGeocoder
+from backend.services.parse_service.mapper import VectorizedMapper
+from backend.services.parse_service.party_classifier import PartyClassifier
+from backend.services.parse_service.records import flight_records
+
+DATASET = Path(__file__).parents[1] / 'assets' / 'test_dataset.xlsx'
+
+
+def dto_rows(frame: pd.DataFrame, file_id: str) -> list[dict]:
+    rows = []
+    for record in VectorizedMapper.iter_records(frame):
+        uav_flight = UavFlightCreateDTO(**record)
+        uav_flight.file_id = file_id
+        rows.append(uav_flight.model_dump())
+    return rows
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(rows: int, repeat: int) -> None:
+    # The former path warns on every batch (pandas deprecations, str file_id)
+    warnings.simplefilter('ignore')
+    mapped = VectorizedMapper(DefaultGeocoder(), PartyClassifier()).map_frame(
+        pd.read_excel(DATASET, sheet_name=0, engine='openpyxl')
+    )
+    frame = pd.concat([mapped] * (rows // len(mapped) + 1), ignore_index=True).iloc[:rows]
+    file_id = str(uuid.uuid4())
+
+    print(f'{"path":<16} {"rows":>8} {"best, s":>9} {"us/row":>8}')
+    for name, fn in (
+        ('DTO model_dump', lambda: dto_rows(frame, file_id)),
+        ('flight_records', lambda: flight_records(frame, file_id=file_id)),
+    ):
+        elapsed = best_of(repeat, fn)
+        print(f'{name:<16} {len(frame):>8} {elapsed:>9.3f} {elapsed / len(frame) * 1e6:>8.2f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    main(args.rows, args.repeat)
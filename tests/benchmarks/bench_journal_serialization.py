@@ -0,0 +1,109 @@
+"""Benchmark: journal row serialization, WKB decoding vs column projection.
+
+The old path loaded full `UavFlightModel` objects and decoded the three point
+columns with `to_shape` + `mapping`; the new one serializes `JOURNAL_COLUMNS`
+rows and builds the points from lat/lon. Rows are synthetic, so no database
+is needed.
+
+    python -m tests.benchmarks.bench_journal_serialization --rows 1000 10000 100000
+"""
+
+import argparse
+import random
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+from geoalchemy2.elements import WKBElement
+from geoalchemy2.shape import from_shape, to_shape
+from shapely.geometry import Point, mapping
+
+from backend.database.models import UavFlightModel
+from backend.repositories.uav_repository import JOURNAL_COLUMNS
+from backend.services.uav_service import _flight_to_dict
+
+JournalRow = namedtuple('JournalRow', [c.key for c in JOURNAL_COLUMNS])
+
+
+def legacy_flight_to_dict(flight: UavFlightModel) -> dict:
+    row = {}
+    for column in flight.__table__.columns:
+        value = getattr(flight, column.name)
+
+        if isinstance(value, WKBElement):
+            try:
+                row[column.name] = mapping(to_shape(value))
+            except Exception:
+                row[column.name] = None
+        elif hasattr(value, 'isoformat'):
+            row[column.name] = value.isoformat()
+        elif isinstance(value, (str, int, float, bool)) or value is None:
+            row[column.name] = value
+    return row
+
+
+def make_flights(n: int) -> tuple[list[UavFlightModel], list[JournalRow]]:
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    models, rows = [], []
+    for i in range(n):
+        lat, lon = random.uniform(43, 68), random.uniform(28, 140)
+        start = base + timedelta(minutes=random.randint(0, 500_000))
+        values = {
+            'id': i,
+            'flight_id': f'bench-{i}',
+            'file_id': None,
+            'uav_type': 'BLA',
+            'operator_name': 'ООО БЕНЧМАРК',
+            'operator_type': 'legal_entity',
+            'takeoff_lat': lat,
+            'takeoff_lon': lon,
+            'landing_lat': lat + 0.01,
+            'landing_lon': lon + 0.01,
+            'latitude': lat,
+            'longitude': lon,
+            'takeoff_datetime': start,
+            'landing_datetime': start + timedelta(minutes=45),
+            'date': start,
+            'duration_minutes': 45,
+            'city': 'Московский',
+            'major_region_id': 1,
+            'takeoff_region_id': 1,
+            'landing_region_id': 1,
+            'distance_km': 1.3,
+            'average_speed_kmh': 1.8,
+        }
+        rows.append(JournalRow(**values))
+        models.append(
+            UavFlightModel(
+                **values,
+                takeoff_point=from_shape(Point(lon, lat), srid=4326),
+                landing_point=from_shape(Point(lon + 0.01, lat + 0.01), srid=4326),
+                coordinates=from_shape(Point(lon, lat), srid=4326),
+            )
+        )
+    return models, rows
+
+
+def measure(fn, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return time.perf_counter() - started
+
+
+def main(sizes: list[int]) -> None:
+    print(f'{"rows":>8} {"wkb, s":>9} {"projection, s":>14} {"speedup":>8}')
+    for n in sizes:
+        models, rows = make_flights(n)
+        # Same output; `file_id` is None here since the old path dropped UUIDs
+        assert legacy_flight_to_dict(models[0]) == _flight_to_dict(rows[0])
+        t_legacy = measure(legacy_flight_to_dict, models)
+        t_projection = measure(_flight_to_dict, rows)
+        print(f'{n:>8} {t_legacy:>9.3f} {t_projection:>14.3f} {t_legacy / t_projection:>7.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+    main(args.rows)
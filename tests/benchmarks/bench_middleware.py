@@ -0,0 +1,102 @@
+"""Benchmark: JWT middleware overhead, pure ASGI vs BaseHTTPMiddleware.
+
+Sends `--requests` authenticated requests to an empty endpoint through each
+implementation, `--concurrency` at a time, over an in-process ASGI transport,
+and prints requests per second and p50/p99 latency. The BaseHTTPMiddleware
+version is the one the app used before; both share the validator and its
+token cache, so the difference is the middleware itself.
+
+    python -m tests.benchmarks.bench_middleware --requests 5000 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+import numpy as np
+from fastapi import FastAPI, HTTPException, Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from backend.middleware import JWTMiddleware, validator
+from tests.benchmarks.bench_auth import make_tokens
+
+
+class LegacyJWTMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, exclude_paths: list[str] | None = None):
+        super().__init__(app)
+        self.exclude_paths = exclude_paths or ['/docs', '/openapi.json', '/health']
+
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path in self.exclude_paths:
+            return await call_next(request)
+        auth_header = request.headers.get('Authorization')
+        if not auth_header or not auth_header.startswith('Bearer '):
+            return Response(
+                content='{"detail": "Authorization header required"}',
+                status_code=401,
+                media_type='application/json',
+            )
+        try:
+            request.state.user = await validator.validate_token(auth_header.split(' ')[1])
+        except HTTPException as e:
+            return Response(
+                content=f'{{"detail": "{e.detail}"}}',
+                status_code=e.status_code,
+                media_type='application/json',
+            )
+        return await call_next(request)
+
+
+def build_app(middleware) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+
+    @app.get('/ping')
+    async def ping():
+        return {}
+
+    return app
+
+
+async def run(app: FastAPI, tokens: list[str], requests: int, concurrency: int) -> tuple:
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+
+        async def worker(offset: int):
+            for n in range(offset, requests, concurrency):
+                headers = {'Authorization': f'Bearer {tokens[n % len(tokens)]}'}
+                started = time.perf_counter()
+                response = await client.get('/ping', headers=headers)
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return elapsed, np.percentile(latencies, [50, 99]) * 1000
+
+
+def main(requests: int, concurrency: int, tokens: int) -> None:
+    bearer = make_tokens(tokens)
+    print(f'{"middleware":<20} {"req/s":>9} {"p50, ms":>9} {"p99, ms":>9}')
+    for name, middleware in (
+        ('BaseHTTPMiddleware', LegacyJWTMiddleware),
+        ('ASGI', JWTMiddleware),
+    ):
+        app = build_app(middleware)
+        # Warm the token cache so both runs measure the same validation path
+        asyncio.run(run(app, bearer, len(bearer), 1))
+        elapsed, (p50, p99) = asyncio.run(run(app, bearer, requests, concurrency))
+        print(f'{name:<20} {requests / elapsed:>9.0f} {p50:>9.2f} {p99:>9.2f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--tokens', type=int, default=50)
+    args = parser.parse_args()
+    main(args.requests, args.concurrency, args.tokens)
@@ -0,0 +1,94 @@
+"""Benchmark: workbook parsing throughput with 1..N parse pool processes.
+
+Builds a workbook with `--sheets` copies of the first sheet of the test
+dataset, then reads and maps it inline and through `ParsePool` with each
+worker count. No database is needed; nothing is inserted.
+
+    python -m tests.benchmarks.bench_parse_pool --sheets 8 --workers 1 2 4 8
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import openpyxl
+
+from backend.services.parse_service.geocoder import DefaultGeocoder
+from backend.services.parse_service.loader import StreamingExcelLoader
+from backend.services.parse_service.mapper import VectorizedMapper
+from backend.services.parse_service.party_classifier import PartyClassifier
+from backend.services.parse_service.pool import ParsePool
+
+DATASET = Path(__file__).parents[1] / 'assets' / 'test_dataset.xlsx'
+
+
+def build_workbook(source: Path, target: Path, sheets: int) -> None:
+    rows = list(openpyxl.load_workbook(source, read_only=True).worksheets[0].values)
+    book = openpyxl.Workbook(write_only=True)
+    for n in range(sheets):
+        sheet = book.create_sheet(f'Sheet_{n + 1}')
+        for row in rows:
+            sheet.append(row)
+    book.save(target)
+
+
+def run_inline(path: Path, chunk_rows: int) -> int:
+    mapper = VectorizedMapper(DefaultGeocoder(), PartyClassifier())
+    rows = 0
+    with StreamingExcelLoader(path, chunk_rows=chunk_rows) as loader:
+        for sheet_name in loader.sheet_names:
+            for chunk in loader.iter_chunks(sheet_name):
+                rows += len(mapper.map_frame(chunk))
+    return rows
+
+
+async def run_pool(path: Path, workers: int, queue_size: int, chunk_rows: int) -> tuple[int, float]:
+    with StreamingExcelLoader(path) as loader:
+        sheet_names = loader.sheet_names
+    pool = ParsePool(workers=workers, queue_size=queue_size)
+    pool.start()
+    try:
+        # Spawning processes is not part of the measurement
+        await asyncio.get_running_loop().run_in_executor(pool._executor, int)
+        started = time.perf_counter()
+        rows = 0
+        async for chunk in pool.iter_chunks(
+            path, sheet_names, chunk_rows=chunk_rows, classifier=PartyClassifier()
+        ):
+            rows += len(chunk.frame)
+        return rows, time.perf_counter() - started
+    finally:
+        pool.stop()
+
+
+def main(sheets: int, workers: list[int], queue_size: int, chunk_rows: int) -> None:
+    print(f'cpu count: {os.cpu_count()}')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'journal.xlsx'
+        build_workbook(DATASET, path, sheets)
+
+        started = time.perf_counter()
+        rows = run_inline(path, chunk_rows)
+        t_inline = time.perf_counter() - started
+
+        print(f'{"workers":>8} {"rows":>9} {"time, s":>9} {"rows/s":>9} {"speedup":>8}')
+        print(f'{"inline":>8} {rows:>9} {t_inline:>9.2f} {rows / t_inline:>9.0f} {1:>7.2f}x')
+        for n in workers:
+            rows, elapsed = asyncio.run(run_pool(path, n, queue_size, chunk_rows))
+            print(
+                f'{n:>8} {rows:>9} {elapsed:>9.2f} {rows / elapsed:>9.0f} '
+                f'{t_inline / elapsed:>7.2f}x'
+            )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sheets', type=int, default=4)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--queue-size', type=int, default=4)
+    parser.add_argument('--chunk-rows', type=int, default=1500)
+    args = parser.parse_args()
+    main(args.sheets, args.workers, args.queue_size, args.chunk_rows)
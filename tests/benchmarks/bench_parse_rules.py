@@ -0,0 +1,83 @@
+"""Micro-benchmarks: rows/sec of the mapper, geocoder and party classifier.
+
+Runs on the first sheet of a journal workbook (the bundled test dataset by
+default); no database is needed. Each stage is timed on its own inputs, taken
+from the sheet, so the figures do not include the other stages.
+
+    python -m tests.benchmarks.bench_parse_rules --repeat 3
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from backend.services.parse_service.geocoder import DefaultGeocoder
+from backend.services.parse_service.mapper import DefaultMapper, VectorizedMapper
+from backend.services.parse_service.party_classifier import PartyClassifier
+from backend.services.parse_service.rules import (
+    ADEPZ_RE,
+    OPR_RE,
+    tokenize_aftn,
+    tokenize_shr,
+)
+
+DATASET = Path(__file__).parents[1] / 'assets' / 'test_dataset.xlsx'
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(path: Path, repeat: int) -> None:
+    df = pd.read_excel(path, sheet_name=0)
+    geocoder = DefaultGeocoder()
+    classifier = PartyClassifier()
+    uncached = PartyClassifier(cache_size=0)
+    row_mapper = DefaultMapper(geocoder, classifier)
+    frame_mapper = VectorizedMapper(geocoder, classifier)
+
+    rows = [row for _, row in df.iterrows()]
+    dep = df['DEP'].where(df['DEP'].notna(), '').astype(str)
+    shr = df['SHR'].where(df['SHR'].notna(), '').astype(str)
+    coords = dep.str.extract(ADEPZ_RE, expand=False).dropna()
+    operators = shr.str.extract(OPR_RE, expand=False).dropna().str.strip().str.upper()
+
+    def map_rows():
+        for row in rows:
+            try:
+                row_mapper.map_row(row)
+            except ValueError:
+                pass
+
+    stages = [
+        ('tokenize DEP', len(dep), lambda: [tokenize_aftn(t) for t in dep]),
+        ('tokenize SHR', len(shr), lambda: [tokenize_shr(t) for t in shr]),
+        ('mapper, row', len(rows), map_rows),
+        ('mapper, frame', len(df), lambda: frame_mapper.map_frame(df)),
+        ('geocoder', len(coords), lambda: [geocoder.parse_latlon(c) for c in coords]),
+        ('geocoder, series', len(coords), lambda: geocoder.parse_latlon_series(coords)),
+        ('classifier', len(operators), lambda: [uncached.classify(o) for o in operators]),
+        ('classifier, LRU', len(operators), lambda: [classifier.classify(o) for o in operators]),
+    ]
+
+    print(f'{"stage":<18} {"rows":>8} {"best, s":>9} {"rows/s":>11}')
+    for name, n, fn in stages:
+        elapsed = best_of(repeat, fn)
+        print(f'{name:<18} {n:>8} {elapsed:>9.3f} {n / elapsed:>11.0f}')
+    info = classifier.cache_info()
+    print(f'classifier cache: {info.size} operators, {info.hits} hits, {info.misses} misses')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--file', type=Path, default=DATASET)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    main(args.file, args.repeat)
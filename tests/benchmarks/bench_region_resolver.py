@@ -0,0 +1,74 @@
+"""Benchmark: in-process `RegionIndex` vs the trigger's per-row PostGIS lookup.
+
+Needs a database from `POSTGRES_URI` with regions loaded. The trigger path is
+reproduced by running its `ST_Contains ... LIMIT 1` subquery once per point.
+
+    python -m tests.benchmarks.bench_region_resolver --points 10000 100000
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from backend.core.settings import postgres_settings
+from backend.services.region_index import NO_REGION, RegionIndex
+
+TRIGGER_LOOKUP = text(
+    """
+    SELECT (
+        SELECT id FROM regions
+        WHERE ST_Contains(geopolygon, ST_SetSRID(ST_MakePoint(p.lon, p.lat), 4326))
+        LIMIT 1
+    )
+    FROM unnest(CAST(:lats AS float8[]), CAST(:lons AS float8[])) WITH ORDINALITY AS p(lat, lon, n)
+    ORDER BY p.n
+    """
+)
+
+
+async def main(sizes: list[int], seed: int) -> None:
+    engine = create_async_engine(postgres_settings.POSTGRES_URI, poolclass=NullPool)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    rng = np.random.default_rng(seed)
+    try:
+        async with sessionmaker() as session:
+            index = RegionIndex()
+            started = time.perf_counter()
+            await index.ensure_loaded(session)
+            print(f'index build: {time.perf_counter() - started:.2f}s')
+
+            print(f'{"points":>10} {"index, s":>10} {"postgis, s":>11} {"speedup":>8} {"agree":>7}')
+            for n in sizes:
+                lats = rng.uniform(41, 78, n)
+                lons = rng.uniform(19, 180, n)
+
+                started = time.perf_counter()
+                local = index.resolve(lats, lons)
+                t_index = time.perf_counter() - started
+
+                started = time.perf_counter()
+                result = await session.execute(
+                    TRIGGER_LOOKUP, {'lats': lats.tolist(), 'lons': lons.tolist()}
+                )
+                remote = np.array([r[0] if r[0] is not None else NO_REGION for r in result])
+                t_sql = time.perf_counter() - started
+
+                agree = float(np.mean(local == remote))
+                print(
+                    f'{n:>10} {t_index:>10.3f} {t_sql:>11.3f} {t_sql / t_index:>7.1f}x {agree:>7.2%}'
+                )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--points', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(main(args.points, args.seed))
@@ -1,7 +1,7 @@
 from typing import TypeVar
 
 import pytest
-from sqlalchemy import Integer, String, UniqueConstraint, select
+from sqlalchemy import Integer, String, UniqueConstraint, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -123,3 +123,50 @@ class TestBaseRepository:
         remaining = await repo.get_all(db_session)
         assert len(remaining) == 1
         assert remaining[0].name == 'Keep'
+
+    @pytest.mark.asyncio
+    async def test_copy_many_inserts_and_reports_skipped(
+        self, repo: TestEntityRepository, db_session: AsyncSession
+    ):
+        await repo.create_one(db_session, name='existing', age=1)
+        rows = [
+            {'name': 'existing', 'age': 2},
+            {'name': 'c1', 'age': 3},
+            {'name': 'c2', 'age': 4},
+            {'name': 'c2', 'age': 5},
+        ]
+        result = await repo.copy_many(db_session, rows, conflict_columns=['name'])
+        assert result.inserted == 2
+        assert result.skipped == 2
+
+        items = {x.name: x.age for x in await repo.get_all(db_session)}
+        assert items == {'existing': 1, 'c1': 3, 'c2': 4}
+
+    @pytest.mark.asyncio
+    async def test_copy_many_empty_and_repeated(
+        self, repo: TestEntityRepository, db_session: AsyncSession
+    ):
+        empty = await repo.copy_many(db_session, [])
+        assert (empty.inserted, empty.skipped) == (0, 0)
+
+        rows = [{'name': 'r1', 'age': 1}, {'name': 'r2', 'age': 2}]
+        first = await repo.copy_many(db_session, rows)
+        again = await repo.copy_many(db_session, rows)
+        assert (first.inserted, first.skipped) == (2, 0)
+        assert (again.inserted, again.skipped) == (0, 2)
+
+    @pytest.mark.asyncio
+    async def test_copy_many_reuses_staging_table(
+        self, repo: TestEntityRepository, db_session: AsyncSession
+    ):
+        for n in range(3):
+            result = await repo.copy_many(db_session, [{'name': f's{n}', 'age': n}])
+            assert result.inserted == 1
+
+        staging = await db_session.scalars(
+            text(
+                "SELECT relname FROM pg_class WHERE relname LIKE '\\_copy\\_test\\_entities\\_%' "
+                "AND relpersistence = 't' AND pg_table_is_visible(oid)"
+            )
+        )
+        assert len(staging.all()) == 1
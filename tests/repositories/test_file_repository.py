@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.repositories.file_repository import file_metadata_repo
+
+
+class TestFileMetadataRepository:
+    @pytest.mark.asyncio
+    async def test_update_by_status(self, db_session: AsyncSession):
+        files = {}
+        for status in ('queued', 'processing', 'processed', 'failed'):
+            files[status] = await file_metadata_repo.create_one(
+                db_session,
+                filename=f'{status}.xlsx',
+                file_size=1,
+                status=status,
+                message=status,
+                sheet_names=[],
+            )
+
+        updated = await file_metadata_repo.update_by_status(
+            db_session, ('queued', 'processing'), status='failed', message='Interrupted'
+        )
+
+        assert sorted(updated) == sorted(
+            str(files[status].file_id) for status in ('queued', 'processing')
+        )
+        statuses = {
+            fm.filename: (fm.status, fm.message)
+            for fm in await file_metadata_repo.get_all(db_session)
+        }
+        assert statuses == {
+            'queued.xlsx': ('failed', 'Interrupted'),
+            'processing.xlsx': ('failed', 'Interrupted'),
+            'processed.xlsx': ('processed', 'processed'),
+            'failed.xlsx': ('failed', 'failed'),
+        }
@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.repositories.operator_repository import operator_classification_repo
+
+
+def _row(name: str, category: str = 'legal_entity') -> dict:
+    return {'operator_raw': name, 'category': category, 'confidence': 0.98, 'normalized': name}
+
+
+class TestOperatorClassificationRepository:
+    @pytest.mark.asyncio
+    async def test_insert_missing_skips_stored(self, db_session: AsyncSession):
+        assert await operator_classification_repo.insert_missing(db_session, [_row('ООО А')]) == 1
+
+        inserted = await operator_classification_repo.insert_missing(
+            db_session, [_row('ООО А', 'unknown'), _row('ООО Б')]
+        )
+
+        assert inserted == 1
+        stored = {
+            r.operator_raw: r.category
+            for r in await operator_classification_repo.get_many(db_session)
+        }
+        assert stored == {'ООО А': 'legal_entity', 'ООО Б': 'legal_entity'}
+
+    @pytest.mark.asyncio
+    async def test_get_many_limit(self, db_session: AsyncSession):
+        await operator_classification_repo.insert_missing(
+            db_session, [_row(f'ООО {i}') for i in range(5)]
+        )
+
+        assert len(await operator_classification_repo.get_many(db_session, limit=3)) == 3
@@ -0,0 +1,124 @@
+import json
+import math
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.repositories.region_repository import region_geometry_repo, region_part_repo
+from backend.repositories.uav_repository import region_repo, uav_flight_repo
+
+# A wiggly square: its 1 km version keeps the notch, the 50 km one drops it
+NOTCHED = (
+    'SRID=4326;MULTIPOLYGON(((30 50, 35 50, 35.01 50.01, 35.02 50, 40 50, 40 60, 30 60, 30 50)))'
+)
+
+
+class TestRegionRepository:
+    @pytest.mark.asyncio
+    async def test_upsert_by_name(self, db_session: AsyncSession):
+        first = await region_repo.upsert_by_name(
+            db_session,
+            [
+                {'name': 'A', 'area': 1, 'geopolygon': NOTCHED, 'geopolygon_str': '[]'},
+                {'name': 'B', 'area': 2, 'geopolygon': NOTCHED, 'geopolygon_str': '[]'},
+            ],
+        )
+        second = await region_repo.upsert_by_name(
+            db_session,
+            [
+                {'name': 'B', 'area': 20, 'geopolygon': NOTCHED, 'geopolygon_str': '[[1]]'},
+                {'name': 'C', 'area': 3, 'geopolygon': NOTCHED, 'geopolygon_str': '[]'},
+            ],
+        )
+
+        assert sorted(first) == ['A', 'B']
+        assert sorted(second) == ['B', 'C']
+        assert second['B'] == first['B']
+        assert second['C'] not in first.values()
+        regions = {r.name: r for r in await region_repo.get_all(db_session)}
+        assert sorted(regions) == ['A', 'B', 'C']
+        assert (regions['B'].area, regions['B'].geopolygon_str) == (20, '[[1]]')
+
+    @pytest.mark.asyncio
+    async def test_upsert_nothing(self, db_session: AsyncSession):
+        assert await region_repo.upsert_by_name(db_session, []) == {}
+
+
+class TestRegionGeometryRepository:
+    @pytest.mark.asyncio
+    async def test_refresh_levels(self, db_session: AsyncSession):
+        region = await region_repo.create_one(
+            db_session, name='A', area=1, geopolygon=NOTCHED, geopolygon_str='[]'
+        )
+
+        assert await region_geometry_repo.refresh(db_session, lods=[1, 50000]) == 2
+
+        fine = await region_geometry_repo.get_features(db_session, lod_m=1)
+        coarse = await region_geometry_repo.get_features(db_session, lod_m=50000)
+        assert [(row.id, row.name) for row in fine] == [(region.id, 'A')]
+        fine_ring = json.loads(fine[0].geojson)['coordinates'][0]
+        coarse_ring = json.loads(coarse[0].geojson)['coordinates'][0]
+        assert json.loads(coarse[0].geojson)['type'] == 'Polygon'
+        assert len(coarse_ring) < len(fine_ring)
+
+    @pytest.mark.asyncio
+    async def test_refresh_drops_other_levels(self, db_session: AsyncSession):
+        await region_repo.create_one(
+            db_session, name='A', area=1, geopolygon=NOTCHED, geopolygon_str='[]'
+        )
+        await region_geometry_repo.refresh(db_session, lods=[1000])
+
+        await region_geometry_repo.refresh(db_session, lods=[10000])
+
+        assert await region_geometry_repo.get_version(db_session, lod_m=1000) == (0, None)
+        count, updated_at = await region_geometry_repo.get_version(db_session, lod_m=10000)
+        assert count == 1 and updated_at is not None
+
+
+def _circle(lon: float, lat: float, radius: float, vertices: int) -> str:
+    ring = [
+        (
+            lon + radius * math.cos(2 * math.pi * i / vertices),
+            lat + radius * math.sin(2 * math.pi * i / vertices),
+        )
+        for i in range(vertices)
+    ]
+    ring.append(ring[0])
+    return '((%s))' % ', '.join(f'{x} {y}' for x, y in ring)
+
+
+class TestRegionPartRepository:
+    @pytest.mark.asyncio
+    async def test_large_polygons_are_subdivided(self, db_session: AsyncSession):
+        # A detailed mainland, an island and a lake with an islet
+        mainland = _circle(35, 55, 2, 1000)[:-1] + ', ' + _circle(35, 55, 1, 16)[1:]
+        geometry = f'SRID=4326;MULTIPOLYGON({mainland}, {_circle(40, 55, 0.5, 16)}, {_circle(35, 55, 0.5, 16)})'
+        region = await region_repo.create_one(
+            db_session, name='A', area=1, geopolygon=geometry, geopolygon_str='[]'
+        )
+
+        parts = await region_part_repo.refresh(db_session, max_vertices=64)
+
+        assert parts > 3
+        await uav_flight_repo.create_many(
+            db_session,
+            [
+                {'flight_id': 'mainland', 'takeoff_point': 'SRID=4326;POINT(36.5 55)'},
+                {'flight_id': 'lake', 'takeoff_point': 'SRID=4326;POINT(35.7 55)'},
+                {'flight_id': 'islet', 'takeoff_point': 'SRID=4326;POINT(35 55)'},
+                {'flight_id': 'island', 'takeoff_point': 'SRID=4326;POINT(40 55)'},
+            ],
+        )
+        await uav_flight_repo.assign_regions(db_session)
+        regions = {
+            flight_id: (
+                await uav_flight_repo.get_one(db_session, flight_id=flight_id)
+            ).takeoff_region_id
+            for flight_id in ('mainland', 'lake', 'islet', 'island')
+        }
+        assert regions == {
+            'mainland': region.id,
+            'lake': None,
+            'islet': region.id,
+            'island': region.id,
+        }
@@ -0,0 +1,93 @@
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.models import FileMetadataModel
+from backend.repositories.stats_repository import uav_flight_stats_repo
+from backend.repositories.uav_repository import uav_flight_repo
+
+TZ = 'Europe/Moscow'
+
+
+async def _file(db_session: AsyncSession) -> uuid.UUID:
+    return await db_session.scalar(
+        FileMetadataModel.__table__.insert()
+        .values(filename='f.xlsx', file_size=1, status='queued', message='', sheet_names=[])
+        .returning(FileMetadataModel.file_id)
+    )
+
+
+def _flight(file_id: uuid.UUID, n: int, moment: datetime, uav_type: str, **values) -> dict:
+    return {
+        'flight_id': f'{file_id}-{n}',
+        'file_id': file_id,
+        'date': moment,
+        'uav_type': uav_type,
+        **values,
+    }
+
+
+class TestUavFlightStatsRepository:
+    @pytest.mark.asyncio
+    async def test_merge_file_adds_to_existing_groups(self, db_session: AsyncSession):
+        first, second = await _file(db_session), await _file(db_session)
+        day = datetime(2025, 2, 1, 10, tzinfo=timezone.utc)
+        await uav_flight_repo.create_many(
+            db_session,
+            [
+                _flight(first, 1, day, 'BLA', duration_minutes=10, distance_km=2.0),
+                _flight(first, 2, day, 'BLA', duration_minutes=30),
+                _flight(second, 1, day, 'BLA', duration_minutes=20, distance_km=4.0),
+                _flight(second, 2, day, 'AER'),
+            ],
+        )
+
+        assert await uav_flight_stats_repo.merge_file(db_session, file_id=first, tz=TZ) == 1
+        await uav_flight_stats_repo.merge_file(db_session, file_id=second, tz=TZ)
+
+        rows = await uav_flight_stats_repo.get_stats(db_session, group_by=['day', 'uav_type'])
+        stats = {row['uav_type']: row for row in rows}
+        assert stats['BLA']['day'] == date(2025, 2, 1)
+        assert stats['BLA']['flights'] == 3
+        assert stats['BLA']['duration_total_minutes'] == 60
+        assert float(stats['BLA']['duration_mean_minutes']) == 20
+        assert stats['BLA']['distance_mean_km'] == 3.0
+        assert stats['AER']['flights'] == 1
+        assert stats['AER']['duration_mean_minutes'] is None
+
+    @pytest.mark.asyncio
+    async def test_day_follows_application_timezone(self, db_session: AsyncSession):
+        file_id = await _file(db_session)
+        # 22:30 UTC is already the next day in Moscow
+        late = datetime(2025, 2, 1, 22, 30, tzinfo=timezone.utc)
+        await uav_flight_repo.create_many(db_session, [_flight(file_id, 1, late, 'BLA')])
+
+        await uav_flight_stats_repo.merge_file(db_session, file_id=file_id, tz=TZ)
+
+        rows = await uav_flight_stats_repo.get_stats(db_session, group_by=['day'])
+        assert [row['day'] for row in rows] == [date(2025, 2, 2)]
+
+    @pytest.mark.asyncio
+    async def test_rebuild_and_filters(self, db_session: AsyncSession):
+        file_id = await _file(db_session)
+        await uav_flight_repo.create_many(
+            db_session,
+            [
+                _flight(file_id, 1, datetime(2025, 2, 1, 10, tzinfo=timezone.utc), 'BLA'),
+                _flight(file_id, 2, datetime(2025, 2, 3, 10, tzinfo=timezone.utc), 'BLA'),
+                _flight(file_id, 3, datetime(2025, 2, 3, 11, tzinfo=timezone.utc), 'AER'),
+            ],
+        )
+        await uav_flight_stats_repo.merge_file(db_session, file_id=file_id, tz=TZ)
+
+        # Rebuilding replaces the rollup instead of adding to it
+        assert await uav_flight_stats_repo.rebuild(db_session, tz=TZ) == 3
+
+        [total] = await uav_flight_stats_repo.get_stats(db_session, group_by=[])
+        assert total['flights'] == 3
+        [row] = await uav_flight_stats_repo.get_stats(
+            db_session, group_by=[], date_from=date(2025, 2, 2), uav_type='BLA'
+        )
+        assert row['flights'] == 1
@@ -0,0 +1,249 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database.models import FileMetadataModel, RegionModel, UavFlightModel
+from backend.repositories.region_repository import region_part_repo
+from backend.repositories.uav_repository import region_repo, uav_flight_repo
+
+SQUARE_A = 'SRID=4326;MULTIPOLYGON(((30 50, 40 50, 40 60, 30 60, 30 50)))'
+SQUARE_B = 'SRID=4326;MULTIPOLYGON(((40 50, 50 50, 50 60, 40 60, 40 50)))'
+
+
+def _point(lon: float, lat: float) -> str:
+    return f'SRID=4326;POINT({lon} {lat})'
+
+
+@pytest.fixture()
+async def regions(db_session: AsyncSession) -> tuple[RegionModel, RegionModel]:
+    a = await region_repo.create_one(
+        db_session, name='A', area=1, geopolygon=SQUARE_A, geopolygon_str='[]'
+    )
+    b = await region_repo.create_one(
+        db_session, name='B', area=1, geopolygon=SQUARE_B, geopolygon_str='[]'
+    )
+    await region_part_repo.refresh(db_session, max_vertices=256)
+    return a, b
+
+
+@pytest.fixture()
+async def file_id(db_session: AsyncSession) -> uuid.UUID:
+    file_rec = await db_session.scalar(
+        FileMetadataModel.__table__.insert()
+        .values(filename='f.xlsx', file_size=1, status='queued', message='', sheet_names=[])
+        .returning(FileMetadataModel.file_id)
+    )
+    return file_rec
+
+
+class TestUavFlightRepository:
+    @pytest.mark.asyncio
+    async def test_assign_regions_for_file(self, db_session: AsyncSession, regions, file_id):
+        a, b = regions
+        await uav_flight_repo.create_many(
+            db_session,
+            [
+                {
+                    'flight_id': 'both',
+                    'file_id': file_id,
+                    'takeoff_point': _point(35, 55),
+                    'landing_point': _point(45, 55),
+                },
+                {'flight_id': 'landing-only', 'file_id': file_id, 'landing_point': _point(45, 55)},
+                {'flight_id': 'outside', 'file_id': file_id, 'takeoff_point': _point(0, 0)},
+                {'flight_id': 'other-file', 'takeoff_point': _point(35, 55)},
+            ],
+        )
+
+        processed = await uav_flight_repo.assign_regions(db_session, file_id=file_id)
+        assert processed == 3
+
+        rows = {
+            f.flight_id: (f.takeoff_region_id, f.landing_region_id, f.major_region_id)
+            for f in (await db_session.scalars(select(UavFlightModel))).all()
+        }
+        assert rows['both'] == (a.id, b.id, a.id)
+        assert rows['landing-only'] == (None, b.id, b.id)
+        assert rows['outside'] == (None, None, None)
+        assert rows['other-file'] == (None, None, None)
+
+    @pytest.mark.asyncio
+    async def test_assign_regions_drops_stale(self, db_session: AsyncSession, regions):
+        a, b = regions
+        await uav_flight_repo.create_many(
+            db_session,
+            [
+                {
+                    'flight_id': 'stale',
+                    'takeoff_point': _point(0, 0),
+                    'takeoff_region_id': a.id,
+                    'major_region_id': a.id,
+                }
+            ],
+        )
+        await uav_flight_repo.assign_regions(db_session)
+
+        flight = await uav_flight_repo.get_one(db_session, flight_id='stale')
+        await db_session.refresh(flight)
+        assert (flight.takeoff_region_id, flight.major_region_id) == (None, None)
+
+    @pytest.mark.asyncio
+    async def test_assign_regions_boundary_point(self, db_session: AsyncSession, regions):
+        a, b = regions
+        # On the shared edge of A and B: covered by both, the smaller id wins
+        await uav_flight_repo.create_many(
+            db_session, [{'flight_id': 'edge', 'takeoff_point': _point(40, 55)}]
+        )
+        await uav_flight_repo.assign_regions(db_session)
+
+        flight = await uav_flight_repo.get_one(db_session, flight_id='edge')
+        await db_session.refresh(flight)
+        assert flight.takeoff_region_id == min(a.id, b.id)
+
+    @pytest.mark.asyncio
+    async def test_flights_between_dates_keyset_pages(self, db_session: AsyncSession):
+        base = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        # Pairs of flights share a date so pages have to break ties on id
+        await uav_flight_repo.create_many(
+            db_session,
+            [{'flight_id': f'page-{n}', 'date': base + timedelta(hours=n // 2)} for n in range(7)],
+        )
+        start, end = base, base + timedelta(days=1)
+
+        seen, after = [], None
+        while True:
+            page = await uav_flight_repo.get_flights_between_dates(
+                db_session, start=start, end=end, limit=3, after=after
+            )
+            seen.extend(page)
+            if len(page) < 3:
+                break
+            after = (page[-1].date, page[-1].id)
+
+        expected = await uav_flight_repo.get_flights_between_dates(db_session, start=start, end=end)
+        assert [f.id for f in seen] == [f.id for f in expected]
+        assert len(seen) == 7
+        streamed = [
+            f.id
+            async for f in uav_flight_repo.stream_flights_between_dates(
+                db_session, start=start, end=end, batch_size=2
+            )
+        ]
+        assert streamed == [f.id for f in expected]
+
+
+class TestSearchFlights:
+    @pytest.fixture()
+    async def flights(self, db_session: AsyncSession, regions):
+        a, b = regions
+        base = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        await uav_flight_repo.create_many(
+            db_session,
+            [
+                {
+                    'flight_id': 'a-to-b',
+                    'date': base,
+                    'uav_type': 'BLA',
+                    'takeoff_point': _point(35, 55),
+                    'landing_point': _point(45, 55),
+                    'takeoff_region_id': a.id,
+                    'landing_region_id': b.id,
+                },
+                {
+                    'flight_id': 'in-b',
+                    'date': base + timedelta(hours=1),
+                    'uav_type': 'AER',
+                    'takeoff_point': _point(45, 55),
+                    'landing_point': _point(46, 56),
+                    'takeoff_region_id': b.id,
+                    'landing_region_id': b.id,
+                },
+                {'flight_id': 'outside', 'date': base, 'takeoff_point': _point(0, 0)},
+            ],
+        )
+        return a, b
+
+    async def _search(self, db_session: AsyncSession, **filters) -> list[str]:
+        rows = await uav_flight_repo.search_flights(db_session, limit=10, **filters)
+        return [row.flight_id for row in rows]
+
+    @pytest.mark.asyncio
+    async def test_spatial_filters(self, db_session: AsyncSession, flights):
+        _, b = flights
+        west = (30, 50, 40, 60)
+
+        assert await self._search(db_session, bbox=west) == ['a-to-b']
+        assert await self._search(db_session, bbox=(30, 50, 50, 60)) == ['in-b', 'a-to-b']
+        assert await self._search(db_session, area_wkt='POLYGON((44 54, 47 54, 47 57, 44 54))') == [
+            'in-b'
+        ]
+        assert await self._search(db_session, point='landing', region_id=b.id) == ['in-b', 'a-to-b']
+        assert await self._search(db_session, point='any', bbox=west) == ['a-to-b']
+        assert await self._search(db_session, point='landing', bbox=west) == []
+
+    @pytest.mark.asyncio
+    async def test_attribute_filters_and_pages(self, db_session: AsyncSession, flights):
+        assert await self._search(db_session, bbox=(30, 50, 50, 60), uav_type='AER') == ['in-b']
+
+        [first] = await uav_flight_repo.search_flights(db_session, limit=1, bbox=(30, 50, 50, 60))
+        rest = await self._search(db_session, bbox=(30, 50, 50, 60), after=(first.date, first.id))
+        assert (first.flight_id, rest) == ('in-b', ['a-to-b'])
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'filters, index',
+        [
+            ({'bbox': (30, 50, 40, 60)}, 'idx_uav_flights_takeoff_point'),
+            ({'point': 'landing', 'bbox': (30, 50, 40, 60)}, 'idx_uav_flights_landing_point'),
+            (
+                {'area_wkt': 'POLYGON((30 50, 40 50, 40 60, 30 50))'},
+                'idx_uav_flights_takeoff_point',
+            ),
+        ],
+    )
+    async def test_query_plan_uses_gist_index(
+        self, db_session: AsyncSession, flights, filters, index
+    ):
+        # On a handful of rows a sequential scan is always cheapest
+        await db_session.execute(text('SET LOCAL enable_seqscan = off'))
+        query = uav_flight_repo._search_flights_query(**filters).limit(10)
+        sql = query.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True})
+
+        plan = await db_session.scalar(text(f'EXPLAIN (FORMAT JSON) {sql}'))
+
+        assert index in str(plan)
+
+
+class TestFlightDensity:
+    @pytest.mark.asyncio
+    async def test_density_grid_and_tile(self, db_session: AsyncSession):
+        base = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        await uav_flight_repo.create_many(
+            db_session,
+            [
+                {'flight_id': 'c1', 'date': base, 'takeoff_point': _point(37.2, 55.2)},
+                {'flight_id': 'c2', 'date': base, 'takeoff_point': _point(37.8, 55.8)},
+                {'flight_id': 'c3', 'date': base, 'takeoff_point': _point(38.2, 55.2)},
+                {
+                    'flight_id': 'late',
+                    'date': base + timedelta(days=2),
+                    'takeoff_point': _point(38.2, 55.2),
+                },
+            ],
+        )
+
+        rows = await uav_flight_repo.get_density_grid(
+            db_session, cell_size=1.0, bbox=(30, 50, 40, 60), end=base + timedelta(days=1)
+        )
+
+        assert sorted(tuple(row) for row in rows) == [(37.5, 55.5, 2), (38.5, 55.5, 1)]
+
+        # z=4 tile 9/5 covers Moscow
+        tile = await uav_flight_repo.get_density_tile(db_session, z=4, x=9, y=5, cells=256)
+        empty = await uav_flight_repo.get_density_tile(db_session, z=4, x=0, y=0, cells=256)
+        assert b'flights' in tile
+        assert empty == b''
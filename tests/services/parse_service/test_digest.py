@@ -0,0 +1,67 @@
+import zipfile
+from pathlib import Path
+
+import openpyxl
+
+from backend.services.parse_service.digest import _sheet_hash, sheet_hashes
+
+DATASET = Path(__file__).parents[2] / 'assets' / 'test_dataset.xlsx'
+
+
+def _workbook(path: Path, sheets: dict[str, list[tuple]]) -> Path:
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for name, rows in sheets.items():
+        sheet = workbook.create_sheet(name)
+        for row in rows:
+            sheet.append(row)
+    workbook.save(path)
+    return path
+
+
+class TestSheetHashes:
+    def test_dataset(self):
+        hashes = sheet_hashes(DATASET)
+
+        assert list(hashes) == ['Result_1', 'Лист1']
+        assert all(len(digest) == 64 for digest in hashes.values())
+        assert hashes == sheet_hashes(DATASET)
+
+    def test_follows_cell_values(self, tmp_path: Path):
+        first = _workbook(
+            tmp_path / 'a.xlsx',
+            {'Flights': [('flight_id', 'operator'), ('F1', 'Иванов')], 'Other': [('x', 1)]},
+        )
+        # A new string in the first sheet shifts the shared-string indices of the second
+        second = _workbook(
+            tmp_path / 'b.xlsx',
+            {
+                'Flights': [('flight_id', 'operator'), ('F0', 'Петров'), ('F1', 'Иванов')],
+                'Other': [('x', 1)],
+            },
+        )
+        renamed = _workbook(
+            tmp_path / 'c.xlsx',
+            {'Flights': [('flight_id', 'operator'), ('F1', 'Иванов')], 'Other': [('y', 1)]},
+        )
+
+        a, b, c = sheet_hashes(first), sheet_hashes(second), sheet_hashes(renamed)
+
+        assert a['Other'] == b['Other']
+        assert a['Flights'] != b['Flights']
+        assert a['Flights'] == c['Flights']
+        assert a['Other'] != c['Other']
+
+    def test_unresolved_shared_string_has_no_hash(self):
+        assert _sheet_hash(b'<c r="A1" t="s"><v>0</v></c>', [b'<t>a</t></si>']) is not None
+        assert _sheet_hash(b'<c r="A1" t="s"><v>1</v></c>', [b'<t>a</t></si>']) is None
+        assert _sheet_hash(b'<c r="A1" t="s"><x:v>0</x:v></c>', [b'<t>a</t></si>']) is None
+
+    def test_not_a_workbook(self, tmp_path: Path):
+        path = tmp_path / 'old.xls'
+        path.write_bytes(b'\xd0\xcf\x11\xe0 not a zip')
+        assert sheet_hashes(path) == {}
+
+        with zipfile.ZipFile(tmp_path / 'empty.xlsx', 'w') as archive:
+            archive.writestr('[Content_Types].xml', '')
+        assert sheet_hashes(tmp_path / 'empty.xlsx') == {}
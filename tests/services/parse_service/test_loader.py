@@ -0,0 +1,66 @@
+import hashlib
+import io
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from backend.services.exceptions import FileTooLargeError
+from backend.services.parse_service.loader import StreamingExcelLoader, spool_to_tempfile
+
+DATASET = Path(__file__).parents[2] / 'assets' / 'test_dataset.xlsx'
+
+
+class _AsyncBytes:
+    def __init__(self, data: bytes):
+        self._buf = io.BytesIO(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self._buf.read(size)
+
+
+class TestStreamingExcelLoader:
+    def test_chunks_match_read_excel(self):
+        expected = pd.read_excel(DATASET, sheet_name=0, engine='openpyxl')
+
+        with StreamingExcelLoader(DATASET, chunk_rows=5000) as loader:
+            assert loader.sheet_names == ['Result_1', 'Лист1']
+            chunks = list(loader.iter_chunks('Result_1'))
+            empty = list(loader.iter_chunks('Лист1'))
+
+        assert [len(c) for c in chunks] == [5000, 5000, 5000, len(expected) - 15000]
+        assert empty == []
+
+        actual = pd.concat(chunks)
+        assert list(actual.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(
+            actual.fillna(''), expected.fillna(''), check_dtype=False, check_index_type=False
+        )
+
+    def test_load_reads_whole_sheet(self):
+        with StreamingExcelLoader(DATASET, sheet_name=0, chunk_rows=1000) as loader:
+            df = loader.load()
+        assert df.shape == (17027, 4)
+        assert df.index.is_unique
+
+
+class TestSpoolToTempfile:
+    @pytest.mark.asyncio
+    async def test_spools_in_chunks(self):
+        data = DATASET.read_bytes()
+        path, size, sha256 = await spool_to_tempfile(
+            _AsyncBytes(data), max_size=len(data), chunk_size=4096
+        )
+        try:
+            assert size == len(data)
+            assert sha256 == hashlib.sha256(data).hexdigest()
+            assert path.read_bytes() == data
+        finally:
+            path.unlink()
+
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_and_cleans_up(self, tmp_path, monkeypatch):
+        monkeypatch.setattr('tempfile.tempdir', str(tmp_path))
+        with pytest.raises(FileTooLargeError):
+            await spool_to_tempfile(_AsyncBytes(b'x' * 100), max_size=10, chunk_size=8)
+        assert list(tmp_path.iterdir()) == []
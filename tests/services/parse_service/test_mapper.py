@@ -0,0 +1,95 @@
+import math
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from backend.dto import UavFlightCreateDTO
+from backend.services.parse_service.geocoder import DefaultGeocoder
+from backend.services.parse_service.mapper import DefaultMapper, VectorizedMapper
+from backend.services.parse_service.party_classifier import PartyClassifier
+
+DATASET = Path(__file__).parents[2] / 'assets' / 'test_dataset.xlsx'
+
+
+@pytest.fixture(scope='module')
+def dataset() -> pd.DataFrame:
+    return pd.read_excel(DATASET, sheet_name=0, engine='openpyxl')
+
+
+@pytest.fixture()
+def row_mapper() -> DefaultMapper:
+    return DefaultMapper(DefaultGeocoder(), PartyClassifier())
+
+
+@pytest.fixture()
+def batch_mapper() -> VectorizedMapper:
+    return VectorizedMapper(DefaultGeocoder(), PartyClassifier())
+
+
+def _assert_same(expected: dict, actual: dict, idx) -> None:
+    assert expected.keys() == actual.keys()
+    for field, value in expected.items():
+        other = actual[field]
+        if isinstance(value, float):
+            assert other is not None and math.isclose(value, other, rel_tol=1e-12), (idx, field)
+        else:
+            assert value == other, (idx, field, value, other)
+            assert type(value) is type(other), (idx, field, type(value), type(other))
+
+
+class TestVectorizedMapper:
+    def test_matches_map_row_on_dataset(
+        self, dataset: pd.DataFrame, row_mapper: DefaultMapper, batch_mapper: VectorizedMapper
+    ):
+        records = list(batch_mapper.iter_records(batch_mapper.map_frame(dataset)))
+        assert len(records) == len(dataset)
+
+        for (idx, row), record in zip(dataset.iterrows(), records):
+            expected = row_mapper.map_row(row).model_dump()
+            _assert_same(expected, UavFlightCreateDTO(**record).model_dump(), idx)
+
+    def test_missing_columns_and_values(
+        self, row_mapper: DefaultMapper, batch_mapper: VectorizedMapper
+    ):
+        df = pd.DataFrame(
+            {
+                'Центр ЕС ОрВД': ['Московский', 'Московский'],
+                'SHR': ['(SHR-ZZZZZ\n-DEP/5957N02905E OPR/ООО РОМАШКА TYP/BLA', ''],
+                'DEP': ['-SID 42\n-ADD 250201\n-ATD 2330\n-ADEPZ 5957N02905E', None],
+            }
+        )
+        dtos = batch_mapper.map_dtos(df)
+
+        for (idx, row), dto in zip(df.iterrows(), dtos):
+            _assert_same(row_mapper.map_row(row).model_dump(), dto.model_dump(), idx)
+        assert dtos[0].operator_type == 'legal_entity'
+        assert dtos[1].flight_id == ''
+        assert dtos[1].uav_type == 'UNKNOWN'
+        assert dtos[1].date is None
+
+    def test_duration_wraps_over_midnight(self, batch_mapper: VectorizedMapper):
+        df = pd.DataFrame(
+            {
+                'SHR': ['TYP/BLA'],
+                'DEP': ['-ADD 250201\n-ATD 2330\n-ADEPZ 5957N02905E'],
+                'ARR': ['-ATA 0030\n-ADARRZ 6000N03000E'],
+            }
+        )
+        (dto,) = batch_mapper.map_dtos(df)
+        assert dto.duration_minutes == 60
+        assert dto.distance_km is not None and dto.distance_km > 0
+        assert dto.average_speed_kmh == pytest.approx(dto.distance_km)
+
+    def test_iter_records_datetimes(self, batch_mapper: VectorizedMapper):
+        dates = pd.Series(
+            [datetime(2025, 2, 1, tzinfo=timezone.utc), None], dtype='datetime64[ns, UTC]'
+        )
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', FutureWarning)
+            records = list(batch_mapper.iter_records(pd.DataFrame({'date': dates})))
+
+        assert records == [{'date': datetime(2025, 2, 1, tzinfo=timezone.utc)}, {'date': None}]
+        assert type(records[0]['date']) is datetime
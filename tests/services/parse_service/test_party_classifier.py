@@ -0,0 +1,51 @@
+from backend.services.parse_service.party_classifier import (
+    PartyClassification,
+    PartyClassifier,
+)
+
+
+class TestPartyClassifierCache:
+    def test_repeated_operator_is_served_from_cache(self):
+        classifier = PartyClassifier()
+
+        first = classifier.classify('ООО ВЕКТОР')
+        second = classifier.classify('ООО ВЕКТОР')
+
+        assert first.category == 'legal_entity'
+        assert second is first
+        info = classifier.cache_info()
+        assert (info.hits, info.misses, info.size) == (1, 1, 1)
+
+    def test_lru_eviction(self):
+        classifier = PartyClassifier(cache_size=2)
+
+        classifier.classify('ООО А')
+        classifier.classify('ООО Б')
+        classifier.classify('ООО А')
+        classifier.classify('ООО В')
+        classifier.classify('ООО А')
+        classifier.classify('ООО Б')
+
+        info = classifier.cache_info()
+        assert info.size == 2
+        assert (info.hits, info.misses) == (2, 4)
+
+    def test_disabled_cache_matches_cached_results(self):
+        cached, uncached = PartyClassifier(), PartyClassifier(cache_size=0)
+        names = ['ИП ПЕТРОВ', 'Иванов Иван Иванович', 'John Smith', 'банк', '', None]
+
+        for name in names + names:
+            assert cached.classify(name) == uncached.classify(name)
+        assert uncached.cache_info().size == 0
+        assert uncached.pop_new() == {}
+
+    def test_seed_and_pop_new(self):
+        classifier = PartyClassifier()
+        stored = PartyClassification('legal_entity', 0.98, 'ООО СТАРЫЙ')
+        classifier.seed([('ООО СТАРЫЙ', stored)])
+
+        assert classifier.classify('ООО СТАРЫЙ') is stored
+        classifier.classify('ООО НОВЫЙ')
+
+        assert list(classifier.pop_new()) == ['ООО НОВЫЙ']
+        assert classifier.pop_new() == {}
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from backend.services.exceptions import FileProcessError
+from backend.services.parse_service.geocoder import DefaultGeocoder
+from backend.services.parse_service.loader import StreamingExcelLoader
+from backend.services.parse_service.mapper import VectorizedMapper
+from backend.services.parse_service.party_classifier import PartyClassifier
+from backend.services.parse_service.pool import ParsePool
+
+DATASET = Path(__file__).parents[2] / 'assets' / 'test_dataset.xlsx'
+
+
+@pytest.fixture(scope='module')
+def pool():
+    pool = ParsePool(workers=2, queue_size=2)
+    yield pool
+    pool.stop()
+
+
+class TestParsePool:
+    @pytest.mark.asyncio
+    async def test_matches_inline_mapping(self, pool: ParsePool):
+        mapper = VectorizedMapper(DefaultGeocoder(), PartyClassifier())
+        with StreamingExcelLoader(DATASET, chunk_rows=5000) as loader:
+            sheet_names = loader.sheet_names
+            expected = pd.concat(
+                [
+                    mapper.map_frame(chunk)
+                    for name in sheet_names
+                    for chunk in loader.iter_chunks(name)
+                ]
+            )
+
+        classifier = PartyClassifier()
+        chunks = [
+            chunk
+            async for chunk in pool.iter_chunks(
+                DATASET, sheet_names, chunk_rows=5000, classifier=classifier
+            )
+        ]
+
+        assert {chunk.sheet_name for chunk in chunks} == {'Result_1'}
+        actual = pd.concat([chunk.frame for chunk in chunks]).sort_index()
+        pd.testing.assert_frame_equal(actual, expected.sort_index())
+        assert set(classifier.pop_new()) == set(expected['operator_name'].fillna(''))
+
+    @pytest.mark.asyncio
+    async def test_sheet_error_is_reported(self, pool: ParsePool):
+        with pytest.raises(FileProcessError, match='missing'):
+            async for _ in pool.iter_chunks(
+                DATASET, ['missing'], chunk_rows=5000, classifier=PartyClassifier()
+            ):
+                pass
@@ -0,0 +1,93 @@
+import math
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.dto import UavFlightCreateDTO
+from backend.services.parse_service.geocoder import DefaultGeocoder
+from backend.services.parse_service.mapper import VectorizedMapper
+from backend.services.parse_service.party_classifier import PartyClassifier
+from backend.services.parse_service.records import FLIGHT_COLUMNS, flight_records
+
+DATASET = Path(__file__).parents[2] / 'assets' / 'test_dataset.xlsx'
+FILE_ID = '1b4e28ba-2fa1-11d2-883f-0016d3cca427'
+
+
+@pytest.fixture(scope='module')
+def mapped() -> pd.DataFrame:
+    frame = VectorizedMapper(DefaultGeocoder(), PartyClassifier()).map_frame(
+        pd.read_excel(DATASET, sheet_name=0, engine='openpyxl')
+    )
+    frame['takeoff_region_id'] = pd.Series(np.arange(len(frame)), dtype='Int64').mask(
+        frame['takeoff_lat'].isna().to_numpy()
+    )
+    return frame
+
+
+class TestFlightRecords:
+    def test_columns_match_dto(self):
+        assert set(FLIGHT_COLUMNS) | {'file_id'} == set(UavFlightCreateDTO.model_fields)
+
+    def test_same_values_as_dto(self, mapped: pd.DataFrame):
+        records = flight_records(mapped, file_id=FILE_ID)
+
+        assert len(records) == len(mapped)
+        for record, row in zip(records.as_dicts(), VectorizedMapper.iter_records(mapped)):
+            expected = UavFlightCreateDTO(**{**row, 'file_id': FILE_ID}).model_dump()
+            assert record.keys() == expected.keys()
+            for field, value in expected.items():
+                actual = record[field]
+                if isinstance(value, float):
+                    assert math.isclose(value, actual, rel_tol=1e-12), field
+                else:
+                    assert value == actual, (field, value, actual)
+                    assert type(value) is type(actual), (field, type(value), type(actual))
+
+    def test_coercions(self):
+        frame = pd.DataFrame(
+            {
+                'flight_id': ['a', None],
+                'takeoff_lat': ['55.5', None],
+                'duration_minutes': [3.0, np.nan],
+                'date': ['2025-02-01T10:00:00+03:00', None],
+            }
+        )
+
+        records = flight_records(frame)
+
+        assert records.columns == (
+            'file_id',
+            'flight_id',
+            'takeoff_lat',
+            'date',
+            'duration_minutes',
+        )
+        first, second = records.rows
+        assert first[:3] == (None, 'a', 55.5)
+        assert first[3].isoformat() == '2025-02-01T10:00:00+03:00'
+        assert first[4] == 3 and type(first[4]) is int
+        assert second == (None, None, None, None, None)
+
+    @pytest.mark.parametrize(
+        'column, values',
+        [
+            ('duration_minutes', [1.5]),
+            ('takeoff_lat', ['north']),
+        ],
+    )
+    def test_invalid_column(self, column, values):
+        with pytest.raises(ValueError, match=f'Invalid column {column}'):
+            flight_records(pd.DataFrame({column: values}))
+
+    def test_text_column_coerces_numbers(self):
+        records = flight_records(pd.DataFrame({'city': ['Москва', 5, None]}))
+
+        assert [row[1] for row in records.rows] == ['Москва', '5', None]
+
+    def test_empty_frame(self, mapped: pd.DataFrame):
+        records = flight_records(mapped.iloc[:0], file_id=uuid.uuid4())
+
+        assert records.rows == []
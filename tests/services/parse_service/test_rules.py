@@ -0,0 +1,49 @@
+from backend.services.parse_service.rules import tokenize_aftn, tokenize_shr
+
+DEP = '-TITLE IDEP\n-SID 7772187998\n-ADD 250201\n-ATD 0705\n-ADEP ZZZZ\n-ADEPZ 5957N02905E\n-PAP 0'
+
+SHR = (
+    '(SHR-ZZZZZ\n-ZZZZ0705\n-M0000/M0005 /ZONA R0,5 5957N02905E/\n-ZZZZ0800\n'
+    '-DEP/5957N02905E DEST/5957N02905E DOF/250201 OPR/ООО ВЕКТОР\n'
+    'REG/0267J81 TYP/BLA RMK/WR655 ТЕЛ 89999999999 SID/7772187998)'
+)
+
+
+class TestTokenizeAftn:
+    def test_fields(self):
+        fields = tokenize_aftn(DEP)
+
+        assert fields['TITLE'] == 'IDEP'
+        assert fields['SID'] == '7772187998'
+        assert fields['ADEPZ'] == '5957N02905E'
+        assert fields['PAP'] == '0'
+
+    def test_value_spans_continuation_lines(self):
+        fields = tokenize_aftn('-ADEPZ\n5957N02905E\n-ATD 0705')
+
+        assert fields['ADEPZ'] == '\n5957N02905E'
+        assert fields['ATD'] == '0705'
+
+    def test_first_occurrence_wins(self):
+        assert tokenize_aftn('-ATD 0705\n-ATD 0900') == {'ATD': '0705'}
+
+    def test_empty(self):
+        assert tokenize_aftn('') == {}
+
+
+class TestTokenizeShr:
+    def test_fields(self):
+        fields = tokenize_shr(SHR)
+
+        assert fields['OPR'] == 'ООО ВЕКТОР\n'
+        assert fields['TYP'] == 'BLA '
+        assert fields['DOF'] == '250201 '
+        assert fields['SID'] == '7772187998)'
+
+    def test_key_needs_word_boundary(self):
+        fields = tokenize_shr('OPR/ИП ABCDE/X TYP/BLA')
+
+        assert fields == {'OPR': 'ИП ABCDE/X ', 'TYP': 'BLA'}
+
+    def test_no_keys(self):
+        assert tokenize_shr('free text / without keys') == {}
@@ -0,0 +1,77 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.services import date_bounds_cache as module
+from backend.services.date_bounds_cache import DateBoundsCache
+
+BOUNDS = (datetime(2025, 1, 1, tzinfo=timezone.utc), datetime(2025, 2, 1, tzinfo=timezone.utc))
+
+
+@pytest.fixture()
+def loads(monkeypatch) -> list[int]:
+    calls: list[int] = []
+
+    async def fake_get_date_bounds(db_session):
+        calls.append(1)
+        return BOUNDS
+
+    monkeypatch.setattr(module.uav_flight_repo, 'get_date_bounds', fake_get_date_bounds)
+    return calls
+
+
+class TestDateBoundsCache:
+    @pytest.mark.asyncio
+    async def test_cached_until_invalidated(self, loads):
+        cache = DateBoundsCache(ttl=60)
+
+        assert await cache.get(None) == BOUNDS
+        assert await cache.get(None) == BOUNDS
+        assert len(loads) == 1
+
+        cache.invalidate()
+        assert await cache.get(None) == BOUNDS
+        assert len(loads) == 2
+
+    @pytest.mark.asyncio
+    async def test_expires_after_ttl(self, loads, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(module.time, 'monotonic', lambda: now[0])
+        cache = DateBoundsCache(ttl=60)
+
+        await cache.get(None)
+        now[0] += 59
+        await cache.get(None)
+        now[0] += 2
+        await cache.get(None)
+
+        assert len(loads) == 2
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_disables_cache(self, loads):
+        cache = DateBoundsCache(ttl=0)
+
+        await cache.get(None)
+        await cache.get(None)
+
+        assert len(loads) == 2
+
+    @pytest.mark.asyncio
+    async def test_load_racing_invalidate_is_not_cached(self, monkeypatch):
+        cache = DateBoundsCache(ttl=60)
+        calls = []
+
+        async def slow_get_date_bounds(db_session):
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return BOUNDS
+
+        monkeypatch.setattr(module.uav_flight_repo, 'get_date_bounds', slow_get_date_bounds)
+        pending = asyncio.create_task(cache.get(None))
+        await asyncio.sleep(0)
+        cache.invalidate()
+
+        assert await pending == BOUNDS
+        await cache.get(None)
+        assert len(calls) == 2
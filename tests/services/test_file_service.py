@@ -0,0 +1,118 @@
+import uuid
+
+import pytest
+
+from backend.database.models import FileMetadataModel
+from backend.services import file_service
+from backend.services.file_service import (
+    fail_unfinished_files,
+    find_processed_file,
+    unchanged_sheets,
+)
+
+
+class _Repo:
+    def __init__(self, files: list[FileMetadataModel]):
+        self.files = files
+        self.filters: list[dict] = []
+
+    async def get_all(self, db_session, **filters):
+        self.filters.append(filters)
+        return [fm for fm in self.files if all(getattr(fm, k) == v for k, v in filters.items())]
+
+    async def update_by_status(self, db_session, statuses, **values):
+        updated = []
+        for fm in self.files:
+            if fm.status in statuses:
+                for key, value in values.items():
+                    setattr(fm, key, value)
+                updated.append(str(fm.file_id))
+        return updated
+
+
+def _file(sheet_hashes: dict | None, **fields) -> FileMetadataModel:
+    values = {
+        'file_id': uuid.uuid4(),
+        'filename': 'journal.xlsx',
+        'status': 'processed',
+        'is_active': True,
+        'content_sha256': 'abc',
+        **fields,
+    }
+    return FileMetadataModel(sheet_hashes=sheet_hashes, **values)
+
+
+class TestFindProcessedFile:
+    @pytest.mark.asyncio
+    async def test_matches_active_processed_content(self, monkeypatch):
+        processed = _file({})
+        repo = _Repo([_file({}, status='failed'), processed])
+        monkeypatch.setattr(file_service, 'file_metadata_repo', repo)
+
+        found = await find_processed_file(None, filename='journal.xlsx', content_sha256='abc')
+        missing = await find_processed_file(None, filename='journal.xlsx', content_sha256='def')
+
+        assert found is processed
+        assert missing is None
+
+
+class TestUnchangedSheets:
+    @pytest.mark.asyncio
+    async def test_compares_with_active_processed_version(self, monkeypatch):
+        new_id = str(uuid.uuid4())
+        repo = _Repo(
+            [
+                _file({'Feb': 'h2', 'Mar': 'h3', 'Empty': None}),
+                _file({'Jan': 'h1'}, is_active=False),
+                _file({'Apr': 'h4'}, status='processing'),
+                _file({'May': 'h5'}, file_id=uuid.UUID(new_id)),
+            ]
+        )
+        monkeypatch.setattr(file_service, 'file_metadata_repo', repo)
+
+        skip = await unchanged_sheets(
+            None,
+            filename='journal.xlsx',
+            file_id=new_id,
+            sheet_hashes={
+                'Jan': 'h1',
+                'Feb': 'h2',
+                'Mar': 'changed',
+                'Apr': 'h4',
+                'May': 'h5',
+                'Empty': None,
+            },
+        )
+
+        assert skip == {'Feb'}
+
+    @pytest.mark.asyncio
+    async def test_without_hashes_nothing_is_skipped(self, monkeypatch):
+        repo = _Repo([_file({'Feb': 'h2'})])
+        monkeypatch.setattr(file_service, 'file_metadata_repo', repo)
+
+        assert (
+            await unchanged_sheets(None, filename='journal.xlsx', file_id='x', sheet_hashes={})
+            == set()
+        )
+        assert repo.filters == []
+
+
+class TestFailUnfinishedFiles:
+    @pytest.mark.asyncio
+    async def test_fails_queued_and_processing(self, monkeypatch):
+        queued, processing, processed = (
+            _file({}, status='queued'),
+            _file({}, status='processing'),
+            _file({}),
+        )
+        monkeypatch.setattr(
+            file_service, 'file_metadata_repo', _Repo([queued, processing, processed])
+        )
+
+        failed = await fail_unfinished_files(None, message='Interrupted', error='restart')
+
+        assert failed == [str(queued.file_id), str(processing.file_id)]
+        assert (queued.status, queued.message, queued.error) == ('failed', 'Interrupted', 'restart')
+        assert processing.status == 'failed'
+        assert processed.status == 'processed'
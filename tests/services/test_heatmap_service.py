@@ -0,0 +1,103 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services import heatmap_service as module
+from backend.services.heatmap_service import (
+    aggregate_etag,
+    get_flight_heatmap,
+    get_flight_tile,
+    grid_cell_size,
+    tile_key,
+)
+from backend.services.tile_cache import TileCache
+
+
+@pytest.fixture()
+def cache(monkeypatch) -> TileCache:
+    cache = TileCache(max_entries=16, ttl=60)
+    monkeypatch.setattr(module, 'tile_cache', cache)
+    return cache
+
+
+@pytest.fixture()
+def renders(monkeypatch) -> list[dict]:
+    calls: list[dict] = []
+
+    async def fake_grid(db_session, **kwargs):
+        calls.append(kwargs)
+        return [SimpleNamespace(lon=37.5, lat=55.5, flights=3)]
+
+    async def fake_tile(db_session, **kwargs):
+        calls.append(kwargs)
+        return b'tile'
+
+    monkeypatch.setattr(module.uav_flight_repo, 'get_density_grid', fake_grid)
+    monkeypatch.setattr(module.uav_flight_repo, 'get_density_tile', fake_tile)
+    return calls
+
+
+class TestFlightHeatmap:
+    def test_cell_size_halves_per_zoom(self):
+        assert grid_cell_size(1) == 2 * grid_cell_size(2)
+
+    @pytest.mark.asyncio
+    async def test_cached_per_data_version(self, cache, renders):
+        first = await get_flight_heatmap(None, zoom=6, bbox=('30', '50', '40', '60'))
+        second = await get_flight_heatmap(None, zoom=6, bbox=(30, 50, 40, 60))
+
+        assert first.content['cells'] == [(37.5, 55.5, 3)]
+        assert second.version == first.version
+        assert len(renders) == 1
+
+        cache.invalidate()
+        third = await get_flight_heatmap(None, zoom=6, bbox=(30, 50, 40, 60))
+
+        assert third.version != first.version
+        assert len(renders) == 2
+
+    @pytest.mark.asyncio
+    async def test_etag_follows_request(self, cache, renders):
+        world = await get_flight_heatmap(None, zoom=2)
+        area = await get_flight_heatmap(None, zoom=6, bbox=(30, 50, 40, 60))
+
+        assert world.version == area.version
+        assert world.etag != area.etag
+        assert area.etag == aggregate_etag(
+            ('grid', 6, (30.0, 50.0, 40.0, 60.0), None, None), cache.version
+        )
+
+    @pytest.mark.asyncio
+    async def test_time_window_is_part_of_key(self, cache, renders):
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        await get_flight_heatmap(None, zoom=2)
+        await get_flight_heatmap(None, zoom=2, start=start)
+
+        assert len(renders) == 2
+        assert renders[1]['start'] == start
+
+    @pytest.mark.asyncio
+    async def test_too_many_cells(self, cache, renders):
+        with pytest.raises(ValueError, match='narrow the bbox'):
+            await get_flight_heatmap(None, zoom=8)
+        assert renders == []
+
+
+class TestFlightTile:
+    @pytest.mark.asyncio
+    async def test_cached(self, cache, renders):
+        assert (await get_flight_tile(None, z=3, x=4, y=2)).content == b'tile'
+        assert (await get_flight_tile(None, z=3, x=4, y=2)).content == b'tile'
+        assert len(renders) == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('z, x, y', [(1, 2, 0), (1, 0, -1), (21, 0, 0)])
+    async def test_invalid_tile(self, cache, renders, z, x, y):
+        with pytest.raises(ValueError):
+            await get_flight_tile(None, z=z, x=x, y=y)
+
+    def test_key_validates_request(self):
+        assert tile_key(z=3, x=4, y=2) == ('mvt', 3, 4, 2, None, None)
+        with pytest.raises(ValueError):
+            tile_key(z=1, x=2, y=0)
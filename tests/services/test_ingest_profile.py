@@ -0,0 +1,45 @@
+import json
+
+from backend.services import ingest_profile as module
+from backend.services.ingest_profile import IngestProfile
+
+
+class TestIngestProfile:
+    def test_sheets_stages_and_steps(self):
+        profile = IngestProfile()
+        with profile.run():
+            profile.add('Sheet1', 100, load=1.0, insert=0.5)
+            profile.add('Sheet1', 50, load=0.5, insert=0.25)
+            profile.add('Sheet2', 10, load=0.125)
+            with profile.step('stats'):
+                pass
+
+        report = profile.as_dict()
+
+        assert report['stages'] == {'load': 1.625, 'insert': 0.75}
+        assert report['sheets'] == {
+            'Sheet1': {'rows': 150, 'stages': {'load': 1.5, 'insert': 0.75}},
+            'Sheet2': {'rows': 10, 'stages': {'load': 0.125}},
+        }
+        assert set(report['steps']) == {'stats'}
+        assert report['wall_seconds'] >= 0
+        assert report['profile'] is None
+        json.dumps(report)
+
+    def test_capture(self):
+        profile = IngestProfile(capture=True)
+        with profile.run():
+            sorted(range(1000), key=str)
+
+        assert 'function calls' in profile.profile
+        assert not module._profiling
+
+    def test_one_capture_at_a_time(self):
+        outer = IngestProfile(capture=True)
+        inner = IngestProfile(capture=True)
+        with outer.run():
+            with inner.run():
+                pass
+
+        assert inner.profile is None
+        assert outer.profile is not None
@@ -0,0 +1,84 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from backend.services import ingest_service
+from backend.services.exceptions import IngestQueueFullError
+from backend.services.ingest_service import IngestJob, IngestQueue
+
+
+def _job(n: int) -> IngestJob:
+    return IngestJob(
+        file_id=f'file-{n}', filename='journal.xlsx', path=Path(f'/nonexistent/upload-{n}.xlsx')
+    )
+
+
+class TestIngestQueue:
+    @pytest.mark.asyncio
+    async def test_submit_requires_running_queue(self):
+        queue = IngestQueue(maxsize=1, workers=1)
+        with pytest.raises(IngestQueueFullError):
+            queue.submit(_job(0))
+
+    @pytest.mark.asyncio
+    async def test_workers_drain_jobs_with_bounded_concurrency(self, monkeypatch):
+        running, peak, done = 0, 0, []
+
+        async def fake_run(job: IngestJob) -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            done.append(job.file_id)
+
+        monkeypatch.setattr(ingest_service, 'run_ingest_job', fake_run)
+        queue = IngestQueue(maxsize=10, workers=2)
+        await queue.start()
+        try:
+            for n in range(6):
+                queue.submit(_job(n))
+            await asyncio.wait_for(queue._queue.join(), timeout=5)
+        finally:
+            await queue.stop()
+
+        assert sorted(done) == [f'file-{n}' for n in range(6)]
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_submit_rejects_when_full(self, monkeypatch):
+        release = asyncio.Event()
+
+        async def blocked_run(job: IngestJob) -> None:
+            await release.wait()
+
+        monkeypatch.setattr(ingest_service, 'run_ingest_job', blocked_run)
+        queue = IngestQueue(maxsize=1, workers=1)
+        await queue.start()
+        try:
+            queue.submit(_job(0))
+            await asyncio.sleep(0)
+            queue.submit(_job(1))
+            assert queue.full()
+            with pytest.raises(IngestQueueFullError):
+                queue.submit(_job(2))
+        finally:
+            release.set()
+            await queue.stop()
+
+
+class TestIterFrames:
+    @pytest.mark.asyncio
+    async def test_skipped_sheets_are_not_read(self, monkeypatch):
+        monkeypatch.setattr(ingest_service.application_settings, 'APP_PARSE_WORKERS', 0)
+        dataset = Path(__file__).parents[1] / 'assets' / 'test_dataset.xlsx'
+
+        chunks = [
+            chunk
+            async for chunk in ingest_service._iter_frames(
+                dataset, ingest_service.party_classifier, skip_sheets={'Result_1'}
+            )
+        ]
+
+        assert chunks == []
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import MultiPolygon, box
+
+from backend.services.region_index import NO_REGION, RegionIndex
+
+
+@pytest.fixture()
+def index() -> RegionIndex:
+    idx = RegionIndex()
+    idx.build(
+        [10, 20, 30],
+        [
+            box(30, 50, 40, 60),
+            box(40, 50, 50, 60),
+            MultiPolygon([box(0, 0, 1, 1), box(2, 2, 3, 3)]),
+        ],
+    )
+    return idx
+
+
+class TestRegionIndex:
+    def test_resolve_points(self, index: RegionIndex):
+        lats = np.array([55, 55, 0.5, 2.5, 70, np.nan])
+        lons = np.array([35, 45, 0.5, 2.5, 35, 35])
+        assert index.resolve(lats, lons).tolist() == [10, 20, 30, 30, NO_REGION, NO_REGION]
+
+    def test_boundary_point_goes_to_smallest_id(self):
+        idx = RegionIndex()
+        idx.build([20, 10], [box(40, 50, 50, 60), box(30, 50, 40, 60)])
+        lats = np.array([55.0, 50.0, 60.0])
+        lons = np.array([40.0, 45.0, 50.0])
+        assert idx.resolve(lats, lons).tolist() == [10, 20, 20]
+
+    def test_unloaded_index_resolves_nothing(self):
+        idx = RegionIndex()
+        assert not idx.loaded
+        assert idx.resolve(np.array([55.0]), np.array([35.0])).tolist() == [NO_REGION]
+
+    def test_fill_frame(self, index: RegionIndex):
+        frame = pd.DataFrame(
+            {
+                'takeoff_lat': [55.0, np.nan, 70.0],
+                'takeoff_lon': [35.0, np.nan, 35.0],
+                'landing_lat': [55.0, 55.0, np.nan],
+                'landing_lon': [45.0, 45.0, np.nan],
+                'takeoff_region_id': None,
+                'landing_region_id': None,
+                'major_region_id': None,
+            },
+            index=[5, 6, 7],
+        )
+        index.fill_frame(frame)
+        assert frame['takeoff_region_id'].tolist() == [10, pd.NA, pd.NA]
+        assert frame['landing_region_id'].tolist() == [20, 20, pd.NA]
+        assert frame['major_region_id'].tolist() == [10, 20, pd.NA]
+
+    def test_invalidate(self, index: RegionIndex):
+        index.invalidate()
+        assert not index.loaded
+
+    @pytest.mark.asyncio
+    async def test_rebuilt_when_regions_change(self, monkeypatch):
+        idx = RegionIndex()
+        versions = [(1, 'v1'), (1, 'v1'), (2, 'v2')]
+        loads = []
+
+        async def read_version(db_session):
+            return versions.pop(0)
+
+        async def read_regions(db_session):
+            loads.append(len(loads))
+            return [10 + len(loads)], [box(30, 50, 40, 60)]
+
+        monkeypatch.setattr(idx, '_read_version', read_version)
+        monkeypatch.setattr(idx, '_read_regions', read_regions)
+
+        await idx.ensure_loaded(None)
+        await idx.ensure_loaded(None)
+        assert loads == [0]
+        assert idx.resolve(np.array([55.0]), np.array([35.0])).tolist() == [11]
+
+        await idx.ensure_loaded(None)
+        assert loads == [0, 1]
+        assert idx.resolve(np.array([55.0]), np.array([35.0])).tolist() == [12]
@@ -0,0 +1,136 @@
+import gzip
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services import region_service as module
+from backend.services.region_service import (
+    get_regions_geojson,
+    prepare_regions,
+    rings_to_multipolygon,
+)
+
+SQUARE = '{"type":"Polygon","coordinates":[[[30,50],[40,50],[40,60],[30,60],[30,50]]]}'
+
+
+@pytest.fixture()
+def geometries(monkeypatch) -> dict:
+    state = {'updated_at': datetime(2025, 1, 1, tzinfo=timezone.utc), 'reads': 0}
+
+    async def fake_get_version(db_session, *, lod_m):
+        return 1, state['updated_at']
+
+    async def fake_get_features(db_session, *, lod_m):
+        state['reads'] += 1
+        return [SimpleNamespace(id=7, name='Москва', area=2561, geojson=SQUARE)]
+
+    monkeypatch.setattr(module.region_geometry_repo, 'get_version', fake_get_version)
+    monkeypatch.setattr(module.region_geometry_repo, 'get_features', fake_get_features)
+    monkeypatch.setattr(module, '_geojson_cache', {})
+    return state
+
+
+class TestGetRegionsGeoJSON:
+    @pytest.mark.asyncio
+    async def test_feature_collection(self, geometries):
+        collection = await get_regions_geojson(None, lod_m=10000)
+
+        data = json.loads(collection.body)
+        assert data['type'] == 'FeatureCollection'
+        assert data['features'] == [
+            {
+                'type': 'Feature',
+                'id': 7,
+                'properties': {'name': 'Москва', 'area': 2561},
+                'geometry': json.loads(SQUARE),
+            }
+        ]
+        assert gzip.decompress(collection.gzipped) == collection.body
+
+    @pytest.mark.asyncio
+    async def test_built_once_per_version(self, geometries):
+        first = await get_regions_geojson(None, lod_m=10000)
+        assert await get_regions_geojson(None, lod_m=10000) is first
+        assert geometries['reads'] == 1
+
+        geometries['updated_at'] = datetime(2025, 1, 2, tzinfo=timezone.utc)
+        second = await get_regions_geojson(None, lod_m=10000)
+
+        assert second.version != first.version
+        assert geometries['reads'] == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_lod(self, geometries):
+        with pytest.raises(ValueError, match='lod'):
+            await get_regions_geojson(None, lod_m=123)
+
+
+def _square(x0: float, y0: float, x1: float, y1: float) -> list[tuple[float, float]]:
+    return [(x0, y0), (x1, y0), (x1, y1), (x0, y1), (x0, y0)]
+
+
+class TestRingsToMultipolygon:
+    def test_holes_islands_and_islets(self):
+        geometry = rings_to_multipolygon(
+            [
+                _square(4, 4, 6, 6),  # islet in the lake
+                _square(0, 0, 10, 10),  # mainland
+                _square(20, 20, 21, 21),  # island
+                _square(2, 2, 8, 8),  # lake
+            ]
+        )
+
+        assert geometry.is_valid
+        polygons = sorted(geometry.geoms, key=lambda p: p.area, reverse=True)
+        assert [p.area for p in polygons] == [64, 4, 1]
+        assert [len(p.interiors) for p in polygons] == [1, 0, 0]
+
+    def test_invalid_ring_is_repaired(self):
+        geometry = rings_to_multipolygon([[(0, 0), (1, 1), (1, 0), (0, 1), (0, 0)]])
+
+        assert geometry.is_valid
+        assert geometry.geom_type == 'MultiPolygon'
+        assert len(geometry.geoms) == 2
+
+    def test_degenerate_rings(self):
+        assert rings_to_multipolygon([[(0, 0), (1, 1)]]) is None
+        assert rings_to_multipolygon([]) is None
+
+
+class TestPrepareRegions:
+    def test_rows_and_results(self):
+        rows, results = prepare_regions(
+            {
+                'A': [_square(30, 50, 31, 51), _square(40, 50, 40.1, 50.1)],
+                'B': [[(0, 0), (1, 1)]],
+                'C': [_square(35, 55, 36, 56)],
+            }
+        )
+
+        assert [row['name'] for row in rows] == ['A', 'C']
+        assert [(r.name, r.polygons, r.vertices) for r in results] == [
+            ('A', 2, 10),
+            ('B', 0, 0),
+            ('C', 1, 5),
+        ]
+        assert results[1].error == 'No valid polygons' and results[1].area is None
+        # 1° x 1° at 50°N is about 7 900 km², at 55°N about 7 100 km²
+        assert 7800 < rows[0]['area'] < 8100
+        assert 7000 < rows[1]['area'] < 7300
+        assert rows[0]['area'] == results[0].area
+
+    def test_legacy_string_is_largest_polygon(self):
+        rows, _ = prepare_regions({'A': [_square(40, 50, 40.1, 50.1), _square(30, 50, 31, 51)]})
+
+        outline = json.loads(rows[0]['geopolygon_str'])[0]
+        lats, lons = zip(*outline)
+        assert min(lons) == pytest.approx(30) and max(lons) == pytest.approx(31)
+        assert min(lats) == pytest.approx(50) and max(lats) == pytest.approx(51)
+
+    def test_nothing_to_load(self):
+        rows, results = prepare_regions({'B': []})
+
+        assert rows == []
+        assert results[0].error == 'No valid polygons'
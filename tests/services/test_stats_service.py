@@ -0,0 +1,26 @@
+from datetime import date
+
+import pytest
+
+from backend.schemas.uav_schema import FlightStatsQuery
+from backend.services.stats_service import get_flight_stats
+
+
+class TestGetFlightStats:
+    def test_unknown_dimension_is_rejected(self):
+        with pytest.raises(ValueError):
+            FlightStatsQuery(group_by=['day', 'filename'])
+
+    def test_region_dimension_is_the_major_region(self):
+        # Flights are rolled up by major_region_id: takeoff region, else landing
+        query = FlightStatsQuery(group_by=['major_region_id'], major_region_id=5)
+        assert query.group_by == ['major_region_id']
+        with pytest.raises(ValueError):
+            FlightStatsQuery(group_by=['region_id'])
+
+    @pytest.mark.asyncio
+    async def test_reversed_period_is_rejected(self):
+        query = FlightStatsQuery(date_from=date(2025, 2, 2), date_to=date(2025, 2, 1))
+
+        with pytest.raises(ValueError, match='date_from'):
+            await get_flight_stats(None, query=query)
@@ -0,0 +1,47 @@
+from backend.services import tile_cache as module
+from backend.services.tile_cache import TileCache
+
+
+class TestTileCache:
+    def test_lru_eviction(self):
+        cache = TileCache(max_entries=2, ttl=60)
+        version = cache.version
+        cache.put('a', b'a', version=version)
+        cache.put('b', b'b', version=version)
+
+        assert cache.get('a') == b'a'
+        cache.put('c', b'c', version=version)
+
+        assert (cache.get('a'), cache.get('b'), cache.get('c')) == (b'a', None, b'c')
+
+    def test_invalidate_starts_new_version(self):
+        cache = TileCache(max_entries=8, ttl=60)
+        old = cache.version
+        cache.put('a', b'a', version=old)
+
+        cache.invalidate()
+
+        assert cache.version != old
+        assert cache.get('a') is None
+        # A tile rendered before the invalidation must not be stored
+        cache.put('a', b'stale', version=old)
+        assert len(cache) == 0
+
+    def test_versions_differ_between_instances(self):
+        assert TileCache(max_entries=1, ttl=1).version != TileCache(max_entries=1, ttl=1).version
+
+    def test_expires_after_ttl(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(module.time, 'monotonic', lambda: now[0])
+        cache = TileCache(max_entries=8, ttl=60)
+        cache.put('a', b'a', version=cache.version)
+
+        now[0] += 61
+
+        assert cache.get('a') is None
+
+    def test_disabled(self):
+        cache = TileCache(max_entries=0, ttl=60)
+        cache.put('a', b'a', version=cache.version)
+
+        assert cache.get('a') is None
@@ -0,0 +1,92 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from backend.database.models import UavFlightModel
+from backend.repositories.uav_repository import JOURNAL_COLUMNS
+from backend.schemas.uav_schema import FlightSearchQuery
+from backend.services.uav_service import (
+    _flight_to_dict,
+    decode_flight_cursor,
+    encode_flight_cursor,
+    resolve_flight_search,
+)
+
+
+class TestFlightCursor:
+    def test_round_trip(self):
+        date = datetime(2025, 2, 1, 7, 5, tzinfo=timezone.utc)
+        cursor = encode_flight_cursor(UavFlightModel(id=42, date=date))
+
+        assert '=' not in cursor
+        assert decode_flight_cursor(cursor) == (date, 42)
+
+    @pytest.mark.parametrize('cursor', ['', 'not a cursor', 'bnVsbA', 'WzEsIDJd'])
+    def test_invalid(self, cursor: str):
+        with pytest.raises(ValueError, match='Invalid cursor'):
+            decode_flight_cursor(cursor)
+
+
+class TestFlightToDict:
+    def test_points_from_coordinates(self):
+        file_id = uuid.uuid4()
+        flight = UavFlightModel(
+            id=1,
+            file_id=file_id,
+            takeoff_lat=55.5,
+            takeoff_lon=37.5,
+            latitude=55.5,
+            longitude=37.5,
+            date=datetime(2025, 2, 1, tzinfo=timezone.utc),
+        )
+
+        row = _flight_to_dict(flight)
+
+        assert set(row) - {'takeoff_point', 'landing_point', 'coordinates'} == {
+            c.key for c in JOURNAL_COLUMNS
+        }
+        assert row['file_id'] == str(file_id)
+        assert row['takeoff_point'] == {'type': 'Point', 'coordinates': (37.5, 55.5)}
+        assert row['coordinates'] == row['takeoff_point']
+        assert row['landing_point'] is None
+        assert row['date'] == '2025-02-01T00:00:00+00:00'
+        assert row['landing_datetime'] is None
+
+
+SQUARE = {'type': 'Polygon', 'coordinates': [[[30, 50], [40, 50], [40, 60], [30, 60], [30, 50]]]}
+
+
+class TestResolveFlightSearch:
+    def test_geometries(self):
+        search = resolve_flight_search(
+            FlightSearchQuery(bbox=(30, 50, 40, 60), polygon=SQUARE, point='any')
+        )
+
+        assert search.bbox == (30.0, 50.0, 40.0, 60.0)
+        assert search.area_wkt == 'POLYGON ((30 50, 40 50, 40 60, 30 60, 30 50))'
+        assert search.point == 'any'
+
+    @pytest.mark.parametrize('bbox', [(40, 50, 30, 60), (30, 50, 40, 50), (170, 50, 190, 60)])
+    def test_invalid_bbox(self, bbox):
+        with pytest.raises(ValueError, match='bbox'):
+            resolve_flight_search(FlightSearchQuery(bbox=bbox))
+
+    @pytest.mark.parametrize(
+        'polygon',
+        [
+            {'type': 'Point', 'coordinates': [30, 50]},
+            {'type': 'Polygon'},
+            # Self-intersecting bow tie
+            {'type': 'Polygon', 'coordinates': [[[0, 0], [1, 1], [1, 0], [0, 1], [0, 0]]]},
+        ],
+    )
+    def test_invalid_polygon(self, polygon):
+        with pytest.raises(ValueError, match='olygon'):
+            resolve_flight_search(FlightSearchQuery(polygon=polygon))
+
+    def test_cursor(self):
+        date = datetime(2025, 2, 1, tzinfo=timezone.utc)
+        cursor = encode_flight_cursor(UavFlightModel(id=7, date=date))
+
+        assert resolve_flight_search(FlightSearchQuery(cursor=cursor)).after == (date, 7)
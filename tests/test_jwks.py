@@ -0,0 +1,165 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from backend.jwks import JWKSCache, JWKSUnavailableError, UnknownKeyError
+
+
+def _private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _jwk(private_key, kid: str, **extra) -> dict:
+    data = jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    return {**data, 'kid': kid, 'alg': 'RS256', 'use': 'sig', **extra}
+
+
+class StubJWKSServer:
+    """Local JWKS endpoint that counts requests and can be switched off."""
+
+    def __init__(self):
+        self.keys: list[dict] = []
+        self.requests = 0
+        self.delay = 0.0
+        self.status = 200
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                time.sleep(stub.delay)
+                body = json.dumps({'keys': stub.keys}).encode()
+                self.send_response(stub.status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self._server.server_port}/certs'
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture(scope='module')
+def signing_key():
+    return _private_key()
+
+
+@pytest.fixture()
+def server(signing_key):
+    stub = StubJWKSServer()
+    stub.keys = [_jwk(signing_key, 'k1')]
+    yield stub
+    stub.close()
+
+
+@pytest.fixture()
+async def cache(server):
+    jwks = JWKSCache(server.url, ttl=300, min_refresh_interval=10, timeout=2)
+    yield jwks
+    await jwks.aclose()
+
+
+class TestJWKSCache:
+    @pytest.mark.asyncio
+    async def test_key_verifies_token(self, cache, signing_key):
+        token = jwt.encode({'sub': 'u'}, signing_key, algorithm='RS256', headers={'kid': 'k1'})
+
+        key = await cache.get_key('k1')
+
+        assert jwt.decode(token, key, algorithms=['RS256']) == {'sub': 'u'}
+
+    @pytest.mark.asyncio
+    async def test_keys_are_fetched_once(self, cache, server):
+        first = await cache.get_key('k1')
+        for _ in range(10):
+            assert await cache.get_key('k1') is first
+
+        assert server.requests == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch(self, cache, server):
+        server.delay = 0.2
+
+        keys = await asyncio.gather(*(cache.get_key('k1') for _ in range(20)))
+
+        assert server.requests == 1
+        assert all(key is keys[0] for key in keys)
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_refreshes_once(self, server, signing_key):
+        cache = JWKSCache(server.url, ttl=300, min_refresh_interval=0.3, timeout=2)
+        await cache.get_key('k1')
+        rotated = _private_key()
+        server.keys = [_jwk(signing_key, 'k1'), _jwk(rotated, 'k2')]
+        await asyncio.sleep(0.3)
+
+        assert await cache.get_key('k2') is not None
+        assert server.requests == 2
+
+        for _ in range(5):
+            with pytest.raises(UnknownKeyError):
+                await cache.get_key('forged')
+        assert server.requests == 2
+
+        await asyncio.sleep(0.3)
+        for _ in range(5):
+            with pytest.raises(UnknownKeyError):
+                await cache.get_key('forged')
+        assert server.requests == 3
+        await cache.aclose()
+
+    @pytest.mark.asyncio
+    async def test_expired_keys_are_refreshed(self, server):
+        cache = JWKSCache(server.url, ttl=0.1, min_refresh_interval=0, timeout=2)
+        await cache.get_key('k1')
+        await asyncio.sleep(0.15)
+
+        await cache.get_key('k1')
+
+        assert server.requests == 2
+        await cache.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stale_keys_served_when_keycloak_fails(self, server):
+        cache = JWKSCache(server.url, ttl=0.1, min_refresh_interval=0, timeout=2)
+        key = await cache.get_key('k1')
+        await asyncio.sleep(0.15)
+        server.status = 500
+
+        assert await cache.get_key('k1') is key
+        assert server.requests >= 2
+        await cache.aclose()
+
+    @pytest.mark.asyncio
+    async def test_unavailable_without_keys(self, server):
+        server.status = 503
+        cache = JWKSCache(server.url, ttl=300, min_refresh_interval=10, timeout=2)
+
+        with pytest.raises(JWKSUnavailableError):
+            await cache.get_key('k1')
+        with pytest.raises(JWKSUnavailableError):
+            await cache.get_key('k1')
+        assert server.requests == 1
+        await cache.aclose()
+
+    @pytest.mark.asyncio
+    async def test_encryption_keys_skipped(self, cache, server, signing_key):
+        server.keys = [_jwk(signing_key, 'k1'), _jwk(_private_key(), 'enc', use='enc')]
+
+        with pytest.raises(UnknownKeyError):
+            await cache.get_key('enc')
@@ -0,0 +1,96 @@
+import time
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+
+from backend.metrics import (
+    MetricsMiddleware,
+    TimedQueuePool,
+    _statement_operation,
+    record_ingest_batch,
+)
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture()
+def client():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get('/items/{item_id}')
+    async def item(item_id: int):
+        return {'id': item_id, 'name': 'x' * 100}
+
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url='http://test')
+
+
+class TestMetricsMiddleware:
+    @pytest.mark.asyncio
+    async def test_labelled_by_route_template(self, client):
+        labels = {'method': 'GET', 'route': '/items/{item_id}', 'status': '200'}
+        before = _sample('http_request_duration_seconds_count', **labels)
+        size_before = _sample(
+            'http_response_size_bytes_sum', method='GET', route='/items/{item_id}'
+        )
+
+        for item_id in (1, 2, 3):
+            response = await client.get(f'/items/{item_id}')
+
+        assert _sample('http_request_duration_seconds_count', **labels) == before + 3
+        size = _sample('http_response_size_bytes_sum', method='GET', route='/items/{item_id}')
+        assert size - size_before == 3 * len(response.content)
+        assert _sample('http_requests_in_progress', method='GET') == 0
+
+    @pytest.mark.asyncio
+    async def test_unmatched_route(self, client):
+        labels = {'method': 'GET', 'route': 'unmatched', 'status': '404'}
+        before = _sample('http_request_duration_seconds_count', **labels)
+
+        await client.get('/missing/123')
+
+        assert _sample('http_request_duration_seconds_count', **labels) == before + 1
+
+
+class TestRecordIngestBatch:
+    def test_counters(self):
+        before = {
+            outcome: _sample('ingest_rows_total', outcome=outcome)
+            for outcome in ('parsed', 'inserted', 'skipped')
+        }
+        insert_before = _sample('ingest_stage_seconds_total', stage='insert')
+
+        record_ingest_batch(parsed=10, inserted=7, load=0.5, map=0.25, insert=1.5)
+
+        assert _sample('ingest_rows_total', outcome='parsed') == before['parsed'] + 10
+        assert _sample('ingest_rows_total', outcome='inserted') == before['inserted'] + 7
+        assert _sample('ingest_rows_total', outcome='skipped') == before['skipped'] + 3
+        assert _sample('ingest_stage_seconds_total', stage='insert') == insert_before + 1.5
+
+
+class TestTimedQueuePool:
+    def test_connect_time_is_not_waiting(self):
+        def slow_connect():
+            time.sleep(0.05)
+            return MagicMock()
+
+        pool = TimedQueuePool(slow_connect, pool_size=1)
+        count_before = _sample('db_pool_checkout_seconds_count')
+        sum_before = _sample('db_pool_checkout_seconds_sum')
+
+        pool.connect().close()
+
+        assert _sample('db_pool_checkout_seconds_count') == count_before + 1
+        assert _sample('db_pool_checkout_seconds_sum') - sum_before < 0.05
+
+
+def test_statement_operation():
+    assert _statement_operation('\n  select 1') == 'SELECT'
+    assert _statement_operation('INSERT INTO t VALUES (1)') == 'INSERT'
+    assert _statement_operation('') == 'EMPTY'
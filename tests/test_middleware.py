@@ -0,0 +1,109 @@
+import httpx
+import pytest
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from backend import middleware as module
+from backend.middleware import JWTMiddleware, compile_path_patterns
+
+
+class TestCompilePathPatterns:
+    def test_single_segment_star(self):
+        pattern = compile_path_patterns(['/*.js'])
+
+        assert pattern.fullmatch('/main.js')
+        assert not pattern.fullmatch('/api/v1/main.js')
+
+    def test_double_star_is_prefix(self):
+        pattern = compile_path_patterns(['/assets/**'])
+
+        assert pattern.fullmatch('/assets/index-1a2b.js')
+        assert pattern.fullmatch('/assets/fonts/a.woff2')
+        assert not pattern.fullmatch('/assetsx/a.js')
+
+    def test_literal_characters_escaped(self):
+        pattern = compile_path_patterns(['/v?.json', '/a+b'])
+
+        assert pattern.fullmatch('/v1.json')
+        assert not pattern.fullmatch('/v1xjson')
+        assert pattern.fullmatch('/a+b')
+
+    def test_no_patterns(self):
+        assert compile_path_patterns([]) is None
+
+
+@pytest.fixture()
+def state() -> dict:
+    return {'background': 0}
+
+
+@pytest.fixture()
+def client(monkeypatch, state):
+    async def fake_validate_token(token):
+        if token != 'good':
+            raise HTTPException(status_code=401, detail='Invalid token: "bad"')
+        return {'sub': 'u'}
+
+    monkeypatch.setattr(module.validator, 'validate_token', fake_validate_token)
+
+    app = FastAPI()
+    app.add_middleware(JWTMiddleware, exclude_paths=['/health', '/assets/**', '/*.ico'])
+
+    @app.get('/health')
+    async def health():
+        return {'ok': True}
+
+    @app.get('/assets/{name}')
+    async def asset(name: str):
+        return {'name': name}
+
+    @app.get('/me')
+    async def me(request: Request):
+        return request.state.user
+
+    @app.get('/stream')
+    async def stream():
+        return StreamingResponse(iter([b'a', b'b', b'c']))
+
+    @app.get('/task')
+    async def task(background: BackgroundTasks):
+        background.add_task(lambda: state.__setitem__('background', 1))
+        return {}
+
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url='http://test')
+
+
+AUTH = {'Authorization': 'Bearer good'}
+
+
+class TestJWTMiddleware:
+    @pytest.mark.asyncio
+    async def test_excluded_paths(self, client):
+        assert (await client.get('/health')).status_code == 200
+        assert (await client.get('/assets/app.js')).json() == {'name': 'app.js'}
+
+    @pytest.mark.asyncio
+    async def test_missing_token(self, client):
+        response = await client.get('/me')
+
+        assert response.status_code == 401
+        assert response.json() == {'detail': 'Authorization header required'}
+
+    @pytest.mark.asyncio
+    async def test_invalid_token(self, client):
+        response = await client.get('/me', headers={'Authorization': 'Bearer bad'})
+
+        assert response.status_code == 401
+        assert response.json() == {'detail': 'Invalid token: "bad"'}
+
+    @pytest.mark.asyncio
+    async def test_claims_in_request_state(self, client):
+        assert (await client.get('/me', headers=AUTH)).json() == {'sub': 'u'}
+
+    @pytest.mark.asyncio
+    async def test_streaming_and_background_tasks(self, client, state):
+        assert (await client.get('/stream', headers=AUTH)).content == b'abc'
+
+        await client.get('/task', headers=AUTH)
+        assert state['background'] == 1
@@ -0,0 +1,92 @@
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+
+from backend.core.settings import keycloak_settings
+from backend.middleware import JWTKeycloakValidator
+from backend.token_cache import VerifiedTokenCache
+
+
+class TestVerifiedTokenCache:
+    def test_hit_until_exp(self, monkeypatch):
+        cache = VerifiedTokenCache(max_entries=10)
+        key = cache.key('token')
+        cache.put(key, {'sub': 'u', 'exp': 1000})
+
+        monkeypatch.setattr(time, 'time', lambda: 999.0)
+        assert cache.get(key) == {'sub': 'u', 'exp': 1000}
+        monkeypatch.setattr(time, 'time', lambda: 1000.0)
+        assert cache.get(key) is None
+
+        info = cache.cache_info()
+        assert (info.hits, info.misses, info.size) == (1, 1, 0)
+        assert info.hit_ratio == 0.5
+
+    def test_least_recently_used_evicted(self):
+        cache = VerifiedTokenCache(max_entries=2)
+        exp = time.time() + 60
+        for token in ('a', 'b'):
+            cache.put(cache.key(token), {'exp': exp})
+        cache.get(cache.key('a'))
+        cache.put(cache.key('c'), {'exp': exp})
+
+        assert cache.get(cache.key('b')) is None
+        assert cache.get(cache.key('a')) is not None
+        assert cache.get(cache.key('c')) is not None
+
+    def test_not_cached(self):
+        cache = VerifiedTokenCache(max_entries=10)
+        cache.put(cache.key('a'), {'sub': 'u'})
+        VerifiedTokenCache(max_entries=0).put(cache.key('b'), {'exp': time.time() + 60})
+
+        assert cache.cache_info().size == 0
+
+
+@pytest.fixture(scope='module')
+def signing_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture()
+def validator(monkeypatch, signing_key) -> JWTKeycloakValidator:
+    validator = JWTKeycloakValidator('http://keycloak', 'realm')
+    validator.key_lookups = 0
+
+    async def fake_get_public_key(kid):
+        validator.key_lookups += 1
+        return signing_key.public_key()
+
+    monkeypatch.setattr(validator, 'get_public_key', fake_get_public_key)
+    return validator
+
+
+def _token(signing_key, **claims) -> str:
+    claims = {'sub': 'u', 'aud': keycloak_settings.KEYCLOAK_CLIENT_ID, **claims}
+    return jwt.encode(claims, signing_key, algorithm='RS256', headers={'kid': 'k1'})
+
+
+class TestValidatorTokenCache:
+    @pytest.mark.asyncio
+    async def test_token_verified_once(self, validator, signing_key):
+        token = _token(signing_key, exp=int(time.time()) + 60)
+
+        first = await validator.validate_token(token)
+        second = await validator.validate_token(token)
+
+        assert first == second and first['sub'] == 'u'
+        assert validator.key_lookups == 1
+        assert validator.tokens.cache_info().hits == 1
+
+    @pytest.mark.asyncio
+    async def test_rejected_token_not_cached(self, validator, signing_key):
+        token = _token(signing_key, exp=int(time.time()) - 10)
+
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc:
+                await validator.validate_token(token)
+            assert exc.value.detail == 'Token has expired'
+        assert validator.key_lookups == 2
+        assert validator.tokens.cache_info().size == 0